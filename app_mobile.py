@@ -16,6 +16,18 @@ from dashboard_modules.config import PAGE_CONFIG
 # UI
 from dashboard_modules.ui.html_mobile import build_mobile_html
 
+# Data
+from dashboard_modules.data.feed_poller import start_feed_poller
+from dashboard_modules.components.images import build_static_assets
+
+# ─── Static Assets ───────────────────────────────────────────────────
+# スプラッシュ・背景画像を static/assets/ の WebP に変換（変更がなければ stat のみ）
+build_static_assets()
+
+# ─── Background Feed Poller ──────────────────────────────────────────
+# RSSは描画と独立して定期取得し、描画側は記事ストアを読むだけにする
+start_feed_poller()
+
 # ─── Report Persistence ──────────────────────────────────────────────
 _REPORT_CACHE_FILE = Path(__file__).resolve().parent / "static" / "_report_cache.json"
 
@@ -16,15 +16,18 @@ from pathlib import Path
 from dashboard_modules.config import PAGE_CONFIG
 
 # Components
-from dashboard_modules.components.news import fetch_news_for, fetch_kddi_press_releases, fetch_fujitsu_press_releases
-from dashboard_modules.components.chat import get_chat_response
+from dashboard_modules.components.news import (
+    fetch_news_for, fetch_kddi_press_releases, fetch_fujitsu_press_releases, dedupe_articles,
+    KDDI_QUERY, FUJITSU_COCREATION_QUERY,
+)
+from dashboard_modules.components.chat import stream_chat_response
 from dashboard_modules.components.context import (
     get_context_files, add_context_file, toggle_context_file,
     delete_context_file, get_active_context_data
 )
 
 # Analysis
-from dashboard_modules.analysis.opportunities import generate_opportunities, generate_detail_report
+from dashboard_modules.analysis.opportunities import generate_opportunities, generate_detail_reports
 from dashboard_modules.analysis.weekly_scheduler import (
     is_generation_due, days_since_last_generation,
     run_weekly_generation, run_manual_generation, get_generation_history,
@@ -34,6 +37,18 @@ from dashboard_modules.analysis.proposals import get_proposal_history
 # UI
 from dashboard_modules.ui.html_builder import build_dashboard_html
 
+# Data
+from dashboard_modules.data.feed_poller import start_feed_poller
+from dashboard_modules.components.images import build_static_assets
+
+# ─── Static Assets ───────────────────────────────────────────────────
+# スプラッシュ・背景画像を static/assets/ の WebP に変換（変更がなければ stat のみ）
+build_static_assets()
+
+# ─── Background Feed Poller ──────────────────────────────────────────
+# RSSは描画と独立して定期取得し、描画側は記事ストアを読むだけにする
+start_feed_poller()
+
 # ─── Report Persistence ──────────────────────────────────────────────
 _REPORT_CACHE_FILE = Path(__file__).resolve().parent / "static" / "_report_cache.json"
 
@@ -110,11 +125,9 @@ def _run_hypothesis_generation():
     bx_intel = fetch_bu_intelligence("BX", BX_KEYWORDS)
     wakonx_articles = wakonx_intel["articles"][:5]
     bx_articles = bx_intel["articles"][:5]
-    kddi_general = fetch_news_for("KDDI", 3)
-    kddi_combined = wakonx_articles + bx_articles + kddi_general
-    fujitsu_news_raw = fetch_news_for(
-        "%E5%AF%8C%E5%A3%AB%E9%80%9A+Uvance+OR+%E5%AF%8C%E5%A3%AB%E9%80%9A+DX+OR+%E5%AF%8C%E5%A3%AB%E9%80%9A+%E5%85%B1%E5%89%B5", 8
-    )
+    kddi_general = fetch_news_for(KDDI_QUERY, 3)
+    kddi_combined = dedupe_articles(wakonx_articles, bx_articles, kddi_general)
+    fujitsu_news_raw = fetch_news_for(FUJITSU_COCREATION_QUERY, 8)
     kddi_tuple = tuple(a["title"] for a in kddi_combined)
     fujitsu_tuple = tuple(a["title"] for a in fujitsu_news_raw)
 
@@ -280,8 +293,6 @@ def render():
             _run_hypothesis_generation()
 
         if generate_button:
-            # キャッシュクリア（前回のエラー結果が残っている場合に対応）
-            generate_detail_report.clear()
             progress_bar = st.progress(0, text="Preparing...")
             # html_builderと同じニュースソースを使用（WAKONX/BX特化 + 一般KDDI）
             from dashboard_modules.components.intelligence import fetch_bu_intelligence, WAKONX_KEYWORDS, BX_KEYWORDS
@@ -289,9 +300,10 @@ def render():
             bx_intel = fetch_bu_intelligence("BX", BX_KEYWORDS)
             wakonx_articles = wakonx_intel["articles"][:5]
             bx_articles = bx_intel["articles"][:5]
-            kddi_general = fetch_news_for("KDDI", 3)
-            kddi_combined = wakonx_articles + bx_articles + kddi_general
-            fujitsu_news_raw = fetch_news_for("%E5%AF%8C%E5%A3%AB%E9%80%9A+Uvance+OR+%E5%AF%8C%E5%A3%AB%E9%80%9A+DX+OR+%E5%AF%8C%E5%A3%AB%E9%80%9A+%E5%85%B1%E5%89%B5", 8)
+            kddi_general = fetch_news_for(KDDI_QUERY, 3)
+            # 同一記事が複数クエリに出るため記事ID単位で重複排除
+            kddi_combined = dedupe_articles(wakonx_articles, bx_articles, kddi_general)
+            fujitsu_news_raw = fetch_news_for(FUJITSU_COCREATION_QUERY, 8)
             kddi_tuple = tuple(a["title"] for a in kddi_combined)
             fujitsu_tuple = tuple(a["title"] for a in fujitsu_news_raw)
             # プレスリリース取得
@@ -307,13 +319,11 @@ def render():
             # スコア順にソートして上位3件のみレポート生成
             top_opportunities = sorted(opportunities, key=lambda x: x.get("score", 0), reverse=True)[:3] if opportunities else []
             report_data_cache = {}
-            total = len(top_opportunities) if top_opportunities else 1
-            for idx, opp in enumerate(top_opportunities):
-                t = opp.get("title", "Unknown")
-                pct = 15 + int((idx / total) * 80)
-                progress_bar.progress(pct, text=f"Generating report {idx+1}/{total}...")
-                print(f"[GEN] Generating report for: {t[:50]}")
-                fname, sec_html, rep_title = generate_detail_report(t, kddi_tuple, fujitsu_tuple, kddi_press_tuple, fujitsu_press_tuple)
+            titles = [opp.get("title", "Unknown") for opp in top_opportunities]
+            progress_bar.progress(15, text=f"Generating {len(titles)} reports in parallel...")
+            # 上位レポートは互いに独立しているため並列生成
+            reports = generate_detail_reports(titles, kddi_tuple, fujitsu_tuple, kddi_press_tuple, fujitsu_press_tuple)
+            for t, (fname, sec_html, rep_title) in reports.items():
                 print(f"[GEN] Result: fname={fname}, html_len={len(sec_html)}, title={rep_title[:30] if rep_title else 'EMPTY'}")
                 report_data_cache[t] = {"filename": fname, "sections_html": sec_html, "title": rep_title}
             progress_bar.progress(100, text="Complete!")
@@ -353,9 +363,8 @@ def render():
 
             # AIレスポンス生成
             with st.chat_message("assistant"):
-                with st.spinner("AI Strategist is thinking..."):
-                    response = get_chat_response(prompt, st.session_state.chat_messages[:-1])
-                st.markdown(response)
+                # 生成されたトークンから順に表示し、全文を履歴に残す
+                response = st.write_stream(stream_chat_response(prompt, st.session_state.chat_messages[:-1]))
 
             # AIメッセージを履歴に追加
             st.session_state.chat_messages.append({"role": "assistant", "content": response})
@@ -4,10 +4,38 @@ AI Client Abstraction Layer
 環境変数 AI_PROVIDER で切り替え:
   - "anthropic"（デフォルト）: Anthropic Claude API
   - "fujitsu": 富士通社内 GPT-5.1 API
+
+応答は (プロバイダ, モデル, system, messages, max_tokens) の内容ハッシュをキーに
+SQLite キャッシュ（cache.disk_cache）へ保存し、同じ入力の再実行では API を呼ばない。
+呼び出しごとに cache="use" | "bypass" | "refresh" で方針を指定できる。例外・空応答は保存しない。
+
+独立した複数の呼び出しは achat_completion / batch_chat_completion で並列化できる。
+逐次表示したい応答（チャット等）は stream_chat_completion でテキスト断片のジェネレータとして受け取れる。
+実際の API 呼び出しは同期・非同期を問わずプロバイダ共通のセマフォ（同時実行数）と
+プロバイダ別のレート制限（毎分リクエスト数）を通る。キャッシュヒットはどちらも消費しない。
+
+system / message content には文字列のほか Anthropic 形式のテキストブロックのリストも渡せる。
+cacheable(text) で作ったブロックまでがプロンプトキャッシュの接頭辞になり、ルール・戦略資料などの
+不変部分は2回目以降 API 側のキャッシュから読まれる（富士通 API では連結した文字列として送る）。
+stage を指定した呼び出しは入力/キャッシュ読込/キャッシュ書込/出力トークンと所要時間を
+工程別に集計する（llm_usage_by_stage）。
+
+    chat_completion(
+        messages=[{"role": "user", "content": dynamic_inputs}],
+        system=[cacheable(STATIC_RULES), cacheable(template_rules)],
+        max_tokens=6000, stage="proposal.draft",
+    )
 """
 from __future__ import annotations
 
+import asyncio
+import contextvars
+import json
 import os
+import random
+import threading
+import time
+from typing import Any, Iterator
 
 AI_PROVIDER = os.getenv("AI_PROVIDER", "anthropic").lower()
 
@@ -21,12 +49,21 @@ except Exception:
     _HAS_ANTHROPIC = False
 
 # --- Fujitsu ---
-_FUJITSU_ENDPOINT = (
+_FUJITSU_ENDPOINT = os.getenv("FUJITSU_AI_ENDPOINT", (
     "https://api.ai-service.global.fujitsu.com"
     "/ai-foundation/chat-ai/gpt/gpt-5.1"
-)
+))
 _FUJITSU_API_KEY = os.getenv("FUJITSU_AI_KEY", "")
 _HAS_FUJITSU = bool(_FUJITSU_API_KEY)
+# (接続, 読み取り) タイムアウト秒
+FUJITSU_TIMEOUT = (
+    float(os.getenv("FUJITSU_AI_CONNECT_TIMEOUT", "5")),
+    float(os.getenv("FUJITSU_AI_READ_TIMEOUT", "120")),
+)
+# 429 / 5xx / 接続エラー時の再試行回数と指数バックオフの基準秒
+FUJITSU_MAX_RETRIES = int(os.getenv("FUJITSU_AI_MAX_RETRIES", "3"))
+FUJITSU_BACKOFF_BASE = float(os.getenv("FUJITSU_AI_BACKOFF_BASE", "1.0"))
+_FUJITSU_RETRY_STATUS = {429, 500, 502, 503, 504}
 
 # --- 公開フラグ ---
 HAS_AI: bool = (
@@ -40,12 +77,121 @@ _MODEL_MAP_FUJITSU: dict[str, str] = {
     "claude-sonnet-4-5-20250929": "gpt-5.1",
 }
 
+_DEFAULT_ANTHROPIC_MODEL = "claude-sonnet-4-5-20250929"
+
+# --- 応答キャッシュ ---
+from .cache import disk_cache  # noqa: E402  (config → ai_client の循環 import のため HAS_AI 定義後に読む)
+
+# 応答キャッシュの有効期限（秒）
+LLM_CACHE_TTL = float(os.getenv("DASHBOARD_LLM_CACHE_TTL", str(24 * 3600)))
+CACHE_POLICIES = ("use", "bypass", "refresh")
+
+_usage_lock = threading.Lock()
+_usage = {"api_calls": 0, "api_seconds": 0.0, "rate_limited_seconds": 0.0, "bypass": 0, "refresh": 0}
+
+# --- 同時実行数・レート制限 ---
+# 全プロバイダ共通の同時 API 呼び出し数上限
+AI_MAX_CONCURRENCY = int(os.getenv("AI_MAX_CONCURRENCY", "4"))
+# プロバイダ別の毎分リクエスト数上限
+AI_RATE_LIMITS_RPM: dict[str, float] = {
+    "anthropic": float(os.getenv("AI_RATE_LIMIT_ANTHROPIC_RPM", "50")),
+    "fujitsu": float(os.getenv("AI_RATE_LIMIT_FUJITSU_RPM", "20")),
+}
+
+
+class _RateLimiter:
+    """トークンバケット方式のレート制限（スレッド共有。rpm 件/分、最大 burst 件まで連続可）"""
+
+    def __init__(self, rpm: float, burst: int = 4):
+        self.interval = 60.0 / rpm if rpm > 0 else 0.0
+        self.capacity = float(burst)
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """1件分の枠を取得（空きがなければ待機）し、待機秒数を返す"""
+        if not self.interval:
+            return 0.0
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) / self.interval)
+                self.updated = now
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return waited
+                delay = (1.0 - self.tokens) * self.interval
+            time.sleep(delay)
+            waited += delay
+
+
+_api_slots = threading.BoundedSemaphore(AI_MAX_CONCURRENCY)
+_rate_limiters = {provider: _RateLimiter(rpm) for provider, rpm in AI_RATE_LIMITS_RPM.items()}
+
+# --- プロンプトブロック・工程別使用量 ---
+_USAGE_FIELDS = ("input_tokens", "cache_read_input_tokens", "cache_creation_input_tokens", "output_tokens")
+_stage_usage: dict[str, dict[str, float]] = {}
+_current_stage: contextvars.ContextVar[str] = contextvars.ContextVar("llm_stage", default="other")
+# 通常入力に対するキャッシュ読込・書込（5分 TTL）トークンの料金倍率
+CACHE_READ_PRICE = 0.1
+CACHE_WRITE_PRICE = 1.25
+
+
+def cacheable(text: str) -> dict:
+    """プロンプトキャッシュの区切り付きテキストブロック（このブロックまでを再利用可能な接頭辞にする）"""
+    return {"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}
+
+
+def _flatten(content: Any) -> str:
+    """テキストブロックのリストを1つの文字列に連結（ブロック非対応のプロバイダ向け）"""
+    if isinstance(content, list):
+        return "\n\n".join(block.get("text", "") for block in content)
+    return content
+
+
+def _record_call(stage: str, seconds: float, waited: float, usage: dict[str, int]) -> None:
+    with _usage_lock:
+        _usage["api_calls"] += 1
+        _usage["api_seconds"] += seconds
+        _usage["rate_limited_seconds"] += waited
+        entry = _stage_usage.setdefault(stage, {"calls": 0, "api_seconds": 0.0, **{f: 0 for f in _USAGE_FIELDS}})
+        entry["calls"] += 1
+        entry["api_seconds"] += seconds
+        for field in _USAGE_FIELDS:
+            entry[field] += usage.get(field, 0)
+    if usage:
+        print(
+            f"[AI] {stage}: in={usage.get('input_tokens', 0):,} cache_read={usage.get('cache_read_input_tokens', 0):,} "
+            f"cache_write={usage.get('cache_creation_input_tokens', 0):,} out={usage.get('output_tokens', 0):,} {seconds:.1f}s"
+        )
+
+
+def llm_usage_by_stage() -> dict[str, dict[str, float]]:
+    """工程別の API 使用量（API 応答の usage の集計）。
+
+    calls / api_seconds / 各トークン数に加え、cached_ratio（入力のうちキャッシュ読込の割合）と
+    saved_input_tokens（キャッシュなしで同じ入力を送った場合との差を通常入力トークン換算したもの。
+    書込の割増分を差し引くため負になりうる）を返す。
+    """
+    with _usage_lock:
+        result = {stage: dict(entry) for stage, entry in _stage_usage.items()}
+    for entry in result.values():
+        read, write = entry["cache_read_input_tokens"], entry["cache_creation_input_tokens"]
+        total_in = entry["input_tokens"] + read + write
+        entry["cached_ratio"] = read / total_in if total_in else 0.0
+        entry["saved_input_tokens"] = read * (1 - CACHE_READ_PRICE) - write * (CACHE_WRITE_PRICE - 1)
+    return result
+
 
 def chat_completion(
     messages: list[dict],
     max_tokens: int,
-    system: str | None = None,
+    system: str | list[dict] | None = None,
     model: str | None = None,
+    cache: str = "use",
+    stage: str | None = None,
 ) -> str:
     """AI APIへチャット補完リクエストを送信し、テキストを返す。
 
@@ -55,28 +201,183 @@ def chat_completion(
         {"role": "user"|"assistant", "content": "..."} のリスト
     max_tokens : int
         最大トークン数
-    system : str | None
-        システムプロンプト（任意）
+    system : str | list[dict] | None
+        システムプロンプト（任意）。テキストブロックのリストも可（cacheable() で区切りを指定）
     model : str | None
         使用モデル（省略時はプロバイダのデフォルト）
+    cache : str
+        "use"（キャッシュがあれば返す）/ "bypass"（参照も保存もしない）/
+        "refresh"（参照せずに API を呼び、結果で上書き）
+    stage : str | None
+        使用量集計用の工程名（例: "proposal.draft"）。キャッシュキーには含めない
 
     Returns
     -------
     str  応答テキスト
     """
+    if cache not in CACHE_POLICIES:
+        raise ValueError(f"cache must be one of {CACHE_POLICIES}: {cache!r}")
+    request = _request_key(messages, max_tokens, system, model)
+    token = _current_stage.set(stage or "other")
+    try:
+        if cache == "use":
+            return _cached_completion(request)
+        with _usage_lock:
+            _usage[cache] += 1
+        if cache == "refresh":
+            return _cached_completion.refresh(request)
+        return _complete(request)
+    finally:
+        _current_stage.reset(token)
+
+
+def _request_key(messages: list[dict], max_tokens: int, system: str | list[dict] | None, model: str | None) -> str:
+    """キャッシュキー兼リクエスト内容（プロバイダと実際に使うモデルを含む正規化 JSON）"""
     if AI_PROVIDER == "fujitsu":
-        return _call_fujitsu(messages, max_tokens, system=system, model=model)
+        resolved = _MODEL_MAP_FUJITSU.get(model, "gpt-5.1") if model else "gpt-5.1"
     else:
-        return _call_anthropic(messages, max_tokens, system=system, model=model)
+        resolved = model or _DEFAULT_ANTHROPIC_MODEL
+    return json.dumps(
+        {"provider": AI_PROVIDER, "model": resolved, "system": system or "",
+         "messages": messages, "max_tokens": max_tokens},
+        ensure_ascii=False, sort_keys=True,
+    )
 
 
-def _call_anthropic(
+def _complete(request: str) -> str:
+    """正規化済みリクエストで API を呼ぶ（キャッシュなし）"""
+    req = json.loads(request)
+    usage: dict[str, int] = {}
+    with _api_slots:
+        waited = _rate_limiters[req["provider"]].acquire()
+        started = time.monotonic()
+        try:
+            call = _call_fujitsu if req["provider"] == "fujitsu" else _call_anthropic
+            return call(req["messages"], req["max_tokens"], system=req["system"] or None, model=req["model"], usage=usage)
+        finally:
+            _record_call(_current_stage.get(), time.monotonic() - started, waited, usage)
+
+
+@disk_cache(
+    ttl=LLM_CACHE_TTL, max_entries=2048, name="llm.completion",
+    cache_if=lambda text: bool(text and text.strip()),
+)
+def _cached_completion(request: str) -> str:
+    return _complete(request)
+
+
+def llm_cache_stats() -> dict:
+    """応答キャッシュの利用状況（hits / misses / bypass / refresh / api_calls / api_seconds / rate_limited_seconds）"""
+    stats = _cached_completion.stats()
+    with _usage_lock:
+        stats.update(_usage)
+    return stats
+
+
+def clear_llm_cache() -> None:
+    _cached_completion.clear()
+
+
+def stream_chat_completion(
     messages: list[dict],
     max_tokens: int,
-    *,
-    system: str | None = None,
+    system: str | list[dict] | None = None,
     model: str | None = None,
+    cache: str = "use",
+    stage: str | None = None,
+) -> Iterator[str]:
+    """chat_completion のストリーミング版。生成されたテキスト断片を順に yield する。
+
+    キャッシュ済みなら全文を1回で yield する。最後まで受信した応答は chat_completion と同じキーで保存する
+    （途中で中断・失敗した応答は保存しない）。同時実行数・レート制限の枠は受信完了まで保持する。
+    """
+    if cache not in CACHE_POLICIES:
+        raise ValueError(f"cache must be one of {CACHE_POLICIES}: {cache!r}")
+    request = _request_key(messages, max_tokens, system, model)
+    if cache == "use":
+        cached = _cached_completion.peek(request)
+        if cached is not None:
+            yield cached
+            return
+    else:
+        with _usage_lock:
+            _usage[cache] += 1
+
+    req = json.loads(request)
+    parts: list[str] = []
+    usage: dict[str, int] = {}
+    with _api_slots:
+        waited = _rate_limiters[req["provider"]].acquire()
+        started = time.monotonic()
+        try:
+            stream = _stream_fujitsu if req["provider"] == "fujitsu" else _stream_anthropic
+            for text in stream(req["messages"], req["max_tokens"], system=req["system"] or None, model=req["model"], usage=usage):
+                parts.append(text)
+                yield text
+        finally:
+            _record_call(stage or "other", time.monotonic() - started, waited, usage)
+    if cache != "bypass":
+        _cached_completion.put("".join(parts), request)
+
+
+async def achat_completion(
+    messages: list[dict],
+    max_tokens: int,
+    system: str | list[dict] | None = None,
+    model: str | None = None,
+    cache: str = "use",
+    stage: str | None = None,
 ) -> str:
+    """chat_completion の非同期版（引数・キャッシュ方針は同じ）。
+
+    ブロッキングな SDK / HTTP 呼び出しはワーカースレッドで実行し、イベントループを止めない。
+    同時実行数とレート制限は同期呼び出しと共有する。
+    """
+    return await asyncio.to_thread(chat_completion, messages, max_tokens, system, model, cache, stage)
+
+
+def batch_chat_completion(
+    calls: list[dict],
+    max_concurrency: int = AI_MAX_CONCURRENCY,
+) -> list[str | Exception]:
+    """独立した複数のチャット補完を並列実行し、入力順に結果を返す。
+
+    Parameters
+    ----------
+    calls : list[dict]
+        chat_completion のキーワード引数（messages, max_tokens, system, model, cache, stage）の辞書のリスト
+    max_concurrency : int
+        このバッチ内の同時実行数（API 全体の上限 AI_MAX_CONCURRENCY も別途適用される）
+
+    Returns
+    -------
+    list  各リクエストの応答テキスト。失敗したリクエストはその例外オブジェクト
+    """
+    async def _run() -> list[str | Exception]:
+        gate = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def _one(kwargs: dict) -> str:
+            async with gate:
+                return await achat_completion(**kwargs)
+
+        return await asyncio.gather(*(_one(c) for c in calls), return_exceptions=True)
+
+    if not calls:
+        return []
+    started = time.monotonic()
+    results = asyncio.run(_run())
+    failed = sum(isinstance(r, Exception) for r in results)
+    print(f"[AI] Batch of {len(calls)} completed in {time.monotonic() - started:.2f}s ({failed} failed)")
+    return results
+
+
+def _anthropic_request(
+    messages: list[dict],
+    max_tokens: int,
+    system: str | list[dict] | None,
+    model: str | None,
+) -> dict:
+    """クライアントを用意し messages.create / messages.stream の引数を返す"""
     global _anthropic_client
     if not _HAS_ANTHROPIC:
         raise RuntimeError("Anthropic library is not available")
@@ -85,49 +386,201 @@ def _call_anthropic(
         _anthropic_client = _anthropic_mod.Anthropic()
 
     kwargs: dict = {
-        "model": model or "claude-sonnet-4-5-20250929",
+        "model": model or _DEFAULT_ANTHROPIC_MODEL,
         "max_tokens": max_tokens,
         "messages": messages,
     }
     if system:
         kwargs["system"] = system
+    return kwargs
+
 
+def _anthropic_usage(raw: Any, usage: dict[str, int] | None) -> None:
+    """応答の usage（入力・キャッシュ読込/書込・出力トークン）を usage 辞書へ写す"""
+    if usage is None or raw is None:
+        return
+    for field in _USAGE_FIELDS:
+        usage[field] = getattr(raw, field, 0) or 0
+
+
+def _call_anthropic(
+    messages: list[dict],
+    max_tokens: int,
+    *,
+    system: str | list[dict] | None = None,
+    model: str | None = None,
+    usage: dict[str, int] | None = None,
+) -> str:
+    kwargs = _anthropic_request(messages, max_tokens, system, model)
     response = _anthropic_client.messages.create(**kwargs)
+    _anthropic_usage(response.usage, usage)
     return response.content[0].text
 
 
-def _call_fujitsu(
+def _stream_anthropic(
     messages: list[dict],
     max_tokens: int,
     *,
-    system: str | None = None,
+    system: str | list[dict] | None = None,
     model: str | None = None,
-) -> str:
-    import requests
+    usage: dict[str, int] | None = None,
+) -> Iterator[str]:
+    """Messages API のストリーミング（SSE の text_delta を順に返す）"""
+    kwargs = _anthropic_request(messages, max_tokens, system, model)
+    with _anthropic_client.messages.stream(**kwargs) as stream:
+        yield from stream.text_stream
+        _anthropic_usage(stream.get_final_message().usage, usage)
+
+
+class _FujitsuProvider:
+    """富士通社内 GPT API のクライアント。
+
+    keep-alive 接続をプールする Session を1つ保持し、全スレッドで共有する（TCP/TLS ハンドシェイクは初回のみ）。
+    429 / 5xx / 接続エラーは Retry-After またはジッター付き指数バックオフで再試行する。
+    送信後の読み取りタイムアウトは再試行しない（生成が重複して課金・ワーカー占有が倍増するため）。
+    """
 
+    def __init__(self, endpoint: str, api_key: str, timeout: tuple[float, float] = FUJITSU_TIMEOUT,
+                 max_retries: int = FUJITSU_MAX_RETRIES, backoff_base: float = FUJITSU_BACKOFF_BASE):
+        self.endpoint = endpoint
+        self.api_key = api_key
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self._session = None
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        with self._lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                # 同時実行数ぶんの接続を保持（再試行はここで自前に行うため adapter 側は 0）
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(AI_MAX_CONCURRENCY, 4), max_retries=0)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers.update({"api-key": self.api_key, "Content-Type": "application/json"})
+                self._session = session
+            return self._session
+
+    def _backoff(self, attempt: int, retry_after: str | None) -> float:
+        if retry_after:
+            try:
+                return min(float(retry_after), 60.0)
+            except ValueError:
+                pass
+        return self.backoff_base * (2 ** attempt) * random.uniform(0.5, 1.5)
+
+    def _send(self, payload: dict, stream: bool = False):
+        """JSON を POST して成功した Response を返す（再試行を使い切ったら最後のエラーを送出）"""
+        import requests
+
+        attempt = 0
+        while True:
+            try:
+                resp = self.session.post(self.endpoint, json=payload, timeout=self.timeout, stream=stream)
+            except (requests.exceptions.SSLError, requests.exceptions.ReadTimeout):
+                raise   # 証明書エラーは再試行しても解消しない / 送信済みの生成リクエストは再送しない
+            except requests.ConnectionError as e:   # ConnectTimeout を含む（接続確立前の失敗のみ）
+                if attempt >= self.max_retries:
+                    raise
+                delay = self._backoff(attempt, None)
+                print(f"[AI] Fujitsu request failed ({type(e).__name__}), retrying in {delay:.1f}s")
+            else:
+                if resp.status_code not in _FUJITSU_RETRY_STATUS or attempt >= self.max_retries:
+                    if not resp.ok:
+                        resp.close()   # stream=True の接続をプールへ返してから送出
+                        resp.raise_for_status()
+                    return resp
+                resp.close()
+                delay = self._backoff(attempt, resp.headers.get("Retry-After"))
+                print(f"[AI] Fujitsu HTTP {resp.status_code}, retrying in {delay:.1f}s")
+            time.sleep(delay)
+            attempt += 1
+
+    def post(self, payload: dict) -> dict:
+        """JSON を POST して応答 JSON を返す"""
+        return self._send(payload).json()
+
+    def stream(self, payload: dict, usage: dict[str, int] | None = None) -> Iterator[str]:
+        """stream=true で POST し、SSE（data: {...} 行、data: [DONE] で終了）の delta.content を順に返す。
+        再試行は応答受信前のみ"""
+        with self._send({**payload, "stream": True}, stream=True) as resp:
+            for line in resp.iter_lines(decode_unicode=False):
+                if not line.startswith(b"data:"):
+                    continue
+                data = line[5:].strip()
+                if data == b"[DONE]":
+                    break
+                event = json.loads(data)
+                _fujitsu_usage(event.get("usage"), usage)
+                choices = event.get("choices") or [{}]
+                text = (choices[0].get("delta") or {}).get("content")
+                if text:
+                    yield text
+
+
+def _fujitsu_usage(raw: dict | None, usage: dict[str, int] | None) -> None:
+    """OpenAI 形式の usage（prompt_tokens / completion_tokens / cached_tokens）を usage 辞書へ写す"""
+    if usage is None or not raw:
+        return
+    cached = (raw.get("prompt_tokens_details") or {}).get("cached_tokens", 0) or 0
+    usage["input_tokens"] = (raw.get("prompt_tokens", 0) or 0) - cached
+    usage["cache_read_input_tokens"] = cached
+    usage["output_tokens"] = raw.get("completion_tokens", 0) or 0
+
+
+_fujitsu = _FujitsuProvider(_FUJITSU_ENDPOINT, _FUJITSU_API_KEY)
+
+
+def _fujitsu_payload(
+    messages: list[dict],
+    max_tokens: int,
+    system: str | list[dict] | None,
+    model: str | None,
+) -> dict:
     if not _FUJITSU_API_KEY:
         raise RuntimeError("FUJITSU_AI_KEY is not set")
 
     # モデル名を変換
     fujitsu_model = _MODEL_MAP_FUJITSU.get(model, "gpt-5.1") if model else "gpt-5.1"
 
-    # メッセージ構築（systemはmessages配列の先頭に含める）
+    # メッセージ構築（systemはmessages配列の先頭に含める。テキストブロックは文字列に連結）
     api_messages: list[dict] = []
     if system:
-        api_messages.append({"role": "system", "content": system})
-    api_messages.extend(messages)
+        api_messages.append({"role": "system", "content": _flatten(system)})
+    api_messages.extend({**m, "content": _flatten(m["content"])} for m in messages)
 
-    payload = {
+    return {
         "model": fujitsu_model,
         "max_tokens": max_tokens,
         "messages": api_messages,
     }
 
-    headers = {
-        "api-key": _FUJITSU_API_KEY,
-        "Content-Type": "application/json",
-    }
 
-    resp = requests.post(_FUJITSU_ENDPOINT, json=payload, headers=headers, timeout=120)
-    resp.raise_for_status()
-    return resp.json()["choices"][0]["message"]["content"]
+def _call_fujitsu(
+    messages: list[dict],
+    max_tokens: int,
+    *,
+    system: str | list[dict] | None = None,
+    model: str | None = None,
+    usage: dict[str, int] | None = None,
+) -> str:
+    payload = _fujitsu_payload(messages, max_tokens, system, model)
+    body = _fujitsu.post(payload)
+    _fujitsu_usage(body.get("usage"), usage)
+    return body["choices"][0]["message"]["content"]
+
+
+def _stream_fujitsu(
+    messages: list[dict],
+    max_tokens: int,
+    *,
+    system: str | list[dict] | None = None,
+    model: str | None = None,
+    usage: dict[str, int] | None = None,
+) -> Iterator[str]:
+    yield from _fujitsu.stream(_fujitsu_payload(messages, max_tokens, system, model), usage)
@@ -0,0 +1,168 @@
+"""
+Stock Alert Engine - Volatility-aware rules over the stored price matrix
+=========================================================================
+全監視銘柄の終値・始値行列（market_data.get_price_matrix）に対し、宣言的なルールを
+NumPy で一括評価する。結果は株価データの更新（同期）ごとに1回だけ計算し、
+デスクトップ・モバイル両方の描画と check_alerts で共有する。
+
+ルール種別:
+  zscore : 当日騰落率を直近 window 日の騰落率分布で標準化（履歴不足時は fallback_pct で判定）
+  peer   : 対象銘柄の騰落率 − 同業バスケット平均（ポイント差）
+  gap    : 当日始値の前日終値からの乖離（窓開け）
+"""
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from ..components.stock import WATCHED_STOCKS, WATCHED_TICKERS
+from ..data.market_data import get_price_matrix, data_version
+
+
+@dataclass(frozen=True)
+class AlertRule:
+    kind: str                       # "zscore" | "peer" | "gap"
+    threshold: float                # zscore: σ, peer: ポイント差(%), gap: %
+    tickers: tuple[str, ...] = ()   # 空なら全監視銘柄
+    window: int = 20                # zscore の基準期間（営業日）
+    min_move_pct: float = 0.5       # zscore: 低ボラ銘柄の微小変動を除外
+    fallback_pct: float = 2.0       # zscore: 履歴不足時の固定しきい値
+    peers: tuple[str, ...] = ()     # peer: 比較バスケット
+
+
+# 評価するルール（上から順に優先。バッジは最初に該当したルールの表示を使う）
+ALERT_RULES: tuple[AlertRule, ...] = (
+    AlertRule(kind="zscore", threshold=2.0),
+    AlertRule(kind="peer", threshold=1.5, tickers=("9433.T",), peers=("9437.T", "9434.T")),
+    AlertRule(kind="gap", threshold=1.5),
+)
+
+# 評価に読み込む営業日数（zscore の window + 当日 + 余裕）
+_LOOKBACK_DAYS = 60
+
+
+@dataclass
+class AlertResult:
+    badges: dict[str, str] = field(default_factory=dict)   # {ticker: "急騰" 等}
+    messages: list[str] = field(default_factory=list)      # アラートオーバーレイ表示用
+    version: float = 0.0
+
+
+_NAMES = {ticker: name for name, ticker, _color, _query in WATCHED_STOCKS}
+
+_memo_lock = threading.Lock()
+_memo: AlertResult | None = None
+
+
+def _daily_returns(closes: np.ndarray) -> np.ndarray:
+    """(日数-1, 銘柄数) の騰落率(%)。欠損日は前営業日終値で補完して計算"""
+    filled = closes.copy()
+    for i in range(1, len(filled)):
+        mask = np.isnan(filled[i])
+        filled[i, mask] = filled[i - 1, mask]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return (filled[1:] / filled[:-1] - 1.0) * 100.0
+
+
+def _rule_columns(rule: AlertRule, tickers: tuple[str, ...]) -> np.ndarray:
+    targets = rule.tickers or tickers
+    return np.array([tickers.index(t) for t in targets if t in tickers], dtype=int)
+
+
+def _eval_zscore(rule: AlertRule, returns: np.ndarray, cols: np.ndarray) -> list[tuple[int, float, str]]:
+    latest = returns[-1, cols]
+    history = returns[-(rule.window + 1):-1, cols]
+    n = np.sum(~np.isnan(history), axis=0)
+    with np.errstate(invalid="ignore"):
+        mean = np.nanmean(history, axis=0) if history.size else np.full(len(cols), np.nan)
+        std = np.nanstd(history, axis=0, ddof=1) if history.size else np.full(len(cols), np.nan)
+        z = (latest - mean) / std
+    enough = (n >= rule.window // 2) & (std > 0)
+    fired = np.where(
+        enough,
+        (np.abs(z) >= rule.threshold) & (np.abs(latest) >= rule.min_move_pct),
+        np.abs(latest) >= rule.fallback_pct,
+    ) & ~np.isnan(latest)
+    out = []
+    for k in np.flatnonzero(fired):
+        direction = "急騰" if latest[k] > 0 else "急落"
+        detail = f" (z={z[k]:+.1f})" if enough[k] else ""
+        out.append((int(cols[k]), float(latest[k]), f"{direction} {abs(latest[k]):.1f}%{detail}"))
+    return out
+
+
+def _eval_peer(rule: AlertRule, returns: np.ndarray, cols: np.ndarray, tickers: tuple[str, ...]) -> list[tuple[int, float, str]]:
+    peer_cols = [tickers.index(p) for p in rule.peers if p in tickers]
+    if not peer_cols:
+        return []
+    with np.errstate(invalid="ignore"):
+        basket = np.nanmean(returns[-1, peer_cols])
+    relative = returns[-1, cols] - basket
+    fired = np.abs(relative) >= rule.threshold
+    out = []
+    for k in np.flatnonzero(fired & ~np.isnan(relative)):
+        direction = "相対高" if relative[k] > 0 else "相対安"
+        out.append((int(cols[k]), float(relative[k]), f"{direction} 対同業 {relative[k]:+.1f}pt"))
+    return out
+
+
+def _eval_gap(rule: AlertRule, opens: np.ndarray, closes: np.ndarray, cols: np.ndarray) -> list[tuple[int, float, str]]:
+    with np.errstate(invalid="ignore", divide="ignore"):
+        gap = (opens[-1, cols] / closes[-2, cols] - 1.0) * 100.0
+    fired = np.abs(gap) >= rule.threshold
+    out = []
+    for k in np.flatnonzero(fired & ~np.isnan(gap)):
+        direction = "窓開け↑" if gap[k] > 0 else "窓開け↓"
+        out.append((int(cols[k]), float(gap[k]), f"{direction} {abs(gap[k]):.1f}%"))
+    return out
+
+
+def evaluate_alerts(
+    tickers: tuple[str, ...] = WATCHED_TICKERS,
+    rules: tuple[AlertRule, ...] = ALERT_RULES,
+) -> AlertResult:
+    """全銘柄・全ルールを一括評価"""
+    dates, opens, closes = get_price_matrix(tickers, _LOOKBACK_DAYS)
+    result = AlertResult()
+    if len(dates) < 2:
+        return result
+    returns = _daily_returns(closes)
+
+    for rule in rules:
+        cols = _rule_columns(rule, tickers)
+        if not len(cols):
+            continue
+        if rule.kind == "zscore":
+            fired = _eval_zscore(rule, returns, cols)
+        elif rule.kind == "peer":
+            fired = _eval_peer(rule, returns, cols, tickers)
+        elif rule.kind == "gap":
+            fired = _eval_gap(rule, opens, closes, cols)
+        else:
+            print(f"[ALERTS] Unknown rule kind: {rule.kind}")
+            continue
+        for col, _value, text in fired:
+            ticker = tickers[col]
+            result.badges.setdefault(ticker, text.split(" ")[0])
+            result.messages.append(f"{_NAMES.get(ticker, ticker)} {text}")
+    return result
+
+
+def get_stock_alerts() -> AlertResult:
+    """株価データの同期ごとに1回だけ評価し、以降は同じ結果を返す"""
+    global _memo
+    version = data_version(WATCHED_TICKERS)
+    with _memo_lock:
+        if _memo is not None and _memo.version == version and version:
+            return _memo
+    try:
+        result = evaluate_alerts()
+    except Exception as e:
+        print(f"[ALERTS] Evaluation failed: {e}")
+        result = AlertResult()
+    result.version = version
+    with _memo_lock:
+        _memo = result
+    return result
@@ -7,7 +7,8 @@ import re
 import streamlit as st
 from ..config import HAS_AI
 from ..ai_client import chat_completion
-from ..components.news import fetch_news_for
+from .alerts import get_stock_alerts
+from ..components.news import fetch_news_for, KDDI_QUERY, FUJITSU_PRODUCT_QUERY
 
 # ─── Insight Matcher ──────────────────────────────────────────────
 # キーワード → 富士通ソリューション マッピング
@@ -69,7 +70,6 @@ SOLUTION_MAP = {
 }
 
 
-@st.cache_data(ttl=600)
 def ai_semantic_matching(kddi_articles: list[dict], fujitsu_articles: list[dict] = None) -> tuple[list[dict], float]:
     """AI駆動型双方向インテリジェンス - KDDI×富士通のクロスマッチング"""
     print(f"[AI MATCH] HAS_AI: {HAS_AI}, kddi_articles count: {len(kddi_articles) if kddi_articles else 0}")
@@ -83,7 +83,7 @@ def ai_semantic_matching(kddi_articles: list[dict], fujitsu_articles: list[dict]
 
         # 富士通ニュースを取得してまとめる
         if fujitsu_articles is None:
-            fujitsu_articles = fetch_news_for("富士通+Uvance+OR+富士通+新製品+OR+富士通+DX+OR+富士通+AI", 10)
+            fujitsu_articles = fetch_news_for(FUJITSU_PRODUCT_QUERY, 10)
 
         fujitsu_summary = "\n".join([f"F{i+1}. {a['title']}" for i, a in enumerate(fujitsu_articles[:8])])
 
@@ -145,6 +145,7 @@ def ai_semantic_matching(kddi_articles: list[dict], fujitsu_articles: list[dict]
             }],
             max_tokens=4000,
             model="claude-haiku-4-5-20251001",
+            stage="insights",
         )
 
         # JSONをパース
@@ -248,34 +249,16 @@ def _simple_keyword_matching(articles: list[dict]) -> tuple[list[dict], float]:
 
 def run_insight_matcher() -> tuple[list[dict], float]:
     """INSIGHT MATCHER - AI双方向インテリジェンス"""
-    kddi_articles = fetch_news_for("KDDI", 15)
-    fujitsu_articles = fetch_news_for("富士通+Uvance+OR+富士通+新製品+OR+富士通+DX+OR+富士通+AI", 10)
+    kddi_articles = fetch_news_for(KDDI_QUERY, 15)
+    fujitsu_articles = fetch_news_for(FUJITSU_PRODUCT_QUERY, 10)
     return ai_semantic_matching(kddi_articles, fujitsu_articles)
 
 
-@st.cache_data(ttl=300)
-def check_alerts(kddi_pct, fujitsu_pct, docomo_pct, softbank_pct, ctc_pct) -> list[str]:
-    """株価急変・重要ニュースを検知してアラートを返す。"""
+def check_critical_news() -> list[str]:
+    """KDDI関連ニュースの見出しから重要キーワードを検知してアラートを返す。"""
     alerts = []
-    threshold = 2.0  # 2%以上の変動でアラート
-    if kddi_pct is not None and abs(kddi_pct) >= threshold:
-        direction = "急騰" if kddi_pct > 0 else "急落"
-        alerts.append(f"KDDI {direction} {abs(kddi_pct):.1f}%")
-    if fujitsu_pct is not None and abs(fujitsu_pct) >= threshold:
-        direction = "急騰" if fujitsu_pct > 0 else "急落"
-        alerts.append(f"FUJITSU {direction} {abs(fujitsu_pct):.1f}%")
-    if docomo_pct is not None and abs(docomo_pct) >= threshold:
-        direction = "急騰" if docomo_pct > 0 else "急落"
-        alerts.append(f"NTT docomo {direction} {abs(docomo_pct):.1f}%")
-    if softbank_pct is not None and abs(softbank_pct) >= threshold:
-        direction = "急騰" if softbank_pct > 0 else "急落"
-        alerts.append(f"SoftBank {direction} {abs(softbank_pct):.1f}%")
-    if ctc_pct is not None and abs(ctc_pct) >= threshold:
-        direction = "急騰" if ctc_pct > 0 else "急落"
-        alerts.append(f"CTC {direction} {abs(ctc_pct):.1f}%")
-    # 重要キーワード検知
     critical_keywords = ["決算", "下方修正", "上方修正", "不正", "障害", "買収", "提携", "M&A"]
-    news = fetch_news_for("KDDI", 5)
+    news = fetch_news_for(KDDI_QUERY, 5)
     for a in news:
         for kw in critical_keywords:
             if kw in a["title"]:
@@ -284,6 +267,14 @@ def check_alerts(kddi_pct, fujitsu_pct, docomo_pct, softbank_pct, ctc_pct) -> li
     return alerts
 
 
+def check_alerts() -> list[str]:
+    """株価急変・重要ニュースを検知してアラートを返す。
+
+    株価は alerts.get_stock_alerts()（データ同期ごとに1回評価）の結果を使う。
+    """
+    return list(get_stock_alerts().messages) + check_critical_news()
+
+
 @st.cache_data(ttl=1800)  # 30分キャッシュ
 def fetch_tokyo_weather() -> dict:
     """東京の天気情報を取得"""
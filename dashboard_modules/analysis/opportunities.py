@@ -8,9 +8,8 @@ import json
 import re
 from pathlib import Path
 from datetime import datetime
-import streamlit as st
 from ..config import HAS_AI
-from ..ai_client import chat_completion
+from ..ai_client import chat_completion, batch_chat_completion
 
 # ─── AI Strategic Opportunities ──────────────────────────────────
 STATIC_DIR = str(Path(__file__).resolve().parent.parent.parent / "static")
@@ -26,6 +25,29 @@ MOCK_OPPORTUNITIES = [
 ]
 
 
+# オポチュニティ抽出の不変な指示（system）。Haiku の最小キャッシュ長（4096トークン）に満たないためキャッシュ区切りは付けない
+_OPPORTUNITY_RULES = """あなたは富士通のKDDI担当アカウントストラテジストです。**WAKONX（KDDIのDX事業ブランド）とKDDI BX（ビジネス変革部門）**での共創ビジネス創出がミッションです。
+
+ユーザーが示すKDDI（特にWAKONX/BX）と富士通の最新動向・公式プレスリリースをクロス分析し、**期待度スコアの高い上位3件のビジネスオポチュニティのみ**抽出してください。
+
+**重要:**
+- KDDIプレスリリースから読み取れる課題・ニーズを仮説として活用
+- 富士通プレスリリースのUVANCEソリューションとの交差点を見出す
+- WAKONX（DX推進、AI活用、データ利活用）との連携機会を最優先
+- KDDI BX（事業変革、共創、新規事業）との協業機会を重視
+- 具体的な提案アクション（どのUvanceソリューションで何を提案するか）を明記
+- ユーザーが示すバリエーション要求に従い、過去の提案テーマと重複しないこと
+
+以下のJSON形式で出力してください。他のテキストは一切不要です。JSONのみ出力してください。
+
+[
+  {"title": "オポチュニティのタイトル（WAKONX/BXとの具体的連携内容）", "uvance_area": "関連するUvance領域", "score": 85, "score_reason": "スコアの根拠（WAKONX/BXでの実現可能性とインパクト）"},
+  ...
+]
+
+scoreは0-100のAI推奨度スコアです。WAKONX/BXでの実現可能性、事業インパクト、緊急度を総合評価してください。スコアの高い順に並べてください。"""
+
+
 def _get_past_titles(n: int = 10) -> list[str]:
     """直近n件の提案タイトルを取得"""
     try:
@@ -59,10 +81,10 @@ def _get_underrepresented_verticals() -> list[str]:
     return sorted(all_verticals, key=lambda v: counts.get(v, 0))
 
 
-@st.cache_data(ttl=7200)
 def _fetch_opportunities_api(kddi_news: tuple[str, ...], fujitsu_news: tuple[str, ...],
-                             kddi_press: tuple[str, ...] = (), fujitsu_press: tuple[str, ...] = ()) -> list[dict]:
-    """Claude APIでオポチュニティを取得（API有効時のみ呼ばれる）。"""
+                             kddi_press: tuple[str, ...] = (), fujitsu_press: tuple[str, ...] = (),
+                             cache: str = "use") -> list[dict]:
+    """Claude APIでオポチュニティを取得（API有効時のみ呼ばれる）。応答は chat_completion がキャッシュする。"""
     if not kddi_news and not fujitsu_news:
         return []
     try:
@@ -82,14 +104,18 @@ def _fetch_opportunities_api(kddi_news: tuple[str, ...], fujitsu_news: tuple[str
         industry_ctx = get_industry_context_for_proposal("Digital Shifts")  # 汎用的に取得
         kddi_strategy = get_kddi_strategic_context()
 
+        # 指示・出力形式・戦略資料（不変）を system に、ニュースと重複回避情報を user に置く
+        system = f"""{_OPPORTUNITY_RULES}
+
+【KDDI中期経営戦略】
+{kddi_strategy[:1500]}
+
+【競合・業界トレンド】
+{industry_ctx[:1500]}"""
         text = chat_completion(
             messages=[{
                 "role": "user",
-                "content": f"""あなたは富士通のKDDI担当アカウントストラテジストです。**WAKONX（KDDIのDX事業ブランド）とKDDI BX（ビジネス変革部門）**での共創ビジネス創出がミッションです。
-
-以下のKDDI（特にWAKONX/BX）と富士通の最新動向・公式プレスリリースをクロス分析し、**期待度スコアの高い上位3件のビジネスオポチュニティのみ**抽出してください。
-
-【KDDI（WAKONX/BX重点）の最新動向】
+                "content": f"""【KDDI（WAKONX/BX重点）の最新動向】
 {kddi_text}
 
 【KDDIプレスリリース（公式発表）】
@@ -101,19 +127,6 @@ def _fetch_opportunities_api(kddi_news: tuple[str, ...], fujitsu_news: tuple[str
 【富士通プレスリリース（UVANCE含む）】
 {fujitsu_press_text}
 
-【KDDI中期経営戦略】
-{kddi_strategy[:1500]}
-
-【競合・業界トレンド】
-{industry_ctx[:1500]}
-
-**重要:**
-- KDDIプレスリリースから読み取れる課題・ニーズを仮説として活用
-- 富士通プレスリリースのUVANCEソリューションとの交差点を見出す
-- WAKONX（DX推進、AI活用、データ利活用）との連携機会を最優先
-- KDDI BX（事業変革、共創、新規事業）との協業機会を重視
-- 具体的な提案アクション（どのUvanceソリューションで何を提案するか）を明記
-
 # バリエーション要求（必ず遵守）
 - 3件のオポチュニティは必ず**異なるUvanceバーティカル**から選ぶこと
 - 以下のバーティカルから最低2つ含めること: {underrepresented_text}
@@ -121,19 +134,13 @@ def _fetch_opportunities_api(kddi_news: tuple[str, ...], fujitsu_news: tuple[str
 - 過去に生成済みのテーマと重複しないこと
 
 # 過去の提案テーマ（重複回避）
-{past_titles_text}
-
-以下のJSON形式で出力してください。他のテキストは一切不要です。JSONのみ出力してください。
-
-[
-  {{"title": "オポチュニティのタイトル（WAKONX/BXとの具体的連携内容）", "uvance_area": "関連するUvance領域", "score": 85, "score_reason": "スコアの根拠（WAKONX/BXでの実現可能性とインパクト）"}},
-  ...
-]
-
-scoreは0-100のAI推奨度スコアです。WAKONX/BXでの実現可能性、事業インパクト、緊急度を総合評価してください。スコアの高い順に並べてください。"""
+{past_titles_text}"""
             }],
             max_tokens=800,
+            system=system,
             model="claude-haiku-4-5-20251001",
+            cache=cache,
+            stage="opportunities",
         ).strip()
         start = text.find("[")
         end = text.rfind("]") + 1
@@ -151,18 +158,66 @@ def generate_opportunities(kddi_news: tuple[str, ...], fujitsu_news: tuple[str,
         return MOCK_OPPORTUNITIES
     result = _fetch_opportunities_api(kddi_news, fujitsu_news, kddi_press, fujitsu_press)
     if not result:
-        # キャッシュに空リストが残っている場合クリアしてリトライ
-        _fetch_opportunities_api.clear()
-        result = _fetch_opportunities_api(kddi_news, fujitsu_news, kddi_press, fujitsu_press)
+        # キャッシュ済みの応答が解析できなかった場合は API を呼び直して上書き
+        result = _fetch_opportunities_api(kddi_news, fujitsu_news, kddi_press, fujitsu_press, cache="refresh")
     return result if result else MOCK_OPPORTUNITIES
 
 
-@st.cache_data(ttl=7200)
+# 詳細レポートの生成設定
+_DETAIL_REPORT_MAX_TOKENS = 8000
+_DETAIL_REPORT_MODEL = "claude-haiku-4-5-20251001"
+# generate_detail_reports の同時生成数
+DETAIL_REPORT_CONCURRENCY = 3
+# 詳細レポートの不変な指示（system）。オポチュニティ抽出と同じ理由でキャッシュ区切りは付けない
+_DETAIL_REPORT_RULES = """あなたは富士通のKDDI担当アカウントストラテジストです。**WAKONX（KDDIのDX事業ブランド）とKDDI BX（ビジネス変革部門）**でのビジネス創出がミッションです。
+
+ユーザーが示すオポチュニティについて、KDDIおよび富士通の最新動向・公式プレスリリースの内容を踏まえた詳細戦略レポートを作成してください。
+
+以下の6セクションで構成してください。**KDDIプレスリリースの内容を根拠とし、富士通プレスリリースのUVANCEソリューションを活用した具体的な提案**にしてください。
+
+1. 想定仮説（KDDIプレスリリースから読み取れる課題・ニーズの仮説。公式発表の内容を引用・分析し、KDDIが抱える潜在課題と事業ニーズを構造化する）
+2. 解決の方向性・コンセプト（UVANCE＋KDDI戦略の交差点。富士通UvanceのソリューションとKDDI/WAKONXの戦略が交わるポイントを明確化し、共創コンセプトを提示する）
+3. 提案内容（具体的なソリューション提案。対象部門、展開シナリオ、想定案件規模を含む具体的な提案を記述する）
+4. 期待される効果（定量・定性の効果。導入による定量的な効果（コスト削減額、売上増加見込み等）と定性的な効果（ブランド価値、競争力等）を明記する）
+5. ROI試算（投資対効果。初期投資額、年間コスト、売上見込み、BreakEvenポイントを試算する）
+6. Why Fujitsu（富士通だからこそのビジネス優位性。Uvanceのクロスインダストリー知見、Kozuchi AI、グローバルデリバリー体制、共創パートナーとしての信頼など、競合他社ではなく富士通を選ぶべき理由を明確に示す）
+
+各セクションの見出しは「■ セクション名」形式で記述してください。
+セクション内のサブ見出し・キーワード（KDDIの課題認識、潜在ニーズ、仮説、コンセプト、ソリューション構成、対象部門、定量効果、定性効果、初期投資、クロスインダストリー知見等）は必ず「＜サブ見出し＞」の形式（全角山括弧）で記述してください。マークダウン記法（#, **, * 等）は一切使わないでください。"""
+
+
+def _detail_report_messages(opportunity_title: str, kddi_news: tuple[str, ...], fujitsu_news: tuple[str, ...],
+                            kddi_press: tuple[str, ...] = (), fujitsu_press: tuple[str, ...] = ()) -> list[dict]:
+    """詳細戦略レポート生成プロンプト（タイトル間で共通のニュース・プレスを先に、タイトルを末尾に置く）"""
+    kddi_text = "\n".join(f"- {t}" for t in kddi_news) if kddi_news else "（取得なし）"
+    fujitsu_text = "\n".join(f"- {t}" for t in fujitsu_news) if fujitsu_news else "（取得なし）"
+    kddi_press_text = "\n".join(f"- {t}" for t in kddi_press) if kddi_press else "（取得なし）"
+    fujitsu_press_text = "\n".join(f"- {t}" for t in fujitsu_press) if fujitsu_press else "（取得なし）"
+    return [{
+        "role": "user",
+        "content": f"""【KDDI（WAKONX/BX重点）の最新動向】
+{kddi_text}
+
+【KDDIプレスリリース（公式発表）】
+{kddi_press_text}
+
+【富士通・Uvanceの最新動向】
+{fujitsu_text}
+
+【富士通プレスリリース（UVANCE含む）】
+{fujitsu_press_text}
+
+【オポチュニティ】
+{opportunity_title}
+
+上記のオポチュニティについて、詳細戦略レポートを作成してください。""",
+    }]
+
+
 def generate_detail_report(opportunity_title: str, kddi_news: tuple[str, ...], fujitsu_news: tuple[str, ...],
-                           kddi_press: tuple[str, ...] = (), fujitsu_press: tuple[str, ...] = ()) -> str | None:
-    """指定オポチュニティの詳細戦略レポートHTMLを生成し、staticフォルダに保存。ファイル名を返す。"""
-    mock_mode = not HAS_AI
-    if mock_mode:
+                           kddi_press: tuple[str, ...] = (), fujitsu_press: tuple[str, ...] = ()) -> tuple:
+    """指定オポチュニティの詳細戦略レポートHTMLを生成し、staticフォルダに保存。(ファイル名, セクションHTML, タイトル) を返す。"""
+    if not HAS_AI:
         report_text = f"""■ 想定仮説
 ＜KDDIの課題認識＞ KDDIのプレスリリースから、法人DX領域での競争激化と5G/AI活用による新サービス創出への強いニーズが読み取れる。
 ＜潜在ニーズ＞ {opportunity_title}に関連して、WAKONX推進におけるパートナーエコシステム強化、データ利活用基盤の高度化が急務と推察される。
@@ -197,52 +252,52 @@ def generate_detail_report(opportunity_title: str, kddi_news: tuple[str, ...], f
 ＜グローバルデリバリー体制＞ 国内最大級のSI人材リソースとグローバル13万人体制により、大規模案件の確実な遂行力を担保。NECやEricssonと比較し、End-to-End提案力で優位。
 ＜共創パートナーとしての信頼＞ KDDI既存取引関係による信頼基盤と、Uvance共創メソッドによる体系的な事業変革支援力が、単なるSIベンダーではなく戦略パートナーとしての価値を提供する。"""
     else:
-        report_text = None
-    try:
-        if not mock_mode:
-            kddi_text = "\n".join(f"- {t}" for t in kddi_news) if kddi_news else "（取得なし）"
-            fujitsu_text = "\n".join(f"- {t}" for t in fujitsu_news) if fujitsu_news else "（取得なし）"
-            kddi_press_text = "\n".join(f"- {t}" for t in kddi_press) if kddi_press else "（取得なし）"
-            fujitsu_press_text = "\n".join(f"- {t}" for t in fujitsu_press) if fujitsu_press else "（取得なし）"
+        try:
             print(f"[DEBUG-REPORT] Calling API for: {opportunity_title[:40]}...")
             report_text = chat_completion(
-                messages=[{
-                    "role": "user",
-                    "content": f"""あなたは富士通のKDDI担当アカウントストラテジストです。**WAKONX（KDDIのDX事業ブランド）とKDDI BX（ビジネス変革部門）**でのビジネス創出がミッションです。
-
-以下のオポチュニティについて、KDDIおよび富士通の公式プレスリリースの内容を踏まえた詳細戦略レポートを作成してください。
-
-【オポチュニティ】
-{opportunity_title}
-
-【KDDI（WAKONX/BX重点）の最新動向】
-{kddi_text}
-
-【KDDIプレスリリース（公式発表）】
-{kddi_press_text}
-
-【富士通・Uvanceの最新動向】
-{fujitsu_text}
-
-【富士通プレスリリース（UVANCE含む）】
-{fujitsu_press_text}
-
-以下の6セクションで構成してください。**KDDIプレスリリースの内容を根拠とし、富士通プレスリリースのUVANCEソリューションを活用した具体的な提案**にしてください。
-
-1. 想定仮説（KDDIプレスリリースから読み取れる課題・ニーズの仮説。公式発表の内容を引用・分析し、KDDIが抱える潜在課題と事業ニーズを構造化する）
-2. 解決の方向性・コンセプト（UVANCE＋KDDI戦略の交差点。富士通UvanceのソリューションとKDDI/WAKONXの戦略が交わるポイントを明確化し、共創コンセプトを提示する）
-3. 提案内容（具体的なソリューション提案。対象部門、展開シナリオ、想定案件規模を含む具体的な提案を記述する）
-4. 期待される効果（定量・定性の効果。導入による定量的な効果（コスト削減額、売上増加見込み等）と定性的な効果（ブランド価値、競争力等）を明記する）
-5. ROI試算（投資対効果。初期投資額、年間コスト、売上見込み、BreakEvenポイントを試算する）
-6. Why Fujitsu（富士通だからこそのビジネス優位性。Uvanceのクロスインダストリー知見、Kozuchi AI、グローバルデリバリー体制、共創パートナーとしての信頼など、競合他社ではなく富士通を選ぶべき理由を明確に示す）
-
-各セクションの見出しは「■ セクション名」形式で記述してください。
-セクション内のサブ見出し・キーワード（KDDIの課題認識、潜在ニーズ、仮説、コンセプト、ソリューション構成、対象部門、定量効果、定性効果、初期投資、クロスインダストリー知見等）は必ず「＜サブ見出し＞」の形式（全角山括弧）で記述してください。マークダウン記法（#, **, * 等）は一切使わないでください。"""
-                }],
-                max_tokens=8000,
-                model="claude-haiku-4-5-20251001",
+                messages=_detail_report_messages(opportunity_title, kddi_news, fujitsu_news, kddi_press, fujitsu_press),
+                max_tokens=_DETAIL_REPORT_MAX_TOKENS,
+                system=_DETAIL_REPORT_RULES,
+                model=_DETAIL_REPORT_MODEL,
+                stage="detail_report",
             ).strip()
+        except Exception as e:
+            print(f"[DEBUG-REPORT] EXCEPTION: {e}")
+            return None, "", ""
+    return _render_detail_report(opportunity_title, report_text)
 
+
+def generate_detail_reports(opportunity_titles: list[str], kddi_news: tuple[str, ...], fujitsu_news: tuple[str, ...],
+                            kddi_press: tuple[str, ...] = (), fujitsu_press: tuple[str, ...] = ()) -> dict[str, tuple]:
+    """複数オポチュニティの詳細レポートを並列生成 {タイトル: (ファイル名, セクションHTML, タイトル)}"""
+    if not HAS_AI:
+        return {t: generate_detail_report(t, kddi_news, fujitsu_news, kddi_press, fujitsu_press) for t in opportunity_titles}
+    texts = batch_chat_completion(
+        [
+            {
+                "messages": _detail_report_messages(t, kddi_news, fujitsu_news, kddi_press, fujitsu_press),
+                "max_tokens": _DETAIL_REPORT_MAX_TOKENS,
+                "system": _DETAIL_REPORT_RULES,
+                "model": _DETAIL_REPORT_MODEL,
+                "stage": "detail_report",
+            }
+            for t in opportunity_titles
+        ],
+        max_concurrency=DETAIL_REPORT_CONCURRENCY,
+    )
+    reports = {}
+    for title, text in zip(opportunity_titles, texts):
+        if isinstance(text, Exception):
+            print(f"[DEBUG-REPORT] EXCEPTION for {title[:40]}: {text}")
+            reports[title] = (None, "", "")
+        else:
+            reports[title] = _render_detail_report(title, text.strip())
+    return reports
+
+
+def _render_detail_report(opportunity_title: str, report_text: str) -> tuple:
+    """レポート本文を HTML 化して static に保存し (ファイル名, セクションHTML, タイトル) を返す"""
+    try:
         # HTMLテンプレートに埋め込み
         print(f"[DEBUG-REPORT] report_text length={len(report_text) if report_text else 0}, first 200 chars: {(report_text or '')[:200]}")
         sections_html = ""
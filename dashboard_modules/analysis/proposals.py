@@ -7,12 +7,10 @@ import json
 import os
 from datetime import datetime
 
-import streamlit as st
 from ..config import HAS_AI, APP_ROOT
-from ..ai_client import chat_completion
+from ..ai_client import cacheable, chat_completion, llm_usage_by_stage
 
 # ─── Proposal Framework Generator ────────────────────────────────
-@st.cache_data(ttl=7200)
 def generate_proposal_framework(opportunity_title: str, report_content: str) -> str | None:
     """オポチュニティレポートから提案骨子を生成"""
     if not HAS_AI:
@@ -137,75 +135,15 @@ def generate_proposal_framework(opportunity_title: str, report_content: str) ->
 
 # ─── Hypothesis Proposal Generator ───────────────────────────────
 _PROPOSAL_HISTORY_FILE = APP_ROOT / "data" / "proposal_history.json"
+# 仮説提案に渡す IR 資料・追加コンテキスト（関連チャンク）のトークン予算
+PROPOSAL_CONTEXT_TOKENS = 3000
 
-
-def generate_hypothesis_proposal(
-    opportunity_title: str,
-    report_content: str,
-    kddi_news: tuple | list = (),
-    fujitsu_news: tuple | list = (),
-    progress_callback=None,
-) -> dict:
-    """仮説提案書用の構造化テキストを生成する。
-
-    Returns:
-        dict: {
-            "gamma_input": str,       # Gamma API投入用テキスト（10スライド構成）
-            "approach_plan": str,     # テキストベースの週次アプローチ計画
-            "metadata": dict,         # pain_points, central_hypothesis, slide_count等
-            "generated_at": str,
-            "opportunity_title": str,
-        }
-    """
-    if not HAS_AI:
-        return {
-            "gamma_input": "",
-            "approach_plan": "AI APIが利用できません。ANTHROPIC_API_KEYを設定してください。",
-            "metadata": {},
-            "generated_at": datetime.now().isoformat(),
-            "opportunity_title": opportunity_title,
-        }
-
-    # コンテキスト情報を収集
-    from ..data.uvance_knowledge import get_uvance_context_for_proposal, get_poc_fatigue_context
-    from ..data.kddi_watcher import get_intelligence_summary
-    from ..components.context import get_active_context_data
-    from ..data.proposal_templates import select_template, get_past_template_names
-    from ..data.industry_context import get_industry_context_for_proposal, get_kddi_strategic_context
-
-    # テンプレート選択
-    past_templates = get_past_template_names()
-    # オポチュニティタイトルからバーティカルを推定
-    vertical = _infer_vertical(opportunity_title)
-    template = select_template(opportunity_title, vertical, past_templates)
-
-    uvance_context = get_uvance_context_for_proposal(opportunity_title, preferred_vertical=vertical)
-    poc_context = get_poc_fatigue_context()
-    intel_summary = get_intelligence_summary(15)
-    context_data = get_active_context_data() or ""
-
-    # 業界・競合コンテキスト
-    industry_ctx = get_industry_context_for_proposal(vertical)
-    kddi_strategy = get_kddi_strategic_context()
-
-    kddi_news_text = "\n".join(f"- {t}" for t in kddi_news[:10]) if kddi_news else "（最新ニュースなし）"
-    fujitsu_news_text = "\n".join(f"- {t}" for t in fujitsu_news[:10]) if fujitsu_news else "（最新ニュースなし）"
-
-    context_section = ""
-    if context_data:
-        context_section = f"""
-# IR資料・追加コンテキスト
-{context_data[:5000]}
-"""
-
-    # Phase 1: 仮説提案テキスト生成（Gamma投入用）
-    if progress_callback:
-        progress_callback(30, f"仮説提案ドラフト生成中（{template.name}形式）...")
-
-    gamma_prompt = f"""# 役割
+# 各工程の不変な指示（提案ごとに変わる値は埋め込まない）。ドラフト・批評は戦略資料と合わせて
+# キャッシュ接頭辞にする。アプローチ計画の指示は単体で最小キャッシュ長（Sonnet 1024トークン）に満たないため区切りを付けない
+_DRAFT_RULES = """# 役割
 あなたは「UVANCE×KDDI仮説提案書」を作成するエキスパートです。
-今回は「{template.name}」形式で作成します。{template.description}
 ピラミッド・ストラクチャー（ミント・ピラミッド原則）に基づき、KDDI経営層（CTO/CDO/事業部長クラス）が意思決定できる提案書を作成します。
+提案形式・トーン・スライド構成は後続の「今回の提案形式」に従います。
 
 # 提案書作成の原則（必ず遵守）
 
@@ -235,38 +173,9 @@ def generate_hypothesis_proposal(
 - イカ資料禁止：「以下で説明する」「下図で～」等の曖昧表現は使わない
 - 必ず自分の意見・判断を言語化する（状況や選択肢の提示だけで終わらない）
 - 頁数は最小限に。聞き手にとって冗長な情報は削る
-- トーン: {template.tone}
-
-# 入力情報
-
-## オポチュニティ
-{opportunity_title}
-
-## レポート内容
-{report_content[:4000]}
-
-## KDDI最新動向
-{kddi_news_text}
-
-## 富士通最新動向
-{fujitsu_news_text}
-
-## KDDIインテリジェンス
-{intel_summary[:2000]}
-
-{uvance_context}
-
-{poc_context}
-
-# 業界・競合コンテキスト
-{industry_ctx}
-
-# KDDI中期経営戦略
-{kddi_strategy}
-{context_section}
 
 # 出力指示
-以下のスライド構成で**Gamma.app用のプレーンテキスト**を生成してください。
+指定のスライド構成で**Gamma.app用のプレーンテキスト**を生成してください。
 
 **フォーマットルール:**
 - 各スライドは以下の形式で記述:
@@ -280,42 +189,21 @@ def generate_hypothesis_proposal(
 - 数値・ROIは具体的に
 - 専門用語は最小限
 
-# スライド構成
-{template.slide_structure}
-
 ## 重要な方針
 - 「PoC」「実証実験」という言葉は使わない。代わりに「Phase1本番稼働」「MVP構築」「共創推進」等を使う
 - 提案全体が「実験で終わらず本番に直結する」設計であること
 - 机上の空論ではなく、3ヶ月で成果が出る具体性を持たせること
 - メッセージラインだけを並べて読み、ストーリーとして成立するか自己チェックすること
-- 競合（NEC/NTTデータ/アクセンチュア）との差別化を意識した内容にすること
-
-上記の構成・原則・方針に従い、提案書テキストを生成してください。"""
-
-    try:
-        gamma_input = chat_completion(
-            messages=[{"role": "user", "content": gamma_prompt}],
-            max_tokens=6000,
-            model="claude-sonnet-4-5-20250929",
-        ).strip()
-    except Exception as e:
-        gamma_input = f"提案テキスト生成エラー: {e}"
-
-    # Phase 1.5: エグゼクティブ批評
-    executive_critique = ""
-    refinement_applied = False
-
-    if gamma_input and not gamma_input.startswith("提案テキスト生成エラー"):
-        if progress_callback:
-            progress_callback(40, "エグゼクティブ批評生成中...")
+- 競合（NEC/NTTデータ/アクセンチュア）との差別化を意識した内容にすること"""
 
-        critique_prompt = f"""# 役割
+_CRITIQUE_RULES = """# 役割
 あなたは日本の大企業（売上1兆円以上）のCTO/CDOクラスの意思決定者です。
 数多くのベンダー提案を見てきた経験から、「刺さる提案」と「ゴミ箱行きの提案」を瞬時に見分けます。
 あなたは懐疑的で、バズワードや抽象論には厳しく、具体性と実現可能性を重視します。
 
 # タスク
-以下の提案書ドラフトを、KDDIの経営層（CTO/CDO/事業部長）の目線で厳しく批評してください。
+ユーザーが示す提案書ドラフトを、KDDIの経営層（CTO/CDO/事業部長）の目線で厳しく批評してください。
+後続のKDDI中期経営戦略・PoC疲れ対策の方針と整合しているかも評価に含めてください。
 
 # 評価軸（各5点満点）
 1. **具体性**: 数値・期間・体制が具体的か。「〜等」「〜など」で逃げていないか
@@ -325,9 +213,6 @@ def generate_hypothesis_proposal(
 5. **バズワード汚染度**: DX、AI、共創等のバズワードが実体なく使われていないか（低いほど良い）
 6. **意思決定有効性**: この提案書で「Go/No-Go」の判断ができるか
 
-# 提案書ドラフト
-{gamma_input[:5000]}
-
 # 出力形式（厳守）
 ## 総合評価: [A/B/C/D/E]
 （A=即採用レベル, B=修正後採用可, C=大幅修正必要, D=方向性から再検討, E=却下）
@@ -348,33 +233,8 @@ def generate_hypothesis_proposal(
 - スライドN: [具体的な修正内容]
 （特に問題のあるスライドのみ）"""
 
-        try:
-            executive_critique = chat_completion(
-                messages=[{"role": "user", "content": critique_prompt}],
-                max_tokens=2000,
-                model="claude-sonnet-4-5-20250929",
-            ).strip()
-        except Exception as e:
-            print(f"[PROPOSAL] Executive critique failed: {e}")
-            executive_critique = ""
-
-        # Phase 1.6: 批評反映リファイン
-        if executive_critique:
-            if progress_callback:
-                progress_callback(50, "批評を反映した改善版を生成中...")
-
-            refine_prompt = f"""# 役割
-あなたは提案書ブラッシュアップの専門家です。
-エグゼクティブからの厳しい批評を受け、すべての指摘を解消した改善版を作成します。
-
-# タスク
-以下の「元の提案書」に対する「エグゼクティブ批評」を踏まえ、批評の全指摘事項を解消した**改善版10スライド**を生成してください。
-
-# 元の提案書
-{gamma_input[:5000]}
-
-# エグゼクティブ批評
-{executive_critique}
+_REFINE_RULES = """# タスク
+上記の「エグゼクティブ批評」を踏まえ、あなたが作成した提案書の全指摘事項を解消した**改善版**を生成してください。
 
 # 改善の原則
 - 批評で指摘された「致命的問題点」は必ず解消する
@@ -387,34 +247,13 @@ def generate_hypothesis_proposal(
 - 競合差別化のポイントを明確にする
 
 # 出力形式
-元の提案書と同じフォーマット（{template.name}形式、各スライドにタイトル・メッセージライン・ボディ）で改善版を出力してください。
-フォーマットルールは元の提案書と同一です。"""
+元の提案書と同じ提案形式・フォーマットルール（各スライドにタイトル・メッセージライン・ボディ）で改善版のみを出力してください。"""
 
-            try:
-                refined_input = chat_completion(
-                    messages=[{"role": "user", "content": refine_prompt}],
-                    max_tokens=6000,
-                    model="claude-sonnet-4-5-20250929",
-                ).strip()
-                if refined_input and len(refined_input) > 500:
-                    gamma_input = refined_input
-                    refinement_applied = True
-                else:
-                    print("[PROPOSAL] Refined output too short, keeping original")
-            except Exception as e:
-                print(f"[PROPOSAL] Refinement failed, using original: {e}")
-
-    # Phase 2: アプローチ計画生成
-    if progress_callback:
-        progress_callback(60, "アプローチ計画生成中...")
-    approach_prompt = f"""# 役割
+_APPROACH_RULES = """# 役割
 あなたはKDDIアカウント戦略の専門家です。
 
 # タスク
-以下の仮説提案に基づき、**4週間のアプローチ計画**を作成してください。
-
-## 提案内容
-{gamma_input[:3000]}
+ユーザーが示す仮説提案に基づき、**4週間のアプローチ計画**を作成してください。
 
 # 出力形式（マークダウン）
 
@@ -444,11 +283,176 @@ def generate_hypothesis_proposal(
 
 各週のアクションは具体的かつ実行可能な内容にしてください。"""
 
+
+def generate_hypothesis_proposal(
+    opportunity_title: str,
+    report_content: str,
+    kddi_news: tuple | list = (),
+    fujitsu_news: tuple | list = (),
+    progress_callback=None,
+) -> dict:
+    """仮説提案書用の構造化テキストを生成する。
+
+    Returns:
+        dict: {
+            "gamma_input": str,       # Gamma API投入用テキスト（10スライド構成）
+            "approach_plan": str,     # テキストベースの週次アプローチ計画
+            "metadata": dict,         # pain_points, central_hypothesis, slide_count等
+            "generated_at": str,
+            "opportunity_title": str,
+        }
+    """
+    if not HAS_AI:
+        return {
+            "gamma_input": "",
+            "approach_plan": "AI APIが利用できません。ANTHROPIC_API_KEYを設定してください。",
+            "metadata": {},
+            "generated_at": datetime.now().isoformat(),
+            "opportunity_title": opportunity_title,
+        }
+
+    # コンテキスト情報を収集
+    from ..data.uvance_knowledge import get_uvance_context_for_proposal, get_poc_fatigue_context
+    from ..data.kddi_watcher import get_intelligence_summary
+    from ..components.context_search import retrieve_context
+    from ..data.proposal_templates import select_template, get_past_template_names
+    from ..data.industry_context import get_industry_context_for_proposal, get_kddi_strategic_context
+
+    # テンプレート選択
+    past_templates = get_past_template_names()
+    # オポチュニティタイトルからバーティカルを推定
+    vertical = _infer_vertical(opportunity_title)
+    template = select_template(opportunity_title, vertical, past_templates)
+
+    uvance_context = get_uvance_context_for_proposal(opportunity_title, preferred_vertical=vertical)
+    poc_context = get_poc_fatigue_context()
+    intel_summary = get_intelligence_summary(15)
+    context_data = retrieve_context(f"{opportunity_title} {vertical}", max_tokens=PROPOSAL_CONTEXT_TOKENS)
+
+    # 業界・競合コンテキスト
+    industry_ctx = get_industry_context_for_proposal(vertical)
+    kddi_strategy = get_kddi_strategic_context()
+
+    kddi_news_text = "\n".join(f"- {t}" for t in kddi_news[:10]) if kddi_news else "（最新ニュースなし）"
+    fujitsu_news_text = "\n".join(f"- {t}" for t in fujitsu_news[:10]) if fujitsu_news else "（最新ニュースなし）"
+
+    context_section = ""
+    if context_data:
+        context_section = f"""
+# IR資料・追加コンテキスト
+{context_data}
+"""
+
+    # Phase 1: 仮説提案テキスト生成（Gamma投入用）
+    if progress_callback:
+        progress_callback(30, f"仮説提案ドラフト生成中（{template.name}形式）...")
+
+    # system = 全提案共通の原則・戦略資料 → テンプレート・業界別の指示（どちらもキャッシュ接頭辞）
+    # user   = オポチュニティごとに変わる入力。リファインでも同じ接頭辞を再利用する
+    draft_system = [
+        cacheable(f"{_DRAFT_RULES}\n\n{kddi_strategy}\n\n{poc_context}"),
+        cacheable(f"""# 今回の提案形式: {template.name}
+{template.description}
+- トーン: {template.tone}
+
+# スライド構成
+{template.slide_structure}
+
+{industry_ctx}"""),
+    ]
+    draft_inputs = f"""# 入力情報
+
+## オポチュニティ
+{opportunity_title}
+
+## レポート内容
+{report_content[:4000]}
+
+## KDDI最新動向
+{kddi_news_text}
+
+## 富士通最新動向
+{fujitsu_news_text}
+
+## KDDIインテリジェンス
+{intel_summary[:2000]}
+
+{uvance_context}
+{context_section}
+上記の入力に基づき、「{template.name}」形式・指定のスライド構成で提案書テキストを生成してください。"""
+    draft_messages = [{"role": "user", "content": [cacheable(draft_inputs)]}]
+
+    try:
+        gamma_input = chat_completion(
+            messages=draft_messages,
+            max_tokens=6000,
+            system=draft_system,
+            model="claude-sonnet-4-5-20250929",
+            stage="proposal.draft",
+        ).strip()
+    except Exception as e:
+        gamma_input = f"提案テキスト生成エラー: {e}"
+
+    # Phase 1.5: エグゼクティブ批評
+    executive_critique = ""
+    refinement_applied = False
+
+    if gamma_input and not gamma_input.startswith("提案テキスト生成エラー"):
+        if progress_callback:
+            progress_callback(40, "エグゼクティブ批評生成中...")
+
+        try:
+            executive_critique = chat_completion(
+                messages=[{"role": "user", "content": f"# 提案書ドラフト\n{gamma_input[:5000]}"}],
+                max_tokens=2000,
+                system=[cacheable(f"{_CRITIQUE_RULES}\n\n{kddi_strategy}\n\n{poc_context}")],
+                model="claude-sonnet-4-5-20250929",
+                stage="proposal.critique",
+            ).strip()
+        except Exception as e:
+            print(f"[PROPOSAL] Executive critique failed: {e}")
+            executive_critique = ""
+
+        # Phase 1.6: 批評反映リファイン（ドラフト生成の会話に批評を続け、system と入力はキャッシュから読む）
+        if executive_critique:
+            if progress_callback:
+                progress_callback(50, "批評を反映した改善版を生成中...")
+
+            refine_prompt = f"""# エグゼクティブ批評
+{executive_critique}
+
+{_REFINE_RULES}"""
+
+            try:
+                refined_input = chat_completion(
+                    messages=draft_messages + [
+                        {"role": "assistant", "content": gamma_input},
+                        {"role": "user", "content": refine_prompt},
+                    ],
+                    max_tokens=6000,
+                    system=draft_system,
+                    model="claude-sonnet-4-5-20250929",
+                    stage="proposal.refine",
+                ).strip()
+                if refined_input and len(refined_input) > 500:
+                    gamma_input = refined_input
+                    refinement_applied = True
+                else:
+                    print("[PROPOSAL] Refined output too short, keeping original")
+            except Exception as e:
+                print(f"[PROPOSAL] Refinement failed, using original: {e}")
+
+    # Phase 2: アプローチ計画生成
+    if progress_callback:
+        progress_callback(60, "アプローチ計画生成中...")
+
     try:
         approach_plan = chat_completion(
-            messages=[{"role": "user", "content": approach_prompt}],
+            messages=[{"role": "user", "content": f"## 提案内容\n{gamma_input[:3000]}"}],
             max_tokens=3000,
+            system=_APPROACH_RULES,
             model="claude-sonnet-4-5-20250929",
+            stage="proposal.approach",
         ).strip()
     except Exception as e:
         approach_plan = f"アプローチ計画生成エラー: {e}"
@@ -478,6 +482,12 @@ def generate_hypothesis_proposal(
     # 履歴に保存
     _save_proposal_history(result)
 
+    # 工程別のプロンプトキャッシュ効果（API 応答の usage のプロセス累計）
+    for stage, usage in llm_usage_by_stage().items():
+        if stage.startswith("proposal."):
+            print(f"[PROPOSAL] {stage}: {usage['calls']} calls, cached {usage['cached_ratio']:.0%} of input, "
+                  f"saved ~{usage['saved_input_tokens']:,.0f} input tokens, {usage['api_seconds']:.1f}s")
+
     return result
 
 
@@ -309,6 +309,7 @@ def _select_opportunity(kddi_news: tuple | list, fujitsu_news: tuple | list) ->
                 }],
                 max_tokens=100,
                 model="claude-haiku-4-5-20251001",
+                stage="select_opportunity",
             ).strip()
             return result
         except Exception:
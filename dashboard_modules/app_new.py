@@ -14,14 +14,14 @@ from dashboard_modules.config import PAGE_CONFIG
 
 # Components
 from dashboard_modules.components.news import fetch_news_for
-from dashboard_modules.components.chat import get_chat_response
+from dashboard_modules.components.chat import stream_chat_response
 from dashboard_modules.components.context import (
     get_context_files, add_context_file, toggle_context_file,
     delete_context_file, get_active_context_data
 )
 
 # Analysis
-from dashboard_modules.analysis.opportunities import generate_opportunities, generate_detail_report
+from dashboard_modules.analysis.opportunities import generate_opportunities, generate_detail_reports
 
 # UI
 from dashboard_modules.ui.html_builder import build_dashboard_html
@@ -130,12 +130,10 @@ def render():
             # スコア順にソートして上位3件のみレポート生成
             top_opportunities = sorted(opportunities, key=lambda x: x.get("score", 0), reverse=True)[:3] if opportunities else []
             report_data_cache = {}
-            total = len(top_opportunities) if top_opportunities else 1
-            for idx, opp in enumerate(top_opportunities):
-                t = opp.get("title", "Unknown")
-                pct = 15 + int((idx / total) * 80)
-                progress_bar.progress(pct, text=f"Generating report {idx+1}/{total}...")
-                fname, sec_html, rep_title = generate_detail_report(t, kddi_tuple, fujitsu_tuple)
+            titles = [opp.get("title", "Unknown") for opp in top_opportunities]
+            progress_bar.progress(15, text=f"Generating {len(titles)} reports in parallel...")
+            reports = generate_detail_reports(titles, kddi_tuple, fujitsu_tuple)
+            for t, (fname, sec_html, rep_title) in reports.items():
                 report_data_cache[t] = {"filename": fname, "sections_html": sec_html, "title": rep_title}
             progress_bar.progress(100, text="Complete!")
             st.session_state["report_data_cache"] = report_data_cache
@@ -167,9 +165,8 @@ def render():
 
             # AIレスポンス生成
             with st.chat_message("assistant"):
-                with st.spinner("AI Strategist is thinking..."):
-                    response = get_chat_response(prompt, st.session_state.chat_messages[:-1])
-                st.markdown(response)
+                # 生成されたトークンから順に表示し、全文を履歴に残す
+                response = st.write_stream(stream_chat_response(prompt, st.session_state.chat_messages[:-1]))
 
             # AIメッセージを履歴に追加
             st.session_state.chat_messages.append({"role": "assistant", "content": response})
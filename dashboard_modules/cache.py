@@ -0,0 +1,317 @@
+"""
+Persistent Cache - SQLite-backed memoization shared across processes
+=====================================================================
+st.cache_data はプロセス内メモリのため、再起動・レプリカ追加のたびに
+RSS取得やLLM呼び出しをやり直すことになる。ここでは data/ 配下の SQLite に
+結果を保存し、同じマシン上の全プロセスで共有する。
+
+    @disk_cache(ttl=300)
+    def fetch_news_for(query: str, n: int = 4) -> list[dict]: ...
+
+    fetch_news_for.clear()   # 関数単位で全エントリ削除
+    fetch_news_for.refresh("KDDI")  # キャッシュを見ずに再計算して保存
+    fetch_news_for.stats()   # {"hits": int, "misses": int, ...}
+
+hard_ttl を指定すると stale-while-revalidate になる:
+ttl 経過後〜hard_ttl までは前回値を即座に返し、裏で再取得する。
+"""
+from __future__ import annotations
+
+import functools
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+from .config import APP_ROOT
+
+CACHE_DB = Path(os.getenv("DASHBOARD_CACHE_DB", str(APP_ROOT / "data" / "cache.sqlite3")))
+
+# キャッシュ全体のサイズ上限（超過分はアクセスの古い順に削除）
+_MAX_TOTAL_BYTES = int(os.getenv("DASHBOARD_CACHE_MAX_BYTES", str(128 * 1024 * 1024)))
+
+# 失敗した再取得を再試行するまでの最短間隔（秒）
+_REFRESH_RETRY_INTERVAL = 30.0
+
+_local = threading.local()
+_stats_lock = threading.Lock()
+_stats: dict[str, dict[str, int]] = {}
+
+# stale-while-revalidate の状態
+_refresh_lock = threading.Lock()
+_inflight: set[tuple[str, str]] = set()
+_last_attempt: dict[tuple[str, str], float] = {}
+_stale_served: dict[tuple[str, str], tuple[str, float]] = {}  # (func, key) -> (label, データ作成時刻)
+
+
+def _connect() -> sqlite3.Connection:
+    """スレッドごとに SQLite 接続を保持する（WALモードで複数プロセスから同時アクセス可）"""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        CACHE_DB.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(CACHE_DB), timeout=10, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            """CREATE TABLE IF NOT EXISTS entries (
+                func TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value BLOB NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL,
+                PRIMARY KEY (func, key)
+            )"""
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries (accessed_at)")
+        _local.conn = conn
+    return conn
+
+
+def _make_key(args: tuple, kwargs: dict) -> str:
+    payload = pickle.dumps((args, sorted(kwargs.items())), protocol=4)
+    return hashlib.sha256(payload).hexdigest()
+
+
+def _count(func_name: str, field: str) -> None:
+    with _stats_lock:
+        entry = _stats.setdefault(func_name, {"hits": 0, "misses": 0, "stale": 0, "errors": 0})
+        entry[field] += 1
+
+
+def _read(func_name: str, key: str) -> tuple[Any, float] | None:
+    """(値, 作成時刻) を返す。未登録なら None"""
+    conn = _connect()
+    row = conn.execute(
+        "SELECT value, created_at FROM entries WHERE func = ? AND key = ?",
+        (func_name, key),
+    ).fetchone()
+    if row is None:
+        return None
+    conn.execute(
+        "UPDATE entries SET accessed_at = ? WHERE func = ? AND key = ?",
+        (time.time(), func_name, key),
+    )
+    return pickle.loads(row[0]), row[1]
+
+
+def _write(func_name: str, key: str, value: Any, max_entries: int) -> None:
+    blob = pickle.dumps(value, protocol=4)
+    now = time.time()
+    conn = _connect()
+    conn.execute(
+        "INSERT OR REPLACE INTO entries (func, key, value, created_at, accessed_at, size) VALUES (?, ?, ?, ?, ?, ?)",
+        (func_name, key, blob, now, now, len(blob)),
+    )
+    _evict(conn, func_name, max_entries)
+
+
+def _evict(conn: sqlite3.Connection, func_name: str, max_entries: int) -> None:
+    """関数ごとのエントリ数上限と全体のバイト数上限を適用する（LRU）"""
+    conn.execute(
+        """DELETE FROM entries WHERE func = ? AND key NOT IN (
+               SELECT key FROM entries WHERE func = ? ORDER BY accessed_at DESC LIMIT ?
+           )""",
+        (func_name, func_name, max_entries),
+    )
+    total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+    if total <= _MAX_TOTAL_BYTES:
+        return
+    rows = conn.execute("SELECT func, key, size FROM entries ORDER BY accessed_at ASC").fetchall()
+    for func, key, size in rows:
+        if total <= _MAX_TOTAL_BYTES:
+            break
+        conn.execute("DELETE FROM entries WHERE func = ? AND key = ?", (func, key))
+        total -= size
+
+
+def disk_cache(
+    ttl: float,
+    max_entries: int = 256,
+    name: str | None = None,
+    hard_ttl: float | None = None,
+    cache_if: Callable[[Any], bool] | None = None,
+    label: str | None = None,
+) -> Callable:
+    """SQLite永続キャッシュデコレータ（st.cache_data の置き換え用）
+
+    Parameters
+    ----------
+    ttl : float
+        鮮度の有効期限（秒）
+    max_entries : int
+        この関数で保持する最大エントリ数（超過時はアクセスの古い順に削除）
+    name : str | None
+        キャッシュ名前空間（省略時は "module.qualname"）
+    hard_ttl : float | None
+        指定時は ttl〜hard_ttl の間、前回値を返しつつバックグラウンドで再取得する
+    cache_if : Callable | None
+        False を返した結果は保存しない（取得失敗で前回の正常値を上書きしないため）
+    label : str | None
+        古いデータを返している間に HUD へ表示する名前
+    """
+    def decorator(func: Callable) -> Callable:
+        func_name = name or f"{func.__module__}.{func.__qualname__}"
+        stale_label = label or func.__name__
+
+        def _store(key: str, value: Any) -> bool:
+            if cache_if is not None and not cache_if(value):
+                return False
+            try:
+                _write(func_name, key, value, max_entries)
+            except Exception as e:
+                print(f"[CACHE] Write failed for {func_name}: {e}")
+                _count(func_name, "errors")
+                return False
+            return True
+
+        def _refresh(key: str, args: tuple, kwargs: dict) -> None:
+            try:
+                if _store(key, func(*args, **kwargs)):
+                    with _refresh_lock:
+                        _stale_served.pop((func_name, key), None)
+            except Exception as e:
+                print(f"[CACHE] Background refresh failed for {func_name}: {e}")
+            finally:
+                with _refresh_lock:
+                    _inflight.discard((func_name, key))
+
+        def _schedule_refresh(key: str, args: tuple, kwargs: dict) -> None:
+            slot = (func_name, key)
+            now = time.time()
+            with _refresh_lock:
+                if slot in _inflight or now - _last_attempt.get(slot, 0.0) < _REFRESH_RETRY_INTERVAL:
+                    return
+                _inflight.add(slot)
+                _last_attempt[slot] = now
+            threading.Thread(
+                target=_refresh, args=(key, args, kwargs),
+                name=f"cache-refresh:{func.__name__}", daemon=True,
+            ).start()
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                key = _make_key(args, kwargs)
+                cached = _read(func_name, key)
+            except Exception as e:
+                print(f"[CACHE] Read failed for {func_name}: {e}")
+                _count(func_name, "errors")
+                return func(*args, **kwargs)
+
+            if cached is not None:
+                value, created_at = cached
+                age = time.time() - created_at
+                if age < ttl:
+                    _count(func_name, "hits")
+                    with _refresh_lock:
+                        _stale_served.pop((func_name, key), None)
+                    return value
+                if hard_ttl is not None and age < hard_ttl:
+                    _count(func_name, "stale")
+                    with _refresh_lock:
+                        _stale_served[(func_name, key)] = (stale_label, created_at)
+                    _schedule_refresh(key, args, kwargs)
+                    return value
+
+            _count(func_name, "misses")
+            value = func(*args, **kwargs)
+            if _store(key, value):
+                with _refresh_lock:
+                    _stale_served.pop((func_name, key), None)
+            return value
+
+        def refresh(*args, **kwargs):
+            """キャッシュを参照せずに再計算し、結果を保存して返す"""
+            _count(func_name, "misses")
+            value = func(*args, **kwargs)
+            try:
+                key = _make_key(args, kwargs)
+            except Exception as e:
+                print(f"[CACHE] Key failed for {func_name}: {e}")
+                return value
+            if _store(key, value):
+                with _refresh_lock:
+                    _stale_served.pop((func_name, key), None)
+            return value
+
+        def peek(*args, **kwargs):
+            """有効期限内のキャッシュ値を返す（なければ None。func は呼ばない）"""
+            try:
+                cached = _read(func_name, _make_key(args, kwargs))
+            except Exception as e:
+                print(f"[CACHE] Read failed for {func_name}: {e}")
+                return None
+            if cached is None or time.time() - cached[1] >= ttl:
+                _count(func_name, "misses")
+                return None
+            _count(func_name, "hits")
+            return cached[0]
+
+        def put(value: Any, *args, **kwargs) -> bool:
+            """func を呼ばずに得た結果（ストリーミング応答の全文など）を args のエントリとして保存"""
+            try:
+                key = _make_key(args, kwargs)
+            except Exception as e:
+                print(f"[CACHE] Key failed for {func_name}: {e}")
+                return False
+            return _store(key, value)
+
+        def clear() -> None:
+            try:
+                _connect().execute("DELETE FROM entries WHERE func = ?", (func_name,))
+            except Exception as e:
+                print(f"[CACHE] Clear failed for {func_name}: {e}")
+
+        def stats() -> dict[str, int]:
+            with _stats_lock:
+                return dict(_stats.get(func_name, {"hits": 0, "misses": 0, "stale": 0, "errors": 0}))
+
+        wrapper.clear = clear
+        wrapper.refresh = refresh
+        wrapper.peek = peek
+        wrapper.put = put
+        wrapper.stats = stats
+        wrapper.cache_name = func_name
+        return wrapper
+
+    return decorator
+
+
+def mark_stale(label: str, key: str, created_at: float) -> None:
+    """キャッシュ外のデータソース（フィードストア等）の鮮度切れを HUD 表示用に登録"""
+    with _refresh_lock:
+        _stale_served[(label, key)] = (label, created_at)
+
+
+def mark_fresh(label: str, key: str) -> None:
+    with _refresh_lock:
+        _stale_served.pop((label, key), None)
+
+
+def get_stale_sources() -> dict[str, float]:
+    """現在古い値を返しているデータソースと、その最大経過秒数 {label: age}"""
+    now = time.time()
+    result: dict[str, float] = {}
+    with _refresh_lock:
+        for label, created_at in _stale_served.values():
+            result[label] = max(result.get(label, 0.0), now - created_at)
+    return result
+
+
+def get_cache_stats() -> dict[str, dict[str, int]]:
+    """このプロセスでの関数別ヒット/ミス数を返す"""
+    with _stats_lock:
+        return {k: dict(v) for k, v in _stats.items()}
+
+
+def clear_all() -> None:
+    """全キャッシュエントリを削除"""
+    try:
+        _connect().execute("DELETE FROM entries")
+    except Exception as e:
+        print(f"[CACHE] Clear failed: {e}")
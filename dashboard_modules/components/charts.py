@@ -0,0 +1,120 @@
+"""
+Sparkline Charts - Memoized SVG rendering with LTTB downsampling
+系列のフィンガープリント + サイズ + 色をキーに SVG 文字列をキャッシュする。
+長い期間（数百点）の系列は LTTB で描画幅に見合う点数まで間引き、SVG サイズを一定に保つ。
+"""
+from __future__ import annotations
+
+import hashlib
+import struct
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# 1点あたりの最小横幅（px）。これより密な系列は間引く
+_PX_PER_POINT = 2
+_CACHE_SIZE = 256
+
+_svg_cache: OrderedDict[str, str] = OrderedDict()
+_cache_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+
+def series_fingerprint(dates: list[str], values: list[float]) -> str:
+    """系列の内容ハッシュ（同じ日付・値なら同じキー）"""
+    h = hashlib.blake2b(digest_size=16)
+    h.update("\x1f".join(dates).encode("utf-8"))
+    h.update(struct.pack(f"{len(values)}d", *values))
+    return h.hexdigest()
+
+
+def lttb_indices(values: list[float] | np.ndarray, threshold: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets で残す点のインデックス（先頭・末尾は常に残す）"""
+    y = np.asarray(values, dtype=float)
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.arange(n, dtype=float)
+    every = (n - 2) / (threshold - 2)
+    indices = np.empty(threshold, dtype=int)
+    indices[0] = 0
+    a = 0
+    for i in range(threshold - 2):
+        # 次のバケットの平均点
+        avg_start = int((i + 1) * every) + 1
+        avg_end = min(int((i + 2) * every) + 1, n)
+        avg_x = x[avg_start:avg_end].mean()
+        avg_y = y[avg_start:avg_end].mean()
+        # 現在バケットで三角形面積が最大の点
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        indices[i + 1] = a
+    indices[-1] = n - 1
+    return indices
+
+
+def _render(dates: list[str], closes: list[float], color: str, width: int, height: int,
+            keep: np.ndarray) -> str:
+    """keep（描画する点の元系列でのインデックス）の点を、元系列上の位置に描く"""
+    last = len(closes) - 1
+    dates = [dates[i] for i in keep]
+    closes = [closes[i] for i in keep]
+
+    mn, mx = min(closes), max(closes)
+    rng = mx - mn if mx != mn else 1
+    pad = 8
+    cw = width - pad * 2
+    ch = height - pad * 2
+    xs = [pad + (int(k) / last) * cw for k in keep]
+    polyline = " ".join(
+        f"{x:.1f},{pad + ch - ((v - mn) / rng) * ch:.1f}"
+        for x, v in zip(xs, closes)
+    )
+    # fill area
+    fill_points = f"{pad:.1f},{height - pad:.1f} " + polyline + f" {width - pad:.1f},{height - pad:.1f}"
+    # date labels
+    labels = ""
+    for i in sorted({0, len(dates) // 2, len(dates) - 1}):
+        x = xs[i]
+        labels += f'<text x="{x:.1f}" y="{height - 1}" fill="rgba(0,255,204,0.3)" font-size="7" text-anchor="middle">{dates[i]}</text>'
+    grad_id = f"chartGrad{color.replace('#', '')}"
+    return f"""<svg width="{width}" height="{height}" style="display:block;margin-top:6px;">
+        <polygon points="{fill_points}" fill="url(#{grad_id})" />
+        <polyline points="{polyline}" fill="none" stroke="{color}" stroke-width="1.5" stroke-linejoin="round"/>
+        <defs><linearGradient id="{grad_id}" x1="0" y1="0" x2="0" y2="1">
+            <stop offset="0%" stop-color="{color}" stop-opacity="0.25"/>
+            <stop offset="100%" stop-color="{color}" stop-opacity="0.02"/>
+        </linearGradient></defs>
+        {labels}
+    </svg>"""
+
+
+def render_sparkline(dates: list[str], closes: list[float],
+                     color: str = "#00ffcc", width: int = 280, height: int = 80) -> str:
+    """終値系列の SVG スパークライン（同じ系列・サイズ・色ならキャッシュを返す）"""
+    if not closes or len(closes) < 2:
+        return '<div style="color:rgba(0,255,204,0.2);font-size:0.7rem;">NO DATA</div>'
+    key = f"{series_fingerprint(dates, closes)}:{width}x{height}:{color}"
+    with _cache_lock:
+        svg = _svg_cache.get(key)
+        if svg is not None:
+            _svg_cache.move_to_end(key)
+            _stats["hits"] += 1
+            return svg
+        _stats["misses"] += 1
+    # 描画幅に対して点が多すぎる系列は LTTB で間引く（x 位置は元の系列上の位置を保つ）
+    keep = lttb_indices(closes, max(3, width // _PX_PER_POINT))
+    svg = _render(list(dates), list(closes), color, width, height, keep)
+    with _cache_lock:
+        _svg_cache[key] = svg
+        while len(_svg_cache) > _CACHE_SIZE:
+            _svg_cache.popitem(last=False)
+    return svg
+
+
+def chart_cache_stats() -> dict[str, int]:
+    with _cache_lock:
+        return {**_stats, "entries": len(_svg_cache)}
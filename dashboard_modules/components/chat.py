@@ -1,30 +1,20 @@
 """
 Strategy Chat - AI-powered chat for strategic discussions
 """
+from typing import Iterator
+
 import streamlit as st
 from ..config import HAS_AI
-from ..ai_client import chat_completion
-from .context import get_active_context_data
-
-# ─── Strategy Chat ────────────────────────────────────────────────
-def get_chat_response(user_message: str, chat_history: list[dict]) -> str:
-    """戦略議論チャットのレスポンスを生成"""
-    if not HAS_AI:
-        return "エラー: AI APIが利用できません。"
+from ..ai_client import chat_completion, stream_chat_completion
+from .context_search import retrieve_context
 
-    try:
-        # コンテキストデータを取得
-        context_data = get_active_context_data()
-        context_section = f"\n\n# アップロード済みコンテキスト情報\n{context_data}" if context_data else ""
+# チャットに渡すコンテキスト（関連チャンク）のトークン予算
+CHAT_CONTEXT_TOKENS = 4000
+CHAT_MAX_TOKENS = 2000
+CHAT_MODEL = "claude-sonnet-4-5-20250929"
 
-        # レポートデータを取得（もしあれば）
-        report_data = st.session_state.get("report_data_cache", {})
-        report_titles = [rd.get("title", "") for rd in report_data.values() if rd.get("title")]
-        reports_section = ""
-        if report_titles:
-            reports_section = f"\n\n# 生成済みAIレポート\n" + "\n".join(f"- {t}" for t in report_titles[:5])
-
-        system_prompt = f"""あなたは富士通のKDDI担当アカウントストラテジストのアシスタントです。
+# ─── Strategy Chat ────────────────────────────────────────────────
+_CHAT_RULES = """あなたは富士通のKDDI担当アカウントストラテジストのアシスタントです。
 
 # あなたの役割
 - KDDI（特にWAKONX/KDDI BX）向けのビジネス戦略について議論・ブレスト
@@ -40,7 +30,6 @@ def get_chat_response(user_message: str, chat_history: list[dict]) -> str:
 - Kozuchi AI Platform: AI/ML基盤、生成AI活用
 - Consumer Experience: 顧客体験向上、デジタルマーケ
 - Cyber Security: セキュリティソリューション
-{context_section}{reports_section}
 
 # 応答スタイル
 - 簡潔で実践的なアドバイス
@@ -49,25 +38,72 @@ def get_chat_response(user_message: str, chat_history: list[dict]) -> str:
 - 具体的なアクション案を含める
 """
 
-        # メッセージ履歴を構築
-        messages = []
-        for msg in chat_history[-10:]:  # 最新10件まで
-            messages.append({
-                "role": msg["role"],
-                "content": msg["content"]
-            })
+
+def _build_chat_request(user_message: str, chat_history: list[dict]) -> tuple[str, list[dict]]:
+    """システムプロンプト（コンテキスト・生成済みレポート込み）と送信メッセージを組み立てる"""
+    # コンテキストデータ（今回と直前のユーザー発言に関連するチャンク）を取得
+    previous_user = next((m["content"] for m in reversed(chat_history) if m.get("role") == "user"), "")
+    context_data = retrieve_context(f"{user_message}\n{previous_user}", max_tokens=CHAT_CONTEXT_TOKENS)
+    context_section = f"\n\n# アップロード済みコンテキスト情報\n{context_data}" if context_data else ""
+
+    # レポートデータを取得（もしあれば）
+    report_data = st.session_state.get("report_data_cache", {})
+    report_titles = [rd.get("title", "") for rd in report_data.values() if rd.get("title")]
+    reports_section = ""
+    if report_titles:
+        reports_section = f"\n\n# 生成済みAIレポート\n" + "\n".join(f"- {t}" for t in report_titles[:5])
+
+    # 不変な役割・スタイルを先頭に、発言ごとに変わるコンテキストを後ろに置く
+    # （役割部分は最小キャッシュ長に満たないためキャッシュ区切りは付けない）
+    system_prompt = _CHAT_RULES + context_section + reports_section
+
+    # メッセージ履歴を構築
+    messages = []
+    for msg in chat_history[-10:]:  # 最新10件まで
         messages.append({
-            "role": "user",
-            "content": user_message
+            "role": msg["role"],
+            "content": msg["content"]
         })
+    messages.append({
+        "role": "user",
+        "content": user_message
+    })
+
+    return system_prompt, messages
 
+
+def get_chat_response(user_message: str, chat_history: list[dict]) -> str:
+    """戦略議論チャットのレスポンスを生成"""
+    if not HAS_AI:
+        return "エラー: AI APIが利用できません。"
+
+    try:
+        system_prompt, messages = _build_chat_request(user_message, chat_history)
         return chat_completion(
             messages=messages,
-            max_tokens=2000,
+            max_tokens=CHAT_MAX_TOKENS,
             system=system_prompt,
-            model="claude-sonnet-4-5-20250929",
+            model=CHAT_MODEL,
+            stage="chat",
         )
     except Exception as e:
         return f"エラーが発生しました: {str(e)}"
 
 
+def stream_chat_response(user_message: str, chat_history: list[dict]) -> Iterator[str]:
+    """戦略議論チャットのレスポンスを生成しながら断片ごとに返す（st.write_stream 用）"""
+    if not HAS_AI:
+        yield "エラー: AI APIが利用できません。"
+        return
+
+    try:
+        system_prompt, messages = _build_chat_request(user_message, chat_history)
+        yield from stream_chat_completion(
+            messages=messages,
+            max_tokens=CHAT_MAX_TOKENS,
+            system=system_prompt,
+            model=CHAT_MODEL,
+            stage="chat",
+        )
+    except Exception as e:
+        yield f"\n\nエラーが発生しました: {str(e)}"
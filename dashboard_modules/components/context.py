@@ -1,49 +1,118 @@
 """
 Context Library - File upload and management
+アップロードされたファイルは context/ に保存し、メタデータ（内容ハッシュ・抽出済みテキストの保存先・
+ページ数/シート数・有効フラグ）は data/context_index の SQLite 索引に記録する。
+索引は全セッション・再起動後も共有され、抽出はアップロード時に1回だけ行う。
+ダッシュボード（iframe）にはファイル名・サイズ・有効フラグのマニフェストだけを渡し、
+抽出済み本文は static/context/ の JSON として公開して使用時にだけ取得させる。
 """
+import hashlib
+import json
 import os
+import threading
 from pathlib import Path
-import streamlit as st
+from urllib.parse import quote
 from datetime import datetime
 
+from .images import STATIC_DIR, STATIC_URL_PREFIX
+from ..cache import disk_cache
+from ..data import context_index
+
 # ─── Context Library (File Management) ───────────────────────────
 CONTEXT_DIR = str(Path(__file__).resolve().parent.parent.parent / "context")
 os.makedirs(CONTEXT_DIR, exist_ok=True)
+# 抽出済みテキストの保存先（context/.extracted/{ファイル名ハッシュ}-{内容ハッシュ}-v{抽出器バージョン}.txt）
+EXTRACTED_DIR = os.path.join(CONTEXT_DIR, ".extracted")
+# 抽出済み本文の公開先（static/context/{ファイル名ハッシュ}-{内容ハッシュ}-v{抽出器バージョン}.json）
+CONTEXT_CONTENT_DIR = STATIC_DIR / "context"
+CONTEXT_SEPARATOR = "\n" + "=" * 50 + "\n\n"
+SUPPORTED_TYPES = ("xlsx", "xls", "txt", "md", "csv", "pdf")
+
+# 抽出ロジック（extract_*）を変更したら上げる。古い抽出結果は次回参照時に再抽出される
+EXTRACTOR_VERSION = 3
+# 抽出上限（プロンプトには context_search で関連チャンクだけを渡すため、全文に近い量を索引化する）
+PDF_MAX_PAGES = 300
+EXCEL_MAX_ROWS = 2000          # 1シートあたり
+TEXT_MAX_CHARS = 1_000_000
+# ダッシュボード（Gemini 用プロンプトのコピー）に公開する本文の上限（ファイルごと）
+PUBLISH_MAX_CHARS = 20000
+# 抽出失敗時の戻り値（キャッシュしない。依存ライブラリ未導入も失敗扱いで、導入後に再抽出される）
+_EXTRACT_ERRORS = ("エクセル読み込みエラー", "テキスト読み込みエラー", "PDF読み込みエラー")
+_MISSING_DEPENDENCY = "ライブラリがインストールされていません"
+
+# プロセス内の抽出済みテキスト {text_path: text} と統合済みテキストのメモ
+_extract_lock = threading.Lock()
+_extracted: dict[str, str] = {}
+_combined: dict[tuple, str] = {}
+_COMBINED_MAX = 8   # セッションごとにアクティブ構成が異なっても数件は保持
+# 依存ライブラリ未導入で失敗したファイルのうち、このプロセスで再抽出を試みたもの {(ファイル名, 内容ハッシュ)}
+_dependency_retried: set[tuple[str, str]] = set()
+
+def _name_key(filename: str) -> str:
+    return hashlib.sha1(filename.encode("utf-8")).hexdigest()[:8]
 
-def get_context_files():
-    """アップロード済みファイル一覧を取得"""
-    if "context_files" not in st.session_state:
-        st.session_state.context_files = {}
-    return st.session_state.context_files
+def _file_type(filename: str) -> str:
+    return filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+
+def get_context_files() -> dict[str, dict]:
+    """アップロード済みファイル一覧（全セッション共有の索引）。
+
+    context/ にあって未登録のファイル（索引導入前のアップロード等）は登録し、
+    ディスクから消えたファイルは索引から外す。
+    """
+    try:
+        indexed = context_index.load_files()
+        on_disk = {
+            name for name in os.listdir(CONTEXT_DIR)
+            if os.path.isfile(os.path.join(CONTEXT_DIR, name)) and _file_type(name) in SUPPORTED_TYPES
+        }
+        changed = False
+        for name in sorted(on_disk - indexed.keys()):
+            mtime = os.path.getmtime(os.path.join(CONTEXT_DIR, name))
+            index_context_file(name, _file_type(name), datetime.fromtimestamp(mtime).strftime("%Y-%m-%d %H:%M:%S"))
+            changed = True
+        for name in indexed.keys() - on_disk:
+            _forget(name, indexed[name])
+            changed = True
+        return context_index.load_files() if changed else indexed
+    except Exception as e:
+        print(f"[CONTEXT] Index read failed: {e}")
+        return {}
 
 def add_context_file(filename: str, content: bytes, file_type: str):
-    """コンテキストファイルを追加"""
+    """コンテキストファイルを追加（抽出・索引登録・公開をここで1回だけ行う）"""
     filepath = os.path.join(CONTEXT_DIR, filename)
     with open(filepath, "wb") as f:
         f.write(content)
-
-    if "context_files" not in st.session_state:
-        st.session_state.context_files = {}
-
-    st.session_state.context_files[filename] = {
-        "path": filepath,
-        "type": file_type,
-        "active": True,
-        "uploaded_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    }
+    entry = index_context_file(filename, file_type)
+    publish_context_content(filename, entry)
 
 def toggle_context_file(filename: str):
-    """ファイルのアクティブ状態を切り替え"""
-    if filename in st.session_state.context_files:
-        st.session_state.context_files[filename]["active"] = not st.session_state.context_files[filename]["active"]
+    """ファイルのアクティブ状態を切り替え（全セッション共通）"""
+    entry = context_index.load_files().get(filename)
+    if entry is not None:
+        context_index.set_active(filename, not entry["active"])
+        with _extract_lock:
+            _combined.clear()
 
 def delete_context_file(filename: str):
     """コンテキストファイルを削除"""
-    if filename in st.session_state.context_files:
-        filepath = st.session_state.context_files[filename]["path"]
-        if os.path.exists(filepath):
-            os.remove(filepath)
-        del st.session_state.context_files[filename]
+    entry = context_index.load_files().get(filename)
+    if entry is not None:
+        if os.path.exists(entry["path"]):
+            os.remove(entry["path"])
+        _forget(filename, entry)
+
+def _forget(filename: str, entry: dict) -> None:
+    """索引・抽出済みテキスト・公開ファイルを削除"""
+    context_index.remove_file(filename)
+    if entry.get("text_path") and os.path.exists(entry["text_path"]):
+        os.remove(entry["text_path"])
+    for published in CONTEXT_CONTENT_DIR.glob(f"{_name_key(filename)}-*.json"):
+        published.unlink(missing_ok=True)
+    with _extract_lock:
+        _extracted.pop(entry.get("text_path"), None)
+        _combined.clear()
 
 def extract_excel_data(filepath: str) -> str:
     """Excelファイルから財務データを抽出"""
@@ -53,10 +122,10 @@ def extract_excel_data(filepath: str) -> str:
         xl_file = pd.ExcelFile(filepath)
         extracted = f"【エクセルファイル: {os.path.basename(filepath)}】\n\n"
 
-        for sheet_name in xl_file.sheet_names[:3]:  # 最初の3シートまで
-            df = pd.read_excel(filepath, sheet_name=sheet_name, nrows=100)  # 最大100行
+        for sheet_name in xl_file.sheet_names:
+            df = pd.read_excel(filepath, sheet_name=sheet_name, nrows=EXCEL_MAX_ROWS)
             extracted += f"## シート: {sheet_name}\n"
-            extracted += df.to_string(index=False, max_rows=50)
+            extracted += df.to_string(index=False)
             extracted += "\n\n"
 
         return extracted
@@ -67,12 +136,12 @@ def extract_text_data(filepath: str) -> str:
     """テキストファイルからデータを抽出"""
     try:
         with open(filepath, "r", encoding="utf-8") as f:
-            content = f.read()[:10000]  # 最初の10000文字
+            content = f.read()[:TEXT_MAX_CHARS]
         return f"【テキストファイル: {os.path.basename(filepath)}】\n\n{content}"
     except:
         try:
             with open(filepath, "r", encoding="shift-jis") as f:
-                content = f.read()[:10000]
+                content = f.read()[:TEXT_MAX_CHARS]
             return f"【テキストファイル: {os.path.basename(filepath)}】\n\n{content}"
         except Exception as e:
             return f"テキスト読み込みエラー: {str(e)}"
@@ -85,41 +154,179 @@ def extract_pdf_data(filepath: str) -> str:
 
         with open(filepath, "rb") as f:
             pdf_reader = pypdf.PdfReader(f)
-            num_pages = min(len(pdf_reader.pages), 20)  # 最大20ページ
+            num_pages = min(len(pdf_reader.pages), PDF_MAX_PAGES)
 
             for page_num in range(num_pages):
                 page = pdf_reader.pages[page_num]
                 text = page.extract_text()
                 extracted += f"--- Page {page_num + 1} ---\n{text}\n\n"
 
-                # 文字数制限（約20000文字まで）
-                if len(extracted) > 20000:
-                    extracted = extracted[:20000] + "\n\n[... 以降省略 ...]"
-                    break
-
         return extracted
     except ImportError:
-        return f"【PDFファイル: {os.path.basename(filepath)}】\n\nエラー: pypdfライブラリがインストールされていません。\n`pip install pypdf` を実行してください。"
+        return "PDF読み込みエラー: pypdfライブラリがインストールされていません。`pip install pypdf` を実行してください。"
     except Exception as e:
         return f"PDF読み込みエラー: {str(e)}"
 
-def get_active_context_data() -> str:
-    """アクティブなコンテキストファイルのデータを統合"""
-    context_files = get_context_files()
-    context_data = ""
+def extract_context_file(filepath: str, file_type: str) -> str:
+    """ファイル種別に応じた抽出関数で本文を取り出す（未対応の種別は空文字）"""
+    if file_type in ["xlsx", "xls"]:
+        return extract_excel_data(filepath)
+    elif file_type in ["txt", "md", "csv"]:
+        return extract_text_data(filepath)
+    elif file_type == "pdf":
+        return extract_pdf_data(filepath)
+    return ""
 
-    for filename, info in context_files.items():
-        if info["active"]:
-            filepath = info["path"]
-            file_type = info["type"]
+# ─── Extraction & index ────────────────────────────────────────
+def _file_sha256(filepath: str) -> str:
+    h = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
 
-            if file_type in ["xlsx", "xls"]:
-                context_data += extract_excel_data(filepath) + "\n" + "="*50 + "\n\n"
-            elif file_type in ["txt", "md", "csv"]:
-                context_data += extract_text_data(filepath) + "\n" + "="*50 + "\n\n"
-            elif file_type == "pdf":
-                context_data += extract_pdf_data(filepath) + "\n" + "="*50 + "\n\n"
+@disk_cache(
+    ttl=365 * 24 * 3600, max_entries=512, name="context.extract",
+    cache_if=lambda text: not text.startswith(_EXTRACT_ERRORS),
+)
+def _extract_by_hash(content_hash: str, extractor_version: int, filepath: str, file_type: str) -> str:
+    """内容ハッシュ + 抽出器バージョンをキーに抽出結果をディスクへ保存（ファイル名は見出しに含まれるためキーに含む）"""
+    return extract_context_file(filepath, file_type)
+
+def _count_units(filepath: str, file_type: str) -> tuple[int | None, int | None]:
+    """(ページ数, シート数)。該当しない種別・読めない場合は None"""
+    try:
+        if file_type == "pdf":
+            import pypdf
+            with open(filepath, "rb") as f:
+                return len(pypdf.PdfReader(f).pages), None
+        if file_type in ["xlsx", "xls"]:
+            import pandas as pd
+            return None, len(pd.ExcelFile(filepath).sheet_names)
+    except Exception:
+        pass
+    return None, None
 
+def index_context_file(filename: str, file_type: str, uploaded_at: str | None = None) -> dict:
+    """ファイルを抽出して索引に登録し、登録内容を返す（有効フラグ・アップロード日時は既存の値を引き継ぐ）"""
+    filepath = os.path.join(CONTEXT_DIR, filename)
+    previous = context_index.load_files().get(filename, {})
+    sha256 = _file_sha256(filepath)
+    text = _extract_by_hash(sha256, EXTRACTOR_VERSION, filepath, file_type)
+    text_path = None
+    if not text.startswith(_EXTRACT_ERRORS):
+        os.makedirs(EXTRACTED_DIR, exist_ok=True)
+        text_path = os.path.join(EXTRACTED_DIR, f"{_name_key(filename)}-{sha256[:16]}-v{EXTRACTOR_VERSION}.txt")
+        with open(text_path, "w", encoding="utf-8") as f:
+            f.write(text)
+    if previous.get("text_path") and previous["text_path"] != text_path and os.path.exists(previous["text_path"]):
+        os.remove(previous["text_path"])
+    pages, sheets = _count_units(filepath, file_type)
+    entry = {
+        "filename": filename,
+        "path": filepath,
+        "type": file_type,
+        "sha256": sha256,
+        "size": os.path.getsize(filepath),
+        "uploaded_at": uploaded_at or previous.get("uploaded_at") or datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "active": previous.get("active", True),
+        "text_path": text_path,
+        "pages": pages,
+        "sheets": sheets,
+        "chars": len(text),
+        "extractor_version": EXTRACTOR_VERSION,
+        "error": None if text_path else text,
+    }
+    context_index.upsert_file(entry)
+    with _extract_lock:
+        _extracted.pop(previous.get("text_path"), None)
+        if text_path:
+            _extracted[text_path] = text
+        elif _MISSING_DEPENDENCY in text:
+            _dependency_retried.add((filename, sha256))   # このプロセスでは再抽出しても同じ結果
+        _combined.clear()
+    print(f"[CONTEXT] Indexed {filename}: {len(text):,} chars (pages={pages}, sheets={sheets})")
+    return entry
+
+def indexed_text(entry: dict) -> str:
+    """索引の抽出済みテキスト（プロセス内では辞書参照のみ。欠損・旧バージョンなら再抽出）。
+    同じ抽出器バージョンで抽出に失敗済みのファイルは再抽出せず、記録したエラー文を返す
+    （依存ライブラリ未導入による失敗のみ、導入後の再起動に備えてプロセスごとに1回再抽出する）"""
+    text_path = entry.get("text_path")
+    with _extract_lock:
+        text = _extracted.get(text_path) if text_path else None
+    if text is not None:
+        return text
+    current = entry.get("extractor_version") == EXTRACTOR_VERSION
+    if not text_path and current and entry.get("error"):
+        retry_key = (entry["filename"], entry["sha256"])
+        with _extract_lock:
+            if _MISSING_DEPENDENCY not in entry["error"] or retry_key in _dependency_retried:
+                return entry["error"]
+            _dependency_retried.add(retry_key)
+    if text_path and current and os.path.exists(text_path):
+        with open(text_path, "r", encoding="utf-8") as f:
+            text = f.read()
+        with _extract_lock:
+            _extracted[text_path] = text
+        return text
+    if not os.path.exists(entry["path"]):
+        return ""
+    refreshed = index_context_file(entry["filename"], entry["type"])
+    return _extracted.get(refreshed["text_path"], "") if refreshed["text_path"] else refreshed["error"] or ""
+
+def get_active_context_data() -> str:
+    """アクティブなコンテキストファイルのデータを統合（同じ構成なら前回の結果を返す）"""
+    active = [entry for entry in get_context_files().values() if entry["active"]]
+    combined_key = tuple((e["filename"], e["sha256"], e["extractor_version"]) for e in active)
+    with _extract_lock:
+        context_data = _combined.get(combined_key)
+    if context_data is not None:
+        return context_data
+
+    context_data = ""
+    for entry in active:
+        extracted = indexed_text(entry)
+        if extracted:
+            context_data += extracted + CONTEXT_SEPARATOR
+
+    with _extract_lock:
+        _combined[combined_key] = context_data
+        while len(_combined) > _COMBINED_MAX:
+            del _combined[next(iter(_combined))]
     return context_data
 
+# ─── Front-end manifest ─────────────────────────────────────────
+def publish_context_content(filename: str, entry: dict) -> str:
+    """抽出済み本文を static/context/ に JSON で公開し URL を返す（公開済みなら何もしない）"""
+    out = CONTEXT_CONTENT_DIR / f"{_name_key(filename)}-{entry['sha256'][:12]}-v{EXTRACTOR_VERSION}.json"
+    if out.exists():
+        return f"{STATIC_URL_PREFIX}/context/{out.name}"
+    text = indexed_text(entry)
+    if len(text) > PUBLISH_MAX_CHARS:
+        text = text[:PUBLISH_MAX_CHARS] + "\n\n[... 以降省略 ...]"
+    body = json.dumps({"name": filename, "text": text}, ensure_ascii=False)
+    try:
+        CONTEXT_CONTENT_DIR.mkdir(parents=True, exist_ok=True)
+        for stale in CONTEXT_CONTENT_DIR.glob(f"{_name_key(filename)}-*.json"):
+            stale.unlink(missing_ok=True)
+        out.write_text(body, encoding="utf-8")
+    except OSError as e:
+        print(f"[CONTEXT] Publish failed for {filename}: {e}")
+        return "data:application/json;charset=utf-8," + quote(body)
+    return f"{STATIC_URL_PREFIX}/context/{out.name}"
 
+def get_context_manifest() -> list[dict]:
+    """フロントエンド用のマニフェスト（ファイル名・種別・サイズ・有効フラグ・本文 URL）"""
+    return [
+        {
+            "name": filename,
+            "type": entry["type"],
+            "size": entry["size"],
+            "pages": entry["pages"],
+            "sheets": entry["sheets"],
+            "active": entry["active"],
+            "url": publish_context_content(filename, entry) if entry["active"] else "",
+        }
+        for filename, entry in get_context_files().items()
+    ]
@@ -0,0 +1,188 @@
+"""
+Context Search - Chunked BM25 retrieval over the context library
+=================================================================
+アクティブなコンテキストファイルの抽出済みテキストをチャンクに分割し、文字 bigram（日本語）と
+英数字の単語をトークンとした BM25 索引を作る。チャット・仮説提案のプロンプトには
+ファイル先頭から切り詰めたテキストではなく、質問・オポチュニティに関連するチャンクだけを
+トークン予算内で渡す。
+
+    section = retrieve_context("KDDI 生成AI 投資計画", max_tokens=3000)
+
+索引はアクティブ構成（ファイル名・内容ハッシュ・抽出器バージョン）ごとにプロセス内でメモ化する。
+該当チャンクがない場合は各ファイル先頭のチャンクを予算内で返す（従来の先頭切り詰めと同等）。
+"""
+from __future__ import annotations
+
+import math
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from itertools import zip_longest
+
+from .context import get_context_files, indexed_text
+
+# チャンクの目安サイズ（文字）。行の途中では切らない（1行がこれを超える場合のみ分割）
+CHUNK_CHARS = 800
+# BM25 パラメータ
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+_PAGE_RE = re.compile(r"^--- Page (\d+) ---$")
+_SHEET_RE = re.compile(r"^## シート: (.+)$")
+_ASCII_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9.%+-]*")
+_CJK_RUN_RE = re.compile(r"[\u3005\u3040-\u30ff\u3400-\u9fff\uf900-\ufaff\uff66-\uff9f]+")
+
+
+@dataclass(frozen=True)
+class Chunk:
+    filename: str
+    location: str          # "p.3" / "シート: PL" / ""（見出し表示用）
+    order: int             # 全体での出現順（ファイル順 → ファイル内位置）
+    text: str
+    tokens: Counter
+
+
+def tokenize(text: str) -> list[str]:
+    """英数字は単語、日本語は文字 bigram（1文字だけの連なりはその文字）に分解"""
+    text = text.lower()
+    tokens = _ASCII_TOKEN_RE.findall(text)
+    for run in _CJK_RUN_RE.findall(text):
+        if len(run) == 1:
+            tokens.append(run)
+        else:
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+    return tokens
+
+
+def estimate_tokens(text: str) -> int:
+    """トークン数の概算（日本語は1文字≒1トークン、ASCII は4文字≒1トークン）"""
+    ascii_chars = sum(1 for ch in text if ch < "\x80")
+    return (len(text) - ascii_chars) + ascii_chars // 4 + 1
+
+
+def _split_chunks(filename: str, text: str, start_order: int) -> list[Chunk]:
+    """行単位で CHUNK_CHARS 程度にまとめる。ページ・シート見出しでは必ず区切り、位置として記録する"""
+    chunks: list[Chunk] = []
+    location = ""
+    lines: list[str] = []
+    size = 0
+
+    def flush():
+        nonlocal lines, size
+        body = "\n".join(lines).strip()
+        if body:
+            chunks.append(Chunk(filename, location, start_order + len(chunks), body, Counter(tokenize(body))))
+        lines, size = [], 0
+
+    for line in text.splitlines():
+        stripped = line.strip()
+        page = _PAGE_RE.match(stripped)
+        sheet = _SHEET_RE.match(stripped)
+        if page or sheet:
+            flush()
+            location = f"p.{page.group(1)}" if page else f"シート: {sheet.group(1)}"
+            continue
+        while len(line) > CHUNK_CHARS:
+            flush()
+            lines, size = [line[:CHUNK_CHARS]], CHUNK_CHARS
+            flush()
+            line = line[CHUNK_CHARS:]
+        if size + len(line) > CHUNK_CHARS:
+            flush()
+        lines.append(line)
+        size += len(line) + 1
+    flush()
+    return chunks
+
+
+class ContextIndex:
+    """アクティブなコンテキストファイル群の BM25 索引"""
+
+    def __init__(self, chunks: list[Chunk]):
+        self.chunks = chunks
+        self.doc_freq: Counter = Counter()
+        for chunk in chunks:
+            self.doc_freq.update(chunk.tokens.keys())
+        self.avg_len = (sum(sum(c.tokens.values()) for c in chunks) / len(chunks)) if chunks else 0.0
+
+    def score(self, query_tokens: list[str]) -> list[tuple[float, Chunk]]:
+        """クエリに対する BM25 スコア（0 より大きいチャンクのみ、降順）"""
+        n = len(self.chunks)
+        terms = set(query_tokens)
+        idf = {
+            t: math.log(1 + (n - self.doc_freq[t] + 0.5) / (self.doc_freq[t] + 0.5))
+            for t in terms if self.doc_freq[t]
+        }
+        scored = []
+        for chunk in self.chunks:
+            length = sum(chunk.tokens.values())
+            s = 0.0
+            for t, w in idf.items():
+                tf = chunk.tokens.get(t, 0)
+                if tf:
+                    s += w * tf * (BM25_K1 + 1) / (tf + BM25_K1 * (1 - BM25_B + BM25_B * length / self.avg_len))
+            if s > 0:
+                scored.append((s, chunk))
+        scored.sort(key=lambda sc: (-sc[0], sc[1].order))
+        return scored
+
+
+_index_lock = threading.Lock()
+_indexes: dict[tuple, ContextIndex] = {}
+_INDEX_MAX = 4
+
+
+def get_context_index() -> ContextIndex:
+    """アクティブなファイル構成の索引（同じ構成ならメモ化済みを返す）"""
+    active = [entry for entry in get_context_files().values() if entry["active"]]
+    key = tuple((e["filename"], e["sha256"], e["extractor_version"]) for e in active)
+    with _index_lock:
+        index = _indexes.get(key)
+    if index is not None:
+        return index
+
+    chunks: list[Chunk] = []
+    for entry in active:
+        chunks.extend(_split_chunks(entry["filename"], indexed_text(entry), len(chunks)))
+    index = ContextIndex(chunks)
+    print(f"[CONTEXT] Search index built: {len(active)} files, {len(chunks)} chunks")
+    with _index_lock:
+        _indexes[key] = index
+        while len(_indexes) > _INDEX_MAX:
+            del _indexes[next(iter(_indexes))]
+    return index
+
+
+def _format(chunks: list[Chunk]) -> str:
+    parts = []
+    for chunk in sorted(chunks, key=lambda c: c.order):
+        label = f"{chunk.filename} {chunk.location}".strip()
+        parts.append(f"【{label}】\n{chunk.text}")
+    return "\n\n".join(parts)
+
+
+def retrieve_context(query: str, max_tokens: int = 3000, top_k: int = 12) -> str:
+    """クエリに関連するチャンクを BM25 上位から max_tokens 以内で選び、文書順に並べて返す（なければ空文字）"""
+    index = get_context_index()
+    if not index.chunks:
+        return ""
+    ranked = [chunk for _score, chunk in index.score(tokenize(query))]
+    if not ranked:
+        # 関連チャンクなし → 各ファイル先頭から交互に
+        firsts: dict[str, list[Chunk]] = {}
+        for chunk in index.chunks:
+            firsts.setdefault(chunk.filename, []).append(chunk)
+        ranked = [c for group in zip_longest(*firsts.values()) for c in group if c is not None]
+
+    selected, used = [], 0
+    for chunk in ranked:
+        if len(selected) >= top_k:
+            break
+        cost = estimate_tokens(chunk.text)
+        if used + cost > max_tokens:
+            continue
+        selected.append(chunk)
+        used += cost
+    print(f"[CONTEXT] Retrieved {len(selected)}/{len(index.chunks)} chunks (~{used:,} tokens) for: {query[:40]}")
+    return _format(selected)
@@ -0,0 +1,91 @@
+"""
+Feed HTTP - Pooled, conditional RSS downloads
+ETag / Last-Modified をURLごとに保持して条件付きGETを送り、未変更フィードはパースしない
+新しい検証子は呼び出し側が記事を保存した後に記録する（保存前に記録すると、失敗時に次回が「未変更」になり取りこぼす）
+"""
+from __future__ import annotations
+
+import hashlib
+import threading
+
+import feedparser
+import requests
+from requests.adapters import HTTPAdapter
+
+from ..data import article_store
+
+# (接続タイムアウト, 読み取りタイムアウト) 秒
+DEFAULT_TIMEOUT = (5.0, 15.0)
+
+_USER_AGENT = f"StrategicDashboard/1.0 feedparser/{feedparser.__version__}"
+_POOL_SIZE = 16
+
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+
+
+def _get_session() -> requests.Session:
+    """keep-alive接続をホストごとにプールする共有セッション"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=8, pool_maxsize=_POOL_SIZE, max_retries=1)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers["User-Agent"] = _USER_AGENT
+            _session = session
+        return _session
+
+
+def fetch_feed(
+    url: str,
+    conditional: bool = True,
+    timeout: tuple[float, float] = DEFAULT_TIMEOUT,
+) -> tuple[feedparser.FeedParserDict, dict | None] | None:
+    """フィードを取得してパースし (feed, 検証子) を返す。未変更（304 または本文ハッシュ一致）なら None。
+
+    検証子 {"url", "etag", "last_modified", "body_hash"} はまだ保存しない。記事の保存に成功してから
+    article_store.save_validators(**validators) で記録すること（空・不正なフィードでは None）。
+
+    Parameters
+    ----------
+    url : str
+        フィードURL
+    conditional : bool
+        前回の検証子で条件付きGETを送るか（前回結果がストアにない場合は False にする）
+    timeout : tuple[float, float]
+        (接続, 読み取り) タイムアウト秒
+
+    Raises
+    ------
+    requests.RequestException  通信エラー・HTTPエラー時
+    """
+    headers = {}
+    validators = article_store.load_validators(url) if conditional else None
+    if validators:
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+
+    resp = _get_session().get(url, headers=headers, timeout=timeout)
+    if resp.status_code == 304:
+        return None
+    resp.raise_for_status()
+
+    body_hash = hashlib.sha256(resp.content).hexdigest()
+    if conditional and validators and validators.get("body_hash") == body_hash:
+        # 検証子非対応のサーバーでも、本文が同一ならパースを省略
+        return None
+
+    feed = feedparser.parse(resp.content, response_headers={k.lower(): v for k, v in resp.headers.items()})
+    if not feed.entries:
+        # 空・不正なフィードの検証子は返さない（前回の正常データを「未変更」と誤認しないため）
+        return feed, None
+    return feed, {
+        "url": url,
+        "etag": resp.headers.get("ETag", ""),
+        "last_modified": resp.headers.get("Last-Modified", ""),
+        "body_hash": body_hash,
+    }
@@ -1,41 +1,144 @@
 """
 Image processing utilities
+===========================
+スプラッシュ・背景画像は起動時に表示サイズ別の WebP に変換し、内容ハッシュ付きの
+ファイル名で static/assets/ に書き出す。HTML からは /app/static/... の URL で参照するため、
+ブラウザキャッシュが効き、iframe に数MBの Base64 を埋め込まずに済む。
+
+    build_static_assets()                 # 起動時（変更がなければ stat のみ）
+    asset_url("opening.png", width=960)   # -> "/app/static/assets/opening-960.1a2b3c4d.webp"
+
+※ AVIF は Streamlit の静的配信が image/avif を返さない（text/plain + nosniff）ため生成しない。
 """
 from __future__ import annotations
 
-import os
-import base64
+import hashlib
 import io
+import json
+import threading
+from pathlib import Path
+
 from PIL import Image
-from ..config import ASSET_DIR
-
-
-def load_image_b64(filename: str, max_size: int = 1000) -> str | None:
-    """画像をBase64エンコードして返す"""
-    path = os.path.join(ASSET_DIR, filename)
-    if not os.path.exists(path):
-        return None
-    try:
-        img = Image.open(path)
-        img.thumbnail((max_size, max_size), Image.LANCZOS)
-        buf = io.BytesIO()
-        if img.mode == "RGBA":
-            img.save(buf, format="WEBP", quality=70)
-        else:
-            img = img.convert("RGB")
-            img.save(buf, format="WEBP", quality=70)
-        return "data:image/webp;base64," + base64.b64encode(buf.getvalue()).decode()
-    except Exception:
-        return None
-
-
-def img_tag(data_uri: str | None, cls: str) -> str:
+from ..config import APP_ROOT, ASSET_DIR
+
+STATIC_DIR = APP_ROOT / "static"
+ASSET_OUT_DIR = STATIC_DIR / "assets"
+STATIC_URL_PREFIX = "/app/static"
+_MANIFEST = ASSET_OUT_DIR / "manifest.json"
+
+# 変換対象: {ファイル名: (元画像ディレクトリ, 生成する横幅のリスト)}
+ASSET_SPECS: dict[str, tuple[Path, tuple[int, ...]]] = {
+    "opening.png": (APP_ROOT, (1920, 1280)),         # デスクトップ起動スプラッシュ
+    "opening2.png": (APP_ROOT, (960, 640)),          # モバイル起動スプラッシュ
+    "back.png": (APP_ROOT, (1600, 800)),             # 背景ロゴ
+    "bg_frame.png": (Path(ASSET_DIR), (1000,)),      # HUDフレーム
+    "map_hologram.png": (Path(ASSET_DIR), (1000, 600)),
+}
+_WEBP_QUALITY = 78
+
+_build_lock = threading.Lock()
+_manifest: dict | None = None
+
+
+def img_tag(src: str | None, cls: str) -> str:
     """画像タグまたはプレースホルダーを返す"""
-    if data_uri:
-        return f'<img src="{data_uri}" class="{cls}">'
+    if src:
+        return f'<img src="{src}" class="{cls}">'
     return f'<div class="{cls} placeholder"></div>'
 
 
-# プリロード画像
-IMG_BG = load_image_b64("bg_frame.png")
-IMG_MAP = load_image_b64("map_hologram.png")
+# ─── Static asset pipeline ───────────────────────────────────────
+def _source_signature(path: Path) -> str:
+    st = path.stat()
+    return f"{st.st_size}:{st.st_mtime_ns}"
+
+
+def _encode_webp(img: Image.Image, width: int) -> bytes:
+    variant = img.copy()
+    if variant.width > width:
+        variant.thumbnail((width, width * variant.height // variant.width), Image.LANCZOS)
+    if variant.mode not in ("RGB", "RGBA"):
+        variant = variant.convert("RGBA" if "A" in variant.getbands() else "RGB")
+    buf = io.BytesIO()
+    variant.save(buf, format="WEBP", quality=_WEBP_QUALITY, method=6)
+    return buf.getvalue()
+
+
+def _build_one(name: str, source: Path, widths: tuple[int, ...], old: dict | None) -> dict:
+    """1画像分の WebP 変換。生成済みファイルは内容ハッシュ名で書き出し、古い版は削除"""
+    stem = Path(name).stem
+    variants: dict[str, str] = {}
+    with Image.open(source) as img:
+        img.load()
+        for width in widths:
+            data = _encode_webp(img, width)
+            digest = hashlib.sha256(data).hexdigest()[:10]
+            rel = f"assets/{stem}-{width}.{digest}.webp"
+            out = STATIC_DIR / rel
+            if not out.exists():
+                out.write_bytes(data)
+            variants[str(width)] = rel
+    for rel in (old or {}).get("variants", {}).values():
+        if rel not in variants.values():
+            (STATIC_DIR / rel).unlink(missing_ok=True)
+    total = sum((STATIC_DIR / rel).stat().st_size for rel in variants.values())
+    print(f"[ASSETS] {name}: {source.stat().st_size:,} -> {total:,} bytes ({len(variants)} variants)")
+    return {"source": _source_signature(source), "variants": variants}
+
+
+def build_static_assets(force: bool = False) -> dict:
+    """ASSET_SPECS の全画像を WebP 化（元画像が変わっていなければスキップ）。manifest を返す"""
+    global _manifest
+    with _build_lock:
+        try:
+            manifest = json.loads(_MANIFEST.read_text(encoding="utf-8")) if _MANIFEST.exists() else {}
+        except Exception:
+            manifest = {}
+        changed = False
+        ASSET_OUT_DIR.mkdir(parents=True, exist_ok=True)
+        for name, (src_dir, widths) in ASSET_SPECS.items():
+            source = src_dir / name
+            if not source.exists():
+                if manifest.pop(name, None) is not None:
+                    changed = True
+                continue
+            entry = manifest.get(name)
+            up_to_date = (
+                entry is not None
+                and entry.get("source") == _source_signature(source)
+                and all((STATIC_DIR / rel).exists() for rel in entry.get("variants", {}).values())
+                and sorted(entry.get("variants", {})) == sorted(str(w) for w in widths)
+            )
+            if up_to_date and not force:
+                continue
+            try:
+                manifest[name] = _build_one(name, source, widths, entry)
+                changed = True
+            except Exception as e:
+                print(f"[ASSETS] Failed to build {name}: {e}")
+        if changed:
+            _MANIFEST.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+        _manifest = manifest
+        return manifest
+
+
+def asset_url(name: str, width: int | None = None) -> str:
+    """変換済み画像の URL（width 以下で最大の版。元画像がなければ空文字）"""
+    manifest = _manifest if _manifest is not None else build_static_assets()
+    variants = manifest.get(name, {}).get("variants", {})
+    if not variants:
+        return ""
+    widths = sorted(int(w) for w in variants)
+    fitting = [w for w in widths if width is None or w <= width]
+    chosen = fitting[-1] if fitting else widths[0]
+    return f"{STATIC_URL_PREFIX}/{variants[str(chosen)]}"
+
+
+# プリロード画像（URL）
+IMG_BG = asset_url("bg_frame.png")
+IMG_MAP = asset_url("map_hologram.png")
+
+
+if __name__ == "__main__":
+    import sys
+    build_static_assets(force="--force" in sys.argv)
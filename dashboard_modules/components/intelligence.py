@@ -1,7 +1,7 @@
 """
 BU Intelligence - WAKONX/KDDI BX keywords mapping
 """
-import streamlit as st
+from ..cache import disk_cache
 from ..components.news import fetch_news_for
 
 # ─── WAKONX/KDDI BX Intelligence Hub ─────────────────────────────
@@ -40,7 +40,7 @@ BX_KEYWORDS = {
 }
 
 
-@st.cache_data(ttl=300)
+@disk_cache(ttl=300, hard_ttl=6 * 3600, cache_if=lambda r: bool(r["articles"]), label="BU INTEL")
 def fetch_bu_intelligence(bu_name: str, keywords: dict) -> dict:
     """WAKONX/KDDI BX専用のインテリジェンス収集"""
     # ニュース取得（BU名でフィルタ）
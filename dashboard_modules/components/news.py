@@ -1,66 +1,201 @@
 """
 News fetching from Google News RSS
+ネットワーク取得（download_*）はフィードポーラー専用。描画側は fetch_* で記事ストアを読む。
+
+アプリで使うフィードはレジストリに「最大件数」付きで登録しておく。
+ポーラーは各フィードを1回だけ最大件数で保存し、fetch_* は先頭 n 件を切り出して返す。
 """
-import streamlit as st
-import feedparser
+from __future__ import annotations
 
+import threading
+import time
 
-@st.cache_data(ttl=300)
-def fetch_news_for(query: str, n: int = 4) -> list[dict]:
-    """Google News RSSから指定キーワードのニュースを取得"""
+from ..cache import mark_stale, mark_fresh
+from ..data import article_store
+from .feed_http import fetch_feed
+
+GOOGLE_NEWS_URL = "https://news.google.com/rss/search?q={query}&hl=ja&gl=JP&ceid=JP:ja"
+KDDI_PRESS_URL = "https://newsroom.kddi.com/news/newsrelease.xml"
+FUJITSU_PRESS_URL = "https://prtimes.jp/companyrdf.php?company_id=93942"
+
+KDDI_PRESS_FEED = "kddi_press"
+FUJITSU_PRESS_FEED = "fujitsu_press"
+
+# この経過時間を超えたフィードは HUD で STALE 表示
+_STALE_AFTER = 30 * 60
+
+# フィードごとの (接続, 読み取り) タイムアウト秒
+GOOGLE_NEWS_TIMEOUT = (5.0, 10.0)
+KDDI_PRESS_TIMEOUT = (5.0, 20.0)
+FUJITSU_PRESS_TIMEOUT = (5.0, 20.0)
+
+
+# Google News クエリ
+KDDI_QUERY = "KDDI"
+KDDI_WAKONX_QUERY = "KDDI+WAKONX"
+KDDI_BX_QUERY = "KDDI+BX"
+KDDI_BX_TRANSFORM_QUERY = "KDDI+BX+事業変革"
+KDDI_FUJITSU_QUERY = "KDDI+%E5%AF%8C%E5%A3%AB%E9%80%9A+%E9%80%9A%E4%BF%A1"
+FUJITSU_PRODUCT_QUERY = "富士通+Uvance+OR+富士通+新製品+OR+富士通+DX+OR+富士通+AI"
+FUJITSU_COCREATION_QUERY = "%E5%AF%8C%E5%A3%AB%E9%80%9A+Uvance+OR+%E5%AF%8C%E5%A3%AB%E9%80%9A+DX+OR+%E5%AF%8C%E5%A3%AB%E9%80%9A+%E5%85%B1%E5%89%B5"
+
+# レジストリ未登録クエリの保存件数
+DEFAULT_FEED_LIMIT = 8
+
+
+def news_feed_key(query: str) -> str:
+    return f"news:{query}"
+
+
+# ─── Feed registry ───────────────────────────────────────────────
+# {feed_key: 呼び出し元が必要とする最大件数}
+_feed_limits: dict[str, int] = {
+    news_feed_key(KDDI_QUERY): 15,            # insights.run_insight_matcher
+    news_feed_key(KDDI_WAKONX_QUERY): 8,      # intelligence.fetch_bu_intelligence
+    news_feed_key(KDDI_BX_QUERY): 8,          # intelligence.fetch_bu_intelligence
+    news_feed_key(KDDI_BX_TRANSFORM_QUERY): 5,  # kddi_watcher
+    news_feed_key(KDDI_FUJITSU_QUERY): 5,     # NEWS FEED パネル
+    news_feed_key(FUJITSU_PRODUCT_QUERY): 10,   # insights
+    news_feed_key(FUJITSU_COCREATION_QUERY): 8,  # AI OPPORTUNITIES
+    KDDI_PRESS_FEED: 8,
+    FUJITSU_PRESS_FEED: 8,
+}
+_registry_lock = threading.Lock()
+_requested: set[tuple[str, int]] = set()
+
+
+def register_feed(feed_key: str, n: int) -> None:
+    """フィードを登録（既に登録済みなら最大件数を n まで引き上げる）"""
+    with _registry_lock:
+        _feed_limits[feed_key] = max(_feed_limits.get(feed_key, 0), n)
+
+
+def register_news_query(query: str, n: int) -> None:
+    register_feed(news_feed_key(query), n)
+
+
+def registered_feeds() -> dict[str, int]:
+    """アプリで使う全フィード {feed_key: 最大件数}（ポーラー・ベンチマーク用）"""
+    with _registry_lock:
+        return dict(_feed_limits)
+
+
+def feed_limit(feed_key: str) -> int | None:
+    with _registry_lock:
+        return _feed_limits.get(feed_key)
+
+
+# ─── Network (poller only) ───────────────────────────────────────
+def download_news(query: str, conditional: bool = False) -> tuple[list[dict], dict | None] | None:
+    """Google News RSSから指定キーワードのニュースを全件取得し (記事, 検証子) を返す（未変更なら None）"""
     # 期間フィルターは削除（Google News RSSで正常に動作しないため）
-    url = f"https://news.google.com/rss/search?q={query}&hl=ja&gl=JP&ceid=JP:ja"
+    url = GOOGLE_NEWS_URL.format(query=query)
     articles = []
-    try:
-        feed = feedparser.parse(url)
-        seen = set()
-        for entry in feed.entries:
-            if entry.title not in seen:
-                seen.add(entry.title)
-                articles.append({
-                    "title": entry.title,
-                    "link": entry.get("link", "#"),
-                    "published": entry.get("published", ""),
-                })
-    except Exception:
-        pass
-    return articles[:n]
-
-
-@st.cache_data(ttl=600)
-def fetch_kddi_press_releases(n: int = 8) -> list[dict]:
-    """KDDI公式プレスリリースRSSから取得"""
-    url = "https://newsroom.kddi.com/news/newsrelease.xml"
-    articles = []
-    try:
-        feed = feedparser.parse(url)
-        for entry in feed.entries[:n]:
+    fetched = fetch_feed(url, conditional=conditional, timeout=GOOGLE_NEWS_TIMEOUT)
+    if fetched is None:
+        return None
+    feed, validators = fetched
+    seen = set()
+    for entry in feed.entries:
+        if entry.title not in seen:
+            seen.add(entry.title)
             articles.append({
-                "title": entry.get("title", ""),
+                "title": entry.title,
                 "link": entry.get("link", "#"),
                 "published": entry.get("published", ""),
-                "description": entry.get("description", ""),
             })
-    except Exception:
-        pass
-    return articles
+    return articles, validators
 
 
-@st.cache_data(ttl=600)
-def fetch_fujitsu_press_releases(n: int = 8) -> list[dict]:
-    """富士通プレスリリースをPR TIMES RSSから取得"""
-    url = "https://prtimes.jp/companyrdf.php?company_id=93942"
+def download_kddi_press_releases(conditional: bool = False) -> tuple[list[dict], dict | None] | None:
+    """KDDI公式プレスリリースRSSから取得し (記事, 検証子) を返す（未変更なら None）"""
+    fetched = fetch_feed(KDDI_PRESS_URL, conditional=conditional, timeout=KDDI_PRESS_TIMEOUT)
+    if fetched is None:
+        return None
+    feed, validators = fetched
+    articles = [
+        {
+            "title": entry.get("title", ""),
+            "link": entry.get("link", "#"),
+            "published": entry.get("published", ""),
+            "description": entry.get("description", ""),
+        }
+        for entry in feed.entries
+    ]
+    return articles, validators
+
+
+def download_fujitsu_press_releases(conditional: bool = False) -> tuple[list[dict], dict | None] | None:
+    """富士通プレスリリースをPR TIMES RSSから取得し (記事, 検証子) を返す（未変更なら None）"""
+    fetched = fetch_feed(FUJITSU_PRESS_URL, conditional=conditional, timeout=FUJITSU_PRESS_TIMEOUT)
+    if fetched is None:
+        return None
+    feed, validators = fetched
     articles = []
-    try:
-        feed = feedparser.parse(url)
-        for entry in feed.entries[:n]:
-            title = entry.get("title", "")
-            articles.append({
-                "title": title,
-                "link": entry.get("link", "#"),
-                "published": entry.get("dc_date", entry.get("published", "")),
-                "is_uvance": "uvance" in title.lower() or "Uvance" in title,
-            })
-    except Exception:
-        pass
+    for entry in feed.entries:
+        title = entry.get("title", "")
+        articles.append({
+            "title": title,
+            "link": entry.get("link", "#"),
+            "published": entry.get("dc_date", entry.get("published", "")),
+            "is_uvance": "uvance" in title.lower() or "Uvance" in title,
+        })
+    return articles, validators
+
+
+# ─── Store readers (render path) ─────────────────────────────────
+def _request_if_unregistered(feed_key: str, n: int) -> None:
+    """レジストリにない（または件数が足りない）フィードをポーラーへ要求（プロセス内で1回）"""
+    limit = feed_limit(feed_key)
+    if limit is not None and n <= limit:
+        return
+    with _registry_lock:
+        if (feed_key, n) in _requested:
+            return
+        _requested.add((feed_key, n))
+    print(f"[NEWS] {feed_key} requested with n={n} (registered: {limit})")
+    register_feed(feed_key, n)
+    article_store.request_feed(feed_key, n)
+
+
+def _read_feed(feed_key: str, n: int, label: str) -> list[dict]:
+    _request_if_unregistered(feed_key, n)
+    stored = article_store.load_feed(feed_key, n)
+    if stored is None:
+        # 未取得フィード: 次回ポーリングで取得されるまで空で描画
+        return []
+    articles, fetched_at = stored
+    if time.time() - fetched_at > _STALE_AFTER:
+        mark_stale(label, feed_key, fetched_at)
+    else:
+        mark_fresh(label, feed_key)
     return articles
+
+
+def fetch_news_for(query: str, n: int = 4) -> list[dict]:
+    """Google News RSSの指定キーワードのニュースを記事ストアから取得"""
+    return _read_feed(news_feed_key(query), n, "NEWS")
+
+
+def fetch_kddi_press_releases(n: int = 8) -> list[dict]:
+    """KDDI公式プレスリリースを記事ストアから取得"""
+    return _read_feed(KDDI_PRESS_FEED, n, "KDDI PR")
+
+
+def fetch_fujitsu_press_releases(n: int = 8) -> list[dict]:
+    """富士通プレスリリース（PR TIMES）を記事ストアから取得"""
+    return _read_feed(FUJITSU_PRESS_FEED, n, "FUJITSU PR")
+
+
+def dedupe_articles(*article_lists: list[dict]) -> list[dict]:
+    """複数クエリの結果を記事ID単位で重複排除して連結（先に出現した順を維持）"""
+    seen: set[str] = set()
+    merged = []
+    for articles in article_lists:
+        for article in articles:
+            article_id = article.get("id") or article.get("title", "")
+            if article_id in seen:
+                continue
+            seen.add(article_id)
+            merged.append(article)
+    return merged
@@ -0,0 +1,302 @@
+"""
+Article Store - Local persistence for polled RSS feeds
+フィードポーラーが書き込み、ページ描画側は読み取りのみ行う（描画時にネットワークI/Oなし）
+
+記事は正規化URL + 正規化タイトルのハッシュで1件にまとめて保存し、
+各フィード（クエリ）の結果は記事IDのリストとして持つ。
+同じ記事が複数クエリに出ても保存・パース・描画用のdictは1つだけになる。
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from ..config import APP_ROOT
+
+ARTICLE_DB = Path(os.getenv("DASHBOARD_ARTICLE_DB", str(APP_ROOT / "data" / "articles.sqlite3")))
+
+# 正規化時に除去するトラッキング系クエリパラメータ
+_TRACKING_PARAMS = {"oc", "fbclid", "gclid", "yclid", "mc_cid", "mc_eid", "ref", "from"}
+_TRACKING_PREFIXES = ("utm_",)
+
+# Google News のタイトル末尾に付く「 - 媒体名」
+_SOURCE_SUFFIX = re.compile(r"\s+[-|｜]\s+[^-|｜]{1,40}$")
+_NON_WORD = re.compile(r"[\W_]+", re.UNICODE)
+
+# プロセス内の記事dictキャッシュ（id -> dict、全フィードで共有）
+_ARTICLE_CACHE_SIZE = 4096
+_article_cache: OrderedDict[str, dict] = OrderedDict()
+_article_cache_lock = threading.Lock()
+
+_local = threading.local()
+
+
+def _connect() -> sqlite3.Connection:
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        ARTICLE_DB.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(ARTICLE_DB), timeout=10, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            """CREATE TABLE IF NOT EXISTS articles (
+                id TEXT PRIMARY KEY,
+                url_key TEXT NOT NULL,
+                title_key TEXT NOT NULL,
+                data TEXT NOT NULL,
+                first_seen REAL NOT NULL
+            )"""
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_articles_url ON articles (url_key)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_articles_title ON articles (title_key)")
+        conn.execute(
+            """CREATE TABLE IF NOT EXISTS feed_items (
+                feed_key TEXT PRIMARY KEY,
+                article_ids TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            )"""
+        )
+        conn.execute(
+            """CREATE TABLE IF NOT EXISTS requested_feeds (
+                feed_key TEXT PRIMARY KEY,
+                max_n INTEGER NOT NULL,
+                requested_at REAL NOT NULL
+            )"""
+        )
+        # 旧スキーマ（max_n 列なし）の DB に列を追加。件数不明の旧要求は破棄する
+        # （保存件数 0 で登録されないよう。描画側が次回の読み出しで件数付きで要求し直す）
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(requested_feeds)")}
+        if "max_n" not in columns:
+            conn.execute("ALTER TABLE requested_feeds ADD COLUMN max_n INTEGER NOT NULL DEFAULT 0")
+            conn.execute("DELETE FROM requested_feeds WHERE max_n = 0")
+        conn.execute(
+            """CREATE TABLE IF NOT EXISTS feed_validators (
+                url TEXT PRIMARY KEY,
+                etag TEXT NOT NULL,
+                last_modified TEXT NOT NULL,
+                body_hash TEXT NOT NULL
+            )"""
+        )
+        conn.execute(
+            """CREATE TABLE IF NOT EXISTS leases (
+                name TEXT PRIMARY KEY,
+                owner TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )"""
+        )
+        _local.conn = conn
+    return conn
+
+
+# ─── Canonicalization ────────────────────────────────────────────
+def canonical_url(url: str) -> str:
+    """スキーム・ホストの小文字化、トラッキングパラメータ・フラグメント・末尾スラッシュを除去"""
+    if not url or url == "#":
+        return ""
+    parts = urlsplit(url.strip())
+    query = [
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in _TRACKING_PARAMS and not k.lower().startswith(_TRACKING_PREFIXES)
+    ]
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(sorted(query)), ""))
+
+
+def title_key(title: str) -> str:
+    """媒体名サフィックス・空白・記号・全角半角の差を吸収したタイトルのハッシュ"""
+    text = unicodedata.normalize("NFKC", title or "")
+    text = _SOURCE_SUFFIX.sub("", text)
+    text = _NON_WORD.sub("", text).lower()
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+def _cache_put(article: dict) -> None:
+    with _article_cache_lock:
+        _article_cache[article["id"]] = article
+        _article_cache.move_to_end(article["id"])
+        while len(_article_cache) > _ARTICLE_CACHE_SIZE:
+            _article_cache.popitem(last=False)
+
+
+# ─── Articles ────────────────────────────────────────────────────
+def _upsert_article(conn: sqlite3.Connection, article: dict, now: float) -> str:
+    """記事を保存して ID を返す。URL またはタイトルが一致する既存記事があればそれに統合"""
+    url_key = canonical_url(article.get("link", ""))
+    t_key = title_key(article.get("title", ""))
+    row = None
+    if url_key:
+        row = conn.execute("SELECT id, data FROM articles WHERE url_key = ?", (url_key,)).fetchone()
+    if row is None and article.get("title"):
+        row = conn.execute("SELECT id, data FROM articles WHERE title_key = ?", (t_key,)).fetchone()
+
+    if row is None:
+        seed = url_key or (t_key if article.get("title") else json.dumps(article, sort_keys=True))
+        article_id = hashlib.sha1(seed.encode("utf-8")).hexdigest()[:16]
+        merged = {**article, "id": article_id}
+        conn.execute(
+            "INSERT OR REPLACE INTO articles (id, url_key, title_key, data, first_seen) VALUES (?, ?, ?, ?, ?)",
+            (article_id, url_key, t_key, json.dumps(merged, ensure_ascii=False), now),
+        )
+    else:
+        article_id, data = row
+        existing = json.loads(data)
+        # 既存の値を優先し、新しいソースにしかない項目（description 等）だけ補完
+        merged = {**article, **{k: v for k, v in existing.items() if v not in ("", None)}}
+        if merged != existing:
+            conn.execute(
+                "UPDATE articles SET data = ? WHERE id = ?",
+                (json.dumps(merged, ensure_ascii=False), article_id),
+            )
+    _cache_put(merged)
+    return article_id
+
+
+def get_articles(article_ids: list[str]) -> list[dict]:
+    """ID順に記事dictを返す（見つからないIDは除外）。返り値は共有オブジェクトのため変更しないこと"""
+    found: dict[str, dict] = {}
+    missing = []
+    with _article_cache_lock:
+        for article_id in article_ids:
+            article = _article_cache.get(article_id)
+            if article is None:
+                missing.append(article_id)
+            else:
+                found[article_id] = article
+    if missing:
+        placeholders = ",".join("?" * len(missing))
+        rows = _connect().execute(
+            f"SELECT id, data FROM articles WHERE id IN ({placeholders})", missing
+        ).fetchall()
+        for article_id, data in rows:
+            article = json.loads(data)
+            found[article_id] = article
+            _cache_put(article)
+    return [found[a] for a in article_ids if a in found]
+
+
+# ─── Feeds ───────────────────────────────────────────────────────
+def save_feed(feed_key: str, articles: list[dict]) -> list[str]:
+    """フィード取得結果を保存（取得時刻を更新）し、記事IDリストを返す"""
+    conn = _connect()
+    now = time.time()
+    article_ids: list[str] = []
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        for article in articles:
+            article_id = _upsert_article(conn, article, now)
+            if article_id not in article_ids:
+                article_ids.append(article_id)
+        conn.execute(
+            "INSERT OR REPLACE INTO feed_items (feed_key, article_ids, fetched_at) VALUES (?, ?, ?)",
+            (feed_key, json.dumps(article_ids), now),
+        )
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return article_ids
+
+
+def touch_feed(feed_key: str) -> None:
+    """内容を変えずに取得時刻のみ更新（フィード未変更時）"""
+    _connect().execute("UPDATE feed_items SET fetched_at = ? WHERE feed_key = ?", (time.time(), feed_key))
+
+
+def load_feed_ids(feed_key: str) -> tuple[list[str], float] | None:
+    """(記事IDリスト, 取得時刻) を返す。未取得なら None"""
+    try:
+        row = _connect().execute(
+            "SELECT article_ids, fetched_at FROM feed_items WHERE feed_key = ?", (feed_key,)
+        ).fetchone()
+    except Exception as e:
+        print(f"[ARTICLE_STORE] Load failed for {feed_key}: {e}")
+        return None
+    if row is None:
+        return None
+    return json.loads(row[0]), row[1]
+
+
+def load_feed(feed_key: str, n: int | None = None) -> tuple[list[dict], float] | None:
+    """(記事リスト, 取得時刻) を返す。未取得なら None。n 指定時は先頭 n 件のみ解決する"""
+    stored = load_feed_ids(feed_key)
+    if stored is None:
+        return None
+    article_ids, fetched_at = stored
+    try:
+        return get_articles(article_ids[:n] if n is not None else article_ids), fetched_at
+    except Exception as e:
+        print(f"[ARTICLE_STORE] Load failed for {feed_key}: {e}")
+        return None
+
+
+def feed_fetched_at(feed_key: str) -> float | None:
+    row = _connect().execute("SELECT fetched_at FROM feed_items WHERE feed_key = ?", (feed_key,)).fetchone()
+    return row[0] if row else None
+
+
+def request_feed(feed_key: str, n: int) -> None:
+    """ポーラー未登録のフィード（または登録より多い件数）を次回ポーリング対象として記録"""
+    try:
+        _connect().execute(
+            """INSERT INTO requested_feeds (feed_key, max_n, requested_at) VALUES (?, ?, ?)
+               ON CONFLICT (feed_key) DO UPDATE SET max_n = MAX(max_n, excluded.max_n)""",
+            (feed_key, n, time.time()),
+        )
+    except Exception as e:
+        print(f"[ARTICLE_STORE] Request failed for {feed_key}: {e}")
+
+
+def requested_feeds() -> dict[str, int]:
+    """{feed_key: 要求された最大件数}"""
+    rows = _connect().execute("SELECT feed_key, max_n FROM requested_feeds ORDER BY requested_at").fetchall()
+    return {r[0]: r[1] for r in rows}
+
+
+def load_validators(url: str) -> dict | None:
+    """条件付きGET用の検証子 {"etag", "last_modified", "body_hash"}"""
+    row = _connect().execute(
+        "SELECT etag, last_modified, body_hash FROM feed_validators WHERE url = ?", (url,)
+    ).fetchone()
+    if row is None:
+        return None
+    return {"etag": row[0], "last_modified": row[1], "body_hash": row[2]}
+
+
+def save_validators(url: str, etag: str, last_modified: str, body_hash: str) -> None:
+    _connect().execute(
+        "INSERT OR REPLACE INTO feed_validators (url, etag, last_modified, body_hash) VALUES (?, ?, ?, ?)",
+        (url, etag, last_modified, body_hash),
+    )
+
+
+def acquire_lease(name: str, owner: str, duration: float) -> bool:
+    """複数プロセス間で1つだけがポーリングするためのリース取得（期限切れなら奪取）"""
+    now = time.time()
+    conn = _connect()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        row = conn.execute("SELECT owner, expires_at FROM leases WHERE name = ?", (name,)).fetchone()
+        if row is None or row[0] == owner or row[1] < now:
+            conn.execute(
+                "INSERT OR REPLACE INTO leases (name, owner, expires_at) VALUES (?, ?, ?)",
+                (name, owner, now + duration),
+            )
+            conn.execute("COMMIT")
+            return True
+        conn.execute("COMMIT")
+        return False
+    except Exception as e:
+        try:
+            conn.execute("ROLLBACK")
+        except sqlite3.Error:
+            pass
+        print(f"[ARTICLE_STORE] Lease failed: {e}")
+        return False
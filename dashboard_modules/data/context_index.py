@@ -0,0 +1,87 @@
+"""
+Context Index - Persistent index of the context library
+コンテキストライブラリ（context/ 配下のアップロードファイル）のメタデータを SQLite に保存し、
+全セッション・再起動後も同じ一覧を参照できるようにする。
+抽出済みテキストの保存先・ページ数/シート数・有効フラグはアップロード時に1回だけ記録する。
+抽出に失敗したファイルはエラー文を記録し、同じ抽出器バージョンでは再抽出しない。
+"""
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+from pathlib import Path
+
+from ..config import APP_ROOT
+
+CONTEXT_DB = Path(os.getenv("DASHBOARD_CONTEXT_DB", str(APP_ROOT / "data" / "context.sqlite3")))
+
+_COLUMNS = (
+    "filename", "path", "type", "sha256", "size", "uploaded_at", "active",
+    "text_path", "pages", "sheets", "chars", "extractor_version", "error",
+)
+
+_local = threading.local()
+
+
+def _connect() -> sqlite3.Connection:
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        CONTEXT_DB.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(CONTEXT_DB), timeout=10, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            """CREATE TABLE IF NOT EXISTS context_files (
+                filename TEXT PRIMARY KEY,
+                path TEXT NOT NULL,
+                type TEXT NOT NULL,
+                sha256 TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                uploaded_at TEXT NOT NULL,
+                active INTEGER NOT NULL DEFAULT 1,
+                text_path TEXT,
+                pages INTEGER,
+                sheets INTEGER,
+                chars INTEGER,
+                extractor_version INTEGER,
+                error TEXT
+            )"""
+        )
+        # 旧スキーマ（error 列なし）の DB に列を追加
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(context_files)")}
+        if "error" not in columns:
+            conn.execute("ALTER TABLE context_files ADD COLUMN error TEXT")
+        _local.conn = conn
+    return conn
+
+
+def _row_to_entry(row: tuple) -> dict:
+    entry = dict(zip(_COLUMNS, row))
+    entry["active"] = bool(entry["active"])
+    return entry
+
+
+def upsert_file(entry: dict) -> None:
+    """ファイル1件を登録（同名は上書き）"""
+    values = [entry.get(c) for c in _COLUMNS]
+    values[_COLUMNS.index("active")] = int(bool(entry.get("active", True)))
+    _connect().execute(
+        f"INSERT OR REPLACE INTO context_files ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})",
+        values,
+    )
+
+
+def load_files() -> dict[str, dict]:
+    """登録済みファイル {filename: entry}（アップロード順）"""
+    rows = _connect().execute(
+        f"SELECT {', '.join(_COLUMNS)} FROM context_files ORDER BY uploaded_at, filename"
+    ).fetchall()
+    return {row[0]: _row_to_entry(row) for row in rows}
+
+
+def set_active(filename: str, active: bool) -> None:
+    _connect().execute("UPDATE context_files SET active = ? WHERE filename = ?", (int(active), filename))
+
+
+def remove_file(filename: str) -> None:
+    _connect().execute("DELETE FROM context_files WHERE filename = ?", (filename,))
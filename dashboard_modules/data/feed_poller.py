@@ -0,0 +1,148 @@
+"""
+Feed Poller - Refresh RSS feeds on a schedule, independent of page renders
+==========================================================================
+news.registered_feeds() に登録された全フィード（Google News・KDDIニュースルーム・PR TIMES）を
+定期取得し、登録された最大件数で記事ストアへ書き込む。
+ページ描画（html_builder / html_mobile / kddi_watcher）は記事ストアを読むだけになる。
+
+起動方法:
+  - アプリ内: start_feed_poller()（app_new.py / app_mobile.py が起動時に呼ぶ）
+  - サイドカー: python -m dashboard_modules.data.feed_poller
+    （この場合はアプリ側を FEED_POLLER=off で起動する）
+
+同一マシン上の複数プロセスが起動しても、記事ストアのリースで1プロセスのみがポーリングする。
+"""
+from __future__ import annotations
+
+import os
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from . import article_store
+from ..components.news import (
+    registered_feeds, download_news, download_kddi_press_releases, download_fujitsu_press_releases,
+    KDDI_PRESS_FEED, FUJITSU_PRESS_FEED,
+)
+from ..components import stock  # noqa: F401  株価トピッククエリをレジストリへ登録
+
+FEED_POLL_INTERVAL = int(os.getenv("FEED_POLL_INTERVAL", "300"))
+PRESS_POLL_INTERVAL = int(os.getenv("PRESS_POLL_INTERVAL", "600"))
+_LOOP_TICK = 30  # 期限チェック間隔（秒）
+_LEASE_NAME = "feed_poller"
+_MAX_WORKERS = 8
+
+_OWNER = f"{socket.gethostname()}:{os.getpid()}"
+_thread: threading.Thread | None = None
+_thread_lock = threading.Lock()
+_stop = threading.Event()
+
+
+# conditional を受け取り (記事, 検証子) を返す。未変更なら None
+Download = Callable[[bool], tuple[list[dict], dict | None] | None]
+
+
+def configured_feeds() -> dict[str, tuple[Download, float, int]]:
+    """{feed_key: (取得関数(conditional), ポーリング間隔秒, 保存件数)}"""
+    limits = registered_feeds()
+    # 描画側から要求された未登録クエリ・件数も対象にする（別プロセスからの要求を含む）
+    for key, n in article_store.requested_feeds().items():
+        limits[key] = max(limits.get(key, 0), n)
+
+    feeds: dict[str, tuple[Download, float, int]] = {}
+    for feed_key, limit in limits.items():
+        if feed_key == KDDI_PRESS_FEED:
+            feeds[feed_key] = (download_kddi_press_releases, PRESS_POLL_INTERVAL, limit)
+        elif feed_key == FUJITSU_PRESS_FEED:
+            feeds[feed_key] = (download_fujitsu_press_releases, PRESS_POLL_INTERVAL, limit)
+        elif feed_key.startswith("news:"):
+            query = feed_key[len("news:"):]
+            feeds[feed_key] = (lambda conditional, q=query: download_news(q, conditional), FEED_POLL_INTERVAL, limit)
+    return feeds
+
+
+def _refresh_feed(feed_key: str, download: Download, limit: int, has_previous: bool) -> bool:
+    try:
+        # 前回結果がストアにある場合のみ条件付きGET（304なら再パース・再保存しない）
+        result = download(has_previous)
+        if result is None:
+            article_store.touch_feed(feed_key)
+            return True
+        articles, validators = result
+        if not articles:
+            # 空結果で前回の正常データを上書きしない
+            print(f"[FEED_POLLER] {feed_key} returned no entries")
+            return False
+        article_store.save_feed(feed_key, articles[:limit])
+        # 記事の保存に成功してから検証子を記録（失敗時は次回も全文を取得し直す）
+        if validators:
+            article_store.save_validators(**validators)
+    except Exception as e:
+        print(f"[FEED_POLLER] {feed_key} failed: {e}")
+        return False
+    return True
+
+
+def poll_once(force: bool = False) -> dict:
+    """期限の来たフィードを並列で再取得する。
+
+    Returns:
+        dict: {"refreshed": int, "failed": int, "skipped": int}
+    """
+    now = time.time()
+    due = []
+    feeds = configured_feeds()
+    for feed_key, (download, interval, limit) in feeds.items():
+        stored = article_store.load_feed_ids(feed_key)
+        fetched_at = stored[1] if stored else None
+        if force or fetched_at is None or now - fetched_at >= interval:
+            # 保存件数が登録件数に満たない（件数が引き上げられた）場合は条件付きGETにしない
+            has_previous = stored is not None and len(stored[0]) >= limit
+            due.append((feed_key, download, limit, has_previous))
+
+    refreshed = 0
+    if due:
+        with ThreadPoolExecutor(max_workers=_MAX_WORKERS, thread_name_prefix="feed-poller") as pool:
+            results = list(pool.map(lambda item: _refresh_feed(*item), due))
+        refreshed = sum(results)
+        print(f"[FEED_POLLER] Refreshed {refreshed}/{len(due)} feeds in {time.time() - now:.2f}s")
+    return {"refreshed": refreshed, "failed": len(due) - refreshed, "skipped": len(feeds) - len(due)}
+
+
+def _run_loop() -> None:
+    while not _stop.is_set():
+        try:
+            if article_store.acquire_lease(_LEASE_NAME, _OWNER, _LOOP_TICK * 3):
+                poll_once()
+        except Exception as e:
+            print(f"[FEED_POLLER] Poll failed: {e}")
+        _stop.wait(_LOOP_TICK)
+
+
+def start_feed_poller() -> bool:
+    """アプリ内ポーラーをデーモンスレッドで起動（プロセスにつき1回、多重呼び出し可）"""
+    global _thread
+    if os.getenv("FEED_POLLER", "on").lower() == "off":
+        return False
+    with _thread_lock:
+        if _thread is not None and _thread.is_alive():
+            return True
+        _stop.clear()
+        _thread = threading.Thread(target=_run_loop, name="feed-poller", daemon=True)
+        _thread.start()
+    return True
+
+
+def stop_feed_poller() -> None:
+    _stop.set()
+
+
+if __name__ == "__main__":
+    if "--once" in sys.argv:
+        print(poll_once(force=True))
+    else:
+        print(f"[FEED_POLLER] Running as sidecar ({_OWNER}), interval={FEED_POLL_INTERVAL}s")
+        _run_loop()
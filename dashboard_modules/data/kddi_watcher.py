@@ -8,7 +8,10 @@ from datetime import datetime
 from pathlib import Path
 
 from ..config import APP_ROOT, HAS_AI
-from ..components.news import fetch_kddi_press_releases, fetch_news_for
+from ..components.news import (
+    fetch_kddi_press_releases, fetch_news_for, dedupe_articles,
+    KDDI_QUERY, KDDI_WAKONX_QUERY, KDDI_BX_TRANSFORM_QUERY,
+)
 
 _INTEL_FILE = APP_ROOT / "data" / "kddi_intelligence.json"
 _MAX_ENTRIES = 1000
@@ -49,11 +52,13 @@ def accumulate_kddi_intelligence() -> dict:
 
     # ニュースソースからフェッチ
     press_releases = fetch_kddi_press_releases(8)
-    general_news = fetch_news_for("KDDI", 8)
-    wakonx_news = fetch_news_for("KDDI+WAKONX", 5)
-    bx_news = fetch_news_for("KDDI+BX+事業変革", 5)
+    general_news = fetch_news_for(KDDI_QUERY, 8)
+    wakonx_news = fetch_news_for(KDDI_WAKONX_QUERY, 5)
+    bx_news = fetch_news_for(KDDI_BX_TRANSFORM_QUERY, 5)
 
-    all_articles = press_releases + general_news + wakonx_news + bx_news
+    # 記事ID単位で重複排除（プレスリリースを優先）
+    all_articles = dedupe_articles(press_releases, general_news, wakonx_news, bx_news)
+    press_ids = {pr.get("id") for pr in press_releases}
     now_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
     new_entries = []
@@ -67,7 +72,7 @@ def accumulate_kddi_intelligence() -> dict:
             "link": article.get("link", ""),
             "published": article.get("published", ""),
             "description": article.get("description", ""),
-            "source": "press" if article in press_releases else "news",
+            "source": "press" if article.get("id") in press_ids else "news",
             "accumulated_at": now_str,
         }
         new_entries.append(entry)
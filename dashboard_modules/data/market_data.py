@@ -0,0 +1,203 @@
+"""
+Market Data - Batched, incremental OHLC sync for all watched tickers
+=====================================================================
+監視銘柄をまとめて1回の yf.download で取得し、ローカルの時系列ストア（ohlc_store）へ
+前回同期以降の不足分だけを追記する。株価・前日比・騰落率・終値系列は任意の期間について
+ストアから返すため、ネットワークがなくても前回同期分でチャートを描画できる。
+
+    latest, diff, pct, dates, closes = get_quote("9433.T", days=7, tickers=(...))
+    bars = get_history("9433.T", days=250, tickers=(...))   # 1Y チャート・ボラティリティ用
+    dates, opens, closes = get_price_matrix(tickers, days=60)  # 全銘柄を日付で揃えた行列
+"""
+from __future__ import annotations
+
+import math
+import threading
+import time
+from datetime import date, timedelta
+
+import numpy as np
+import yfinance as yf
+
+from . import ohlc_store
+from ..cache import mark_stale, mark_fresh
+
+# 未保存銘柄の初回バックフィル期間（3M/1Y チャートとボラティリティ基準値を満たすこと）
+BACKFILL_PERIOD = "1y"
+
+# 同期間隔（秒）。経過後は保存済みデータを返しつつ裏で差分取得する
+SYNC_INTERVAL = 300
+# この経過時間を超えて同期できていない場合は HUD で STALE 表示
+_STALE_AFTER = 30 * 60
+# 差分取得時に再取得する直近日数（当日の途中足・休場明けの確定値を上書きするため）
+_OVERLAP_DAYS = 3
+# 失敗した同期を再試行するまでの最短間隔（秒）
+_RETRY_INTERVAL = 30.0
+
+_OHLC_FIELDS = ("Open", "High", "Low", "Close", "Volume")
+
+_sync_lock = threading.Lock()       # yf.download を同時に1回に制限
+_state_lock = threading.Lock()
+_inflight = False
+_last_attempt = 0.0
+_last_failure = 0.0
+
+
+def _frame_to_rows(frame) -> dict[str, list]:
+    """DataFrame を {"dates": [...], "open": [...], ...} に変換（終値が欠損の行は除外）"""
+    rows: dict[str, list] = {"dates": [], "open": [], "high": [], "low": [], "close": [], "volume": []}
+    for ts, values in frame.iterrows():
+        close = values.get("Close")
+        if close is None or math.isnan(float(close)):
+            continue
+        rows["dates"].append(ts.strftime("%Y-%m-%d"))
+        for field in _OHLC_FIELDS:
+            v = values.get(field)
+            rows[field.lower()].append(None if v is None or math.isnan(float(v)) else float(v))
+    return rows
+
+
+def sync_ohlc(tickers: tuple[str, ...], force: bool = False) -> int:
+    """全銘柄の不足分を1リクエストで取得してストアへ追記。追記した行数を返す"""
+    global _last_failure
+    with _sync_lock:
+        now = time.time()
+        if not force:
+            # 待機中に別スレッドが同期済み・直前に失敗済みなら再取得しない
+            if all(now - (ohlc_store.synced_at(t) or 0.0) < SYNC_INTERVAL for t in tickers):
+                return 0
+            if now - _last_failure < _RETRY_INTERVAL:
+                return 0
+        try:
+            return _sync_locked(tickers)
+        except Exception:
+            _last_failure = time.time()
+            raise
+
+
+def _sync_locked(tickers: tuple[str, ...]) -> int:
+    last_dates = [ohlc_store.last_date(t) for t in tickers]
+    if any(d is None for d in last_dates):
+        kwargs = {"period": BACKFILL_PERIOD}
+    else:
+        start = date.fromisoformat(min(last_dates)) - timedelta(days=_OVERLAP_DAYS)
+        kwargs = {"start": start.isoformat()}
+    print(f"[MARKET] Syncing {len(tickers)} tickers ({kwargs})")
+    data = yf.download(
+        list(tickers), group_by="ticker", auto_adjust=False, progress=False, threads=False, **kwargs,
+    )
+    if data.empty:
+        raise RuntimeError("empty response")
+
+    available = set(data.columns.get_level_values(0))
+    written = 0
+    for ticker in tickers:
+        if ticker not in available:
+            print(f"[MARKET] {ticker} missing from batch")
+            continue
+        written += ohlc_store.upsert_bars(ticker, _frame_to_rows(data[ticker]))
+    ohlc_store.mark_synced(tickers)
+    return written
+
+
+def _sync_in_background(tickers: tuple[str, ...]) -> None:
+    global _inflight
+    try:
+        sync_ohlc(tickers)
+    except Exception as e:
+        print(f"[MARKET] Background sync failed: {e}")
+    finally:
+        with _state_lock:
+            _inflight = False
+
+
+def ensure_synced(tickers: tuple[str, ...]) -> None:
+    """未保存なら同期取得、同期間隔を過ぎていれば裏で差分取得（stale-while-revalidate）"""
+    global _inflight, _last_attempt
+    try:
+        synced = [ohlc_store.synced_at(t) for t in tickers]
+    except Exception as e:
+        print(f"[MARKET] Store read failed: {e}")
+        return
+    now = time.time()
+    oldest = min((s or 0.0) for s in synced)
+    if now - oldest < SYNC_INTERVAL:
+        mark_fresh("STOCK", "market")
+        return
+
+    has_data = all(ohlc_store.last_date(t) for t in tickers)
+    if not has_data:
+        # 初回: チャートを描画できるデータがないため同期で取得（他スレッドは _sync_lock で待機）
+        try:
+            sync_ohlc(tickers)
+        except Exception as e:
+            print(f"[MARKET] Sync failed: {e}")
+        return
+
+    if now - oldest > _STALE_AFTER:
+        mark_stale("STOCK", "market", oldest)
+    with _state_lock:
+        if _inflight or now - _last_attempt < _RETRY_INTERVAL:
+            return
+        _inflight = True
+        _last_attempt = now
+    threading.Thread(target=_sync_in_background, args=(tickers,), name="market-sync", daemon=True).start()
+
+
+def get_history(ticker: str, days: int, tickers: tuple[str, ...]) -> dict[str, list]:
+    """直近 days 本の OHLC 行（古い順）。tickers は一括同期する銘柄一式"""
+    ensure_synced(tickers)
+    try:
+        return ohlc_store.load_bars(ticker, limit=days)
+    except Exception as e:
+        print(f"[MARKET] Load failed for {ticker}: {e}")
+        return {"dates": [], "open": [], "high": [], "low": [], "close": [], "volume": []}
+
+
+def get_quote(ticker: str, days: int, tickers: tuple[str, ...]):
+    """ストアから (終値, 前日比, 騰落率%, 日付[MM/DD], 終値系列) を返す
+
+    tickers は一括同期する銘柄一式（ticker を含むこと）
+    """
+    rows = get_history(ticker, max(days, 2), tickers)
+    if len(rows["close"]) < 2:
+        return None, None, None, [], []
+    closes = rows["close"][-days:]
+    dates = [d[5:].replace("-", "/") for d in rows["dates"][-days:]]
+    latest = rows["close"][-1]
+    prev = rows["close"][-2]
+    diff = latest - prev
+    pct = (diff / prev) * 100
+    return latest, diff, pct, dates, closes
+
+
+def get_price_matrix(tickers: tuple[str, ...], days: int) -> tuple[list[str], np.ndarray, np.ndarray]:
+    """全銘柄を日付で揃えた (日付, 始値行列, 終値行列)。行列は (日数, 銘柄数)、欠損は NaN"""
+    ensure_synced(tickers)
+    bars = {}
+    for ticker in tickers:
+        try:
+            bars[ticker] = ohlc_store.load_bars(ticker, limit=days)
+        except Exception as e:
+            print(f"[MARKET] Load failed for {ticker}: {e}")
+            bars[ticker] = {"dates": [], "open": [], "close": []}
+    dates = sorted({d for b in bars.values() for d in b["dates"]})[-days:]
+    index = {d: i for i, d in enumerate(dates)}
+    opens = np.full((len(dates), len(tickers)), np.nan)
+    closes = np.full((len(dates), len(tickers)), np.nan)
+    for j, ticker in enumerate(tickers):
+        b = bars[ticker]
+        for d, o, c in zip(b["dates"], b["open"], b["close"]):
+            i = index.get(d)
+            if i is not None:
+                opens[i, j] = np.nan if o is None else o
+                closes[i, j] = c
+    return dates, opens, closes
+
+
+def data_version(tickers: tuple[str, ...]) -> float:
+    """ストアの更新検知用バージョン（同期のたびに変わる）"""
+    try:
+        return ohlc_store.data_version(tickers)
+    except Exception:
+        return 0.0
@@ -0,0 +1,120 @@
+"""
+OHLC Store - Local time-series store for stock history
+日足 OHLC を銘柄×日付で保存し、前回同期以降の不足分だけを追記する。
+期間指定の参照（3M/1Y チャート、ボラティリティ基準値など）はネットワークなしでここから返す。
+"""
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from ..config import APP_ROOT
+
+MARKET_DB = Path(os.getenv("DASHBOARD_MARKET_DB", str(APP_ROOT / "data" / "market.sqlite3")))
+
+_local = threading.local()
+
+
+def _connect() -> sqlite3.Connection:
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        MARKET_DB.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(MARKET_DB), timeout=10, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            """CREATE TABLE IF NOT EXISTS ohlc (
+                ticker TEXT NOT NULL,
+                date TEXT NOT NULL,
+                open REAL,
+                high REAL,
+                low REAL,
+                close REAL NOT NULL,
+                volume REAL,
+                PRIMARY KEY (ticker, date)
+            ) WITHOUT ROWID"""
+        )
+        conn.execute(
+            """CREATE TABLE IF NOT EXISTS sync_state (
+                ticker TEXT PRIMARY KEY,
+                synced_at REAL NOT NULL
+            )"""
+        )
+        _local.conn = conn
+    return conn
+
+
+def upsert_bars(ticker: str, rows: dict[str, list]) -> int:
+    """{"dates", "open", "high", "low", "close", "volume"} 形式の行を追記（同日は上書き）"""
+    records = [
+        (ticker, d, o, h, lo, c, v)
+        for d, o, h, lo, c, v in zip(rows["dates"], rows["open"], rows["high"], rows["low"], rows["close"], rows["volume"])
+        if c is not None
+    ]
+    if not records:
+        return 0
+    conn = _connect()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.executemany(
+            "INSERT OR REPLACE INTO ohlc (ticker, date, open, high, low, close, volume) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            records,
+        )
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return len(records)
+
+
+def mark_synced(tickers: tuple[str, ...] | list[str], synced_at: float | None = None) -> None:
+    now = synced_at or time.time()
+    _connect().executemany(
+        "INSERT OR REPLACE INTO sync_state (ticker, synced_at) VALUES (?, ?)",
+        [(t, now) for t in tickers],
+    )
+
+
+def synced_at(ticker: str) -> float | None:
+    row = _connect().execute("SELECT synced_at FROM sync_state WHERE ticker = ?", (ticker,)).fetchone()
+    return row[0] if row else None
+
+
+def data_version(tickers: tuple[str, ...] | list[str]) -> float:
+    """最終同期時刻の最大値（データ更新の検知用。未同期なら 0.0）"""
+    placeholders = ",".join("?" * len(tickers))
+    row = _connect().execute(
+        f"SELECT MAX(synced_at) FROM sync_state WHERE ticker IN ({placeholders})", list(tickers)
+    ).fetchone()
+    return row[0] or 0.0
+
+
+def last_date(ticker: str) -> str | None:
+    """保存済みの最新日付（YYYY-MM-DD）。未保存なら None"""
+    row = _connect().execute("SELECT MAX(date) FROM ohlc WHERE ticker = ?", (ticker,)).fetchone()
+    return row[0] if row else None
+
+
+def load_bars(ticker: str, limit: int | None = None, since: str | None = None) -> dict[str, list]:
+    """古い順の OHLC 行。limit は直近N本、since は指定日以降"""
+    sql = "SELECT date, open, high, low, close, volume FROM ohlc WHERE ticker = ?"
+    params: list = [ticker]
+    if since is not None:
+        sql += " AND date >= ?"
+        params.append(since)
+    sql += " ORDER BY date DESC"
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(limit)
+    rows = _connect().execute(sql, params).fetchall()
+    rows.reverse()
+    return {
+        "dates": [r[0] for r in rows],
+        "open": [r[1] for r in rows],
+        "high": [r[2] for r in rows],
+        "low": [r[3] for r in rows],
+        "close": [r[4] for r in rows],
+        "volume": [r[5] for r in rows],
+    }
@@ -0,0 +1,59 @@
+"""
+Fragment Cache - Panel-level HTML memoization
+==============================================
+パネル単位の HTML 断片を「パネル名 + 入力データのフィンガープリント」でキャッシュする。
+入力（記事リスト・株価・マッチング結果など）が前回と同じなら再描画せずに同じ文字列を返すため、
+ページ組み立ては変化したパネルの描画とキャッシュ済み断片の連結だけになる。
+デスクトップ（html_builder）・モバイル（html_mobile）の両方から使う。
+
+    news_html = cached_fragment("desktop:news", news_all, lambda: _render_news(news_all))
+
+render には入力だけから HTML を組み立てる関数を渡すこと（入力以外の状態を参照すると
+キャッシュが古い断片を返す）。
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Mapping
+
+_CACHE_SIZE = 256
+
+_fragments: OrderedDict[str, str] = OrderedDict()
+_cache_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+
+def _json_default(value: Any) -> Any:
+    return dict(value) if isinstance(value, Mapping) else str(value)
+
+
+def data_fingerprint(inputs: Any) -> str:
+    """入力データの内容ハッシュ（読み取り専用 Mapping は dict として、その他 JSON 化できない値は str で比較）"""
+    payload = json.dumps(inputs, sort_keys=True, ensure_ascii=False, default=_json_default)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def cached_fragment(panel: str, inputs: Any, render: Callable[[], str]) -> str:
+    """入力が前回と同じならキャッシュ済みの断片、変わっていれば render() の結果を返す"""
+    key = f"{panel}:{data_fingerprint(inputs)}"
+    with _cache_lock:
+        html = _fragments.get(key)
+        if html is not None:
+            _fragments.move_to_end(key)
+            _stats["hits"] += 1
+            return html
+        _stats["misses"] += 1
+    html = render()
+    with _cache_lock:
+        _fragments[key] = html
+        while len(_fragments) > _CACHE_SIZE:
+            _fragments.popitem(last=False)
+    return html
+
+
+def fragment_cache_stats() -> dict[str, int]:
+    with _cache_lock:
+        return {**_stats, "entries": len(_fragments)}
@@ -2,26 +2,14 @@
 Mobile HTML Builder - iPhone向けモバイル版ダッシュボードHTML生成
 デスクトップ版に準拠したSF風テーマ・SWITCH切替・ブート画面・マーキー
 """
-import base64
 import streamlit as st
-from pathlib import Path
-from ..config import APP_ROOT
-from ..components.stock import fetch_stock, build_svg_chart
-from ..components.news import fetch_news_for, fetch_kddi_press_releases, fetch_fujitsu_press_releases
-from ..components.images import IMG_MAP
-from ..components.intelligence import fetch_bu_intelligence, WAKONX_KEYWORDS, BX_KEYWORDS
-from ..analysis.insights import run_insight_matcher
+from ..components.stock import build_svg_chart, WATCHED_STOCKS
+from ..components.news import dedupe_articles
+from ..components.images import asset_url
 from ..analysis.opportunities import generate_opportunities
-
-
-def _load_image_b64(filename: str) -> str:
-    """アプリルートから画像を読み込みBase64データURIを返す"""
-    path = APP_ROOT / filename
-    try:
-        img_data = path.read_bytes()
-        return f"data:image/png;base64,{base64.b64encode(img_data).decode()}"
-    except Exception:
-        return ""
+from ..cache import get_stale_sources
+from .fragments import cached_fragment
+from .snapshot import get_snapshot
 
 
 def _build_bu_panel(bu_name: str, intel: dict, color: str) -> str:
@@ -68,16 +56,8 @@ def _build_bu_panel(bu_name: str, intel: dict, color: str) -> str:
     </div>"""
 
 
-def build_mobile_html() -> str:
-    """モバイル版ダッシュボードの全HTMLを生成"""
-
-    # ─── 画像読込 ──────────────────────────────────────────
-    boot_splash_img = _load_image_b64("opening2.png")
-    back_logo_img = _load_image_b64("back.png")
-    map_img_data = IMG_MAP or ""
-
-    # ─── NEWS データ取得 ───────────────────────────────────
-    news_all = fetch_news_for("KDDI+%E5%AF%8C%E5%A3%AB%E9%80%9A+%E9%80%9A%E4%BF%A1", 5)
+def _news_html(news_all: list[dict]) -> str:
+    """NEWS 一覧（モバイル向け）"""
     news_html = ""
     for i, a in enumerate(news_all, 1):
         news_html += f"""
@@ -88,9 +68,11 @@ def build_mobile_html() -> str:
         </div>"""
     if not news_html:
         news_html = '<div class="m-news-item"><span class="m-empty">NO INTEL FEED</span></div>'
+    return news_html
 
-    # KDDI Press Releases
-    press_releases = fetch_kddi_press_releases(8)
+
+def _press_html(press_releases: list[dict]) -> str:
+    """KDDI プレスリリース一覧（モバイル向け）"""
     press_html = ""
     for i, pr in enumerate(press_releases, 1):
         press_html += f"""
@@ -101,9 +83,11 @@ def build_mobile_html() -> str:
         </div>"""
     if not press_html:
         press_html = '<div class="m-news-item"><span class="m-empty">NO PRESS RELEASE FEED</span></div>'
+    return press_html
 
-    # Fujitsu Press Releases
-    fujitsu_releases = fetch_fujitsu_press_releases(8)
+
+def _fujitsu_press_html(fujitsu_releases: list[dict]) -> str:
+    """富士通プレスリリース一覧（モバイル向け）"""
     fujitsu_press_html = ""
     for i, pr in enumerate(fujitsu_releases, 1):
         uvance_badge = ' <span class="m-uvance-badge">UVANCE</span>' if pr.get("is_uvance") else ""
@@ -115,65 +99,49 @@ def build_mobile_html() -> str:
         </div>"""
     if not fujitsu_press_html:
         fujitsu_press_html = '<div class="m-news-item"><span class="m-empty">NO FUJITSU PRESS FEED</span></div>'
+    return fujitsu_press_html
+
+
+def _stock_card_html(name: str, ticker: str, color: str, quote: tuple, alert_msg: str, topics: list[dict]) -> str:
+    """銘柄カード（モバイル向け）"""
+    price, diff, pct, dates, closes = quote
+    topics_html = ""
+    for ta in topics:
+        topics_html += f'<div class="m-stock-topic"><a href="{ta["link"]}" target="_blank">{ta["title"]}</a></div>'
+    if topics_html:
+        topics_html = f'<div class="m-stock-topics">{topics_html}</div>'
+
+    if price is not None:
+        arrow = "▲" if diff > 0 else ("▼" if diff < 0 else "─")
+        cls = "up" if diff > 0 else ("down" if diff < 0 else "neutral")
+        # アラート判定
+        alert_badge = f'<span class="m-stock-alert">{alert_msg}</span>' if alert_msg else ""
+        chart_svg = build_svg_chart(dates, closes, color, width=300, height=70)
+        return f"""
+        <div class="m-stock-card">
+            <div class="m-stock-header">
+                <span class="m-stock-name" style="color:{color};">{name}</span>
+                <span class="m-stock-ticker">{ticker} {alert_badge}</span>
+            </div>
+            <div class="m-stock-price m-{cls}">&yen;{price:,.1f}</div>
+            <div class="m-stock-diff m-{cls}">{arrow} {abs(diff):,.1f} ({abs(pct):.2f}%)</div>
+            <div class="m-stock-chart">{chart_svg}</div>
+            {topics_html}
+        </div>"""
+    else:
+        return f"""
+        <div class="m-stock-card">
+            <div class="m-stock-header">
+                <span class="m-stock-name" style="color:{color};">{name}</span>
+                <span class="m-stock-ticker">{ticker}</span>
+            </div>
+            <div class="m-stock-price" style="color:rgba(0,255,204,0.25);font-size:0.8rem;">AWAITING SIGNAL</div>
+            {topics_html}
+        </div>"""
 
-    # ─── WAKONX / BX Intelligence ─────────────────────────
-    wakonx_intel = fetch_bu_intelligence("WAKONX", WAKONX_KEYWORDS)
-    bx_intel = fetch_bu_intelligence("BX", BX_KEYWORDS)
-    wakonx_html = _build_bu_panel("WAKONX INTELLIGENCE", wakonx_intel, "#00ffcc")
-    bx_html = _build_bu_panel("KDDI BX INTELLIGENCE", bx_intel, "#ff6699")
-
-    # ─── STOCK データ取得 ──────────────────────────────────
-    stocks = [
-        ("KDDI", "9433.T", "#00ffcc", "KDDI+%E6%A0%AA%E4%BE%A1"),
-        ("FUJITSU", "6702.T", "#00aaff", "%E5%AF%8C%E5%A3%AB%E9%80%9A+%E6%A0%AA%E4%BE%A1"),
-        ("SoftBank", "9434.T", "#ffaa00", "%E3%82%BD%E3%83%95%E3%83%88%E3%83%90%E3%83%B3%E3%82%AF+%E6%A0%AA%E4%BE%A1"),
-        ("NTT docomo", "9437.T", "#ff6699", "NTT%E3%83%89%E3%82%B3%E3%83%A2+%E6%A0%AA%E4%BE%A1"),
-        ("CTC", "4739.T", "#9966ff", "CTC+%E6%A0%AA%E4%BE%A1"),
-    ]
-    stock_html = ""
-    for name, ticker, color, query in stocks:
-        price, diff, pct, dates, closes = fetch_stock(ticker, 7)
-        # トピック取得（マーキー用）
-        topics = fetch_news_for(query, 4)
-        topics_html = ""
-        for ta in topics:
-            topics_html += f'<div class="m-stock-topic"><a href="{ta["link"]}" target="_blank">{ta["title"]}</a></div>'
-        if topics_html:
-            topics_html = f'<div class="m-stock-topics">{topics_html}</div>'
-
-        if price is not None:
-            arrow = "▲" if diff > 0 else ("▼" if diff < 0 else "─")
-            cls = "up" if diff > 0 else ("down" if diff < 0 else "neutral")
-            # アラート判定
-            alert_badge = ""
-            if pct is not None and abs(pct) >= 2.0:
-                alert_text = "急騰" if pct > 0 else "急落"
-                alert_badge = f'<span class="m-stock-alert">{alert_text}</span>'
-            chart_svg = build_svg_chart(dates, closes, color, width=300, height=70)
-            stock_html += f"""
-            <div class="m-stock-card">
-                <div class="m-stock-header">
-                    <span class="m-stock-name" style="color:{color};">{name}</span>
-                    <span class="m-stock-ticker">{ticker} {alert_badge}</span>
-                </div>
-                <div class="m-stock-price m-{cls}">&yen;{price:,.1f}</div>
-                <div class="m-stock-diff m-{cls}">{arrow} {abs(diff):,.1f} ({abs(pct):.2f}%)</div>
-                <div class="m-stock-chart">{chart_svg}</div>
-                {topics_html}
-            </div>"""
-        else:
-            stock_html += f"""
-            <div class="m-stock-card">
-                <div class="m-stock-header">
-                    <span class="m-stock-name" style="color:{color};">{name}</span>
-                    <span class="m-stock-ticker">{ticker}</span>
-                </div>
-                <div class="m-stock-price" style="color:rgba(0,255,204,0.25);font-size:0.8rem;">AWAITING SIGNAL</div>
-                {topics_html}
-            </div>"""
 
-    # ─── INSIGHT MATCHER ──────────────────────────────────
-    matches, synergy_score = run_insight_matcher()
+def _insight_html(matches: list[dict], synergy_score: float) -> str:
+    """INSIGHT MATCHER（モバイル向け、最大4件）"""
     if synergy_score >= 70:
         score_color = "#00ff88"
     elif synergy_score >= 40:
@@ -210,29 +178,11 @@ def build_mobile_html() -> str:
 
     if not matches:
         insight_html += '<div class="m-empty">SCANNING FOR MATCHES...</div>'
+    return insight_html
 
-    # ─── AI OPPORTUNITIES ─────────────────────────────────
-    reports_ready = st.session_state.get("reports_ready", False)
-
-    if reports_ready and "generated_opportunities" in st.session_state:
-        opportunities = st.session_state["generated_opportunities"]
-    else:
-        wakonx_articles = wakonx_intel["articles"][:5]
-        bx_articles = bx_intel["articles"][:5]
-        kddi_general = fetch_news_for("KDDI", 3)
-        kddi_combined = wakonx_articles + bx_articles + kddi_general
-        fujitsu_news_raw = fetch_news_for(
-            "%E5%AF%8C%E5%A3%AB%E9%80%9A+Uvance+OR+%E5%AF%8C%E5%A3%AB%E9%80%9A+DX+OR+%E5%AF%8C%E5%A3%AB%E9%80%9A+%E5%85%B1%E5%89%B5", 8
-        )
-        kddi_tuple = tuple(a["title"] for a in kddi_combined)
-        fujitsu_tuple = tuple(a["title"] for a in fujitsu_news_raw)
-        kddi_press_tuple = tuple(
-            f"{pr['title']} — {pr.get('description', '')}" if pr.get("description") else pr["title"]
-            for pr in press_releases
-        )
-        fujitsu_press_tuple = tuple(pr["title"] for pr in fujitsu_releases)
-        opportunities = generate_opportunities(kddi_tuple, fujitsu_tuple, kddi_press_tuple, fujitsu_press_tuple)
 
+def _opp_html(opportunities: list[dict]) -> str:
+    """AI OPPORTUNITIES 上位3件（モバイル向け）"""
     opp_html = ""
     if opportunities:
         top_opps = sorted(opportunities, key=lambda x: x.get("score", 0), reverse=True)[:3]
@@ -258,6 +208,91 @@ def build_mobile_html() -> str:
             </div>"""
     else:
         opp_html = '<div class="m-empty">NO OPPORTUNITIES DETECTED</div>'
+    return opp_html
+
+
+def build_mobile_html() -> str:
+    """モバイル版ダッシュボードの全HTMLを生成"""
+
+    # ─── 画像読込 ──────────────────────────────────────────
+    # 画像は static/ 配下の WebP を URL 参照（モバイル向けの小さい版）
+    boot_splash_img = asset_url("opening2.png", 960)
+    back_logo_img = asset_url("back.png", 800)
+    map_img_data = asset_url("map_hologram.png", 600)
+
+    # サーバー共有のスナップショット（デスクトップ版と同じデータ。取得は SNAPSHOT_INTERVAL ごとに1回）
+    snap = get_snapshot()
+
+    # 各パネルは入力データが変わったときだけ再描画（fragments）
+    # ─── NEWS ──────────────────────────────────────────────
+    news_all = snap.news
+    news_html = cached_fragment("mobile:news", news_all, lambda: _news_html(news_all))
+
+    # KDDI Press Releases
+    press_releases = snap.kddi_press
+    press_html = cached_fragment("mobile:kddi_press", press_releases, lambda: _press_html(press_releases))
+
+    # Fujitsu Press Releases
+    fujitsu_releases = snap.fujitsu_press
+    fujitsu_press_html = cached_fragment(
+        "mobile:fujitsu_press", fujitsu_releases, lambda: _fujitsu_press_html(fujitsu_releases),
+    )
+
+    # ─── WAKONX / BX Intelligence ─────────────────────────
+    wakonx_intel = snap.wakonx
+    bx_intel = snap.bx
+    wakonx_html = cached_fragment(
+        "mobile:bu:WAKONX", wakonx_intel, lambda: _build_bu_panel("WAKONX INTELLIGENCE", wakonx_intel, "#00ffcc"),
+    )
+    bx_html = cached_fragment(
+        "mobile:bu:BX", bx_intel, lambda: _build_bu_panel("KDDI BX INTELLIGENCE", bx_intel, "#ff6699"),
+    )
+
+    # ─── STOCK ─────────────────────────────────────────────
+    stock_html = ""
+    for name, ticker, color, _query in WATCHED_STOCKS:
+        quote = snap.stocks[ticker]
+        # トピック（マーキー用）
+        topics = snap.topics[ticker]
+        alert_msg = snap.stock_badges.get(ticker, "")
+        stock_html += cached_fragment(
+            f"mobile:stock:{ticker}", (name, color, quote, alert_msg, topics),
+            lambda: _stock_card_html(name, ticker, color, quote, alert_msg, topics),
+        )
+
+    # ─── INSIGHT MATCHER ──────────────────────────────────
+    matches, synergy_score = snap.insight_matches, snap.synergy_score
+    insight_html = cached_fragment(
+        "mobile:insight", (matches, synergy_score), lambda: _insight_html(matches, synergy_score),
+    )
+
+    # ─── AI OPPORTUNITIES ─────────────────────────────────
+    reports_ready = st.session_state.get("reports_ready", False)
+
+    if reports_ready and "generated_opportunities" in st.session_state:
+        opportunities = st.session_state["generated_opportunities"]
+    else:
+        wakonx_articles = wakonx_intel["articles"][:5]
+        bx_articles = bx_intel["articles"][:5]
+        kddi_combined = dedupe_articles(wakonx_articles, bx_articles, snap.kddi_general)
+        fujitsu_news_raw = snap.fujitsu_cocreation
+        kddi_tuple = tuple(a["title"] for a in kddi_combined)
+        fujitsu_tuple = tuple(a["title"] for a in fujitsu_news_raw)
+        kddi_press_tuple = tuple(
+            f"{pr['title']} — {pr.get('description', '')}" if pr.get("description") else pr["title"]
+            for pr in press_releases
+        )
+        fujitsu_press_tuple = tuple(pr["title"] for pr in fujitsu_releases)
+        opportunities = generate_opportunities(kddi_tuple, fujitsu_tuple, kddi_press_tuple, fujitsu_press_tuple)
+
+    opp_html = cached_fragment("mobile:opportunities", opportunities, lambda: _opp_html(opportunities))
+
+    # ─── 鮮度切れデータ表示 ───────────────────────────────
+    stale_sources = get_stale_sources()
+    stale_html = ""
+    if stale_sources:
+        stale_items = " · ".join(f"{label} {int(age // 60)}m" for label, age in sorted(stale_sources.items()))
+        stale_html = f'<div class="m-stale">STALE // {stale_items}</div>'
 
     # ─── 全体HTML組み立て ─────────────────────────────────
     return f"""<!DOCTYPE html>
@@ -443,6 +478,13 @@ html, body {{
     color: rgba(0,255,204,0.35);
     letter-spacing: 2px;
 }}
+.m-stale {{
+    font-size: 0.45rem;
+    color: #ffaa00;
+    letter-spacing: 2px;
+    margin-top: 4px;
+    opacity: 0.8;
+}}
 
 /* ── SYSTEM ONLINE pulse ── */
 .hud-status {{
@@ -976,6 +1018,7 @@ details[open] > summary {{
         <h1>ACCOUNT INTELLIGENCE MONITOR</h1>
     </div>
     <div class="m-sub">FUJITSU // KDDI ACCOUNT INTELLIGENCE</div>
+    {stale_html}
 </div>
 
 <!-- ── NEWS & PRESS (SWITCH切替) ── -->
@@ -0,0 +1,124 @@
+"""
+Dashboard Prefetch - 外部データソースの並列取得
+"""
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Callable, Mapping
+
+from ..components.stock import fetch_stock, WATCHED_STOCKS, STOCK_TOPIC_COUNT
+from ..components.news import (
+    fetch_news_for, fetch_kddi_press_releases, fetch_fujitsu_press_releases,
+    KDDI_QUERY, KDDI_FUJITSU_QUERY, FUJITSU_COCREATION_QUERY,
+)
+from ..components.intelligence import fetch_bu_intelligence, WAKONX_KEYWORDS, BX_KEYWORDS
+from ..analysis.insights import run_insight_matcher, check_critical_news
+from ..analysis.alerts import get_stock_alerts, AlertResult
+
+# 全ソース共通のデッドライン（秒）。超過・失敗したソースは前回取得できた値（なければデフォルト値）で描画する
+PREFETCH_TIMEOUT = 25.0
+_MAX_WORKERS = 16
+
+EMPTY_STOCK = (None, None, None, [], [])
+EMPTY_BU_INTEL = {"articles": [], "matches": [], "opportunity_score": 0.0, "keyword_hits": 0}
+
+
+def _script_run_ctx_initializer() -> Callable[[], None] | None:
+    """ワーカースレッドへStreamlitのScriptRunContextを引き継ぐ初期化関数を返す"""
+    try:
+        import threading
+        from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+    except Exception:
+        return None
+    ctx = get_script_run_ctx()
+    if ctx is None:
+        return None
+    return lambda: add_script_run_ctx(threading.current_thread(), ctx)
+
+
+def run_concurrently(
+    tasks: dict[str, tuple[Callable[..., Any], tuple, Any]],
+    timeout: float = PREFETCH_TIMEOUT,
+    previous: Mapping[str, Any] | None = None,
+    missed: set[str] | None = None,
+) -> dict[str, Any]:
+    """独立したタスクを並列実行し、全体デッドライン内に得られた結果を返す。
+
+    Parameters
+    ----------
+    tasks : dict
+        {key: (func, args, default)}。例外・タイムアウト時は previous の値、なければ default を返す
+    timeout : float
+        全タスク共通のデッドライン（秒）
+    previous : Mapping | None
+        前回取得できた結果 {key: result}（取得できなかったソースの代わりに使う）
+    missed : set | None
+        渡した場合、今回結果を得られなかった（タイムアウト・例外の）キーを追加する
+
+    Returns
+    -------
+    dict  {key: result}
+    """
+    started = time.monotonic()
+    pool = ThreadPoolExecutor(
+        max_workers=min(_MAX_WORKERS, max(len(tasks), 1)),
+        thread_name_prefix="prefetch",
+        initializer=_script_run_ctx_initializer(),
+    )
+    futures = {key: pool.submit(func, *args) for key, (func, args, _default) in tasks.items()}
+    _done, not_done = wait(futures.values(), timeout=timeout)
+    # 未完了タスクは待たない（完了時に disk_cache・記事ストアへ書き込まれ、次回のスナップショット構築で読み出される）
+    pool.shutdown(wait=False, cancel_futures=True)
+
+    results: dict[str, Any] = {}
+    for key, future in futures.items():
+        default = previous[key] if previous is not None and key in previous else tasks[key][2]
+        if future in not_done:
+            print(f"[PREFETCH] Timeout: {key}")
+            results[key] = default
+        else:
+            try:
+                results[key] = future.result()
+                continue
+            except Exception as e:
+                print(f"[PREFETCH] {key} failed: {e}")
+                results[key] = default
+        if missed is not None:
+            missed.add(key)
+    print(f"[PREFETCH] {len(tasks)} sources in {time.monotonic() - started:.2f}s ({len(not_done)} timed out)")
+    return results
+
+
+def prefetch_dashboard_data(
+    timeout: float = PREFETCH_TIMEOUT,
+    previous: Mapping[str, Any] | None = None,
+    missed: set[str] | None = None,
+) -> dict[str, Any]:
+    """ダッシュボード描画に必要な全データソースを並列取得する（previous / missed は run_concurrently と同じ）。
+
+    Returns
+    -------
+    dict
+        "stock:<ticker>", "topics:<ticker>", "news", "kddi_press", "fujitsu_press",
+        "kddi_general", "fujitsu_cocreation", "wakonx", "bx", "insight", "alerts",
+        "critical_news", "alert_messages" をキーとする取得結果
+    """
+    tasks: dict[str, tuple[Callable[..., Any], tuple, Any]] = {}
+    for _name, ticker, _color, query in WATCHED_STOCKS:
+        tasks[f"stock:{ticker}"] = (fetch_stock, (ticker, 7), EMPTY_STOCK)
+        tasks[f"topics:{ticker}"] = (fetch_news_for, (query, STOCK_TOPIC_COUNT), [])
+    tasks["news"] = (fetch_news_for, (KDDI_FUJITSU_QUERY, 5), [])
+    tasks["kddi_press"] = (fetch_kddi_press_releases, (8,), [])
+    tasks["fujitsu_press"] = (fetch_fujitsu_press_releases, (8,), [])
+    tasks["kddi_general"] = (fetch_news_for, (KDDI_QUERY, 3), [])
+    tasks["fujitsu_cocreation"] = (fetch_news_for, (FUJITSU_COCREATION_QUERY, 8), [])
+    tasks["wakonx"] = (fetch_bu_intelligence, ("WAKONX", WAKONX_KEYWORDS), EMPTY_BU_INTEL)
+    tasks["bx"] = (fetch_bu_intelligence, ("BX", BX_KEYWORDS), EMPTY_BU_INTEL)
+    tasks["insight"] = (run_insight_matcher, (), ([], 0.0))
+    # 株価アラート評価（同期ごとに1回）。alert_messages はこの結果と重要ニュース検知から組み立てる
+    tasks["alerts"] = (get_stock_alerts, (), AlertResult())
+    tasks["critical_news"] = (check_critical_news, (), [])
+    data = run_concurrently(tasks, timeout=timeout, previous=previous, missed=missed)
+    data["alert_messages"] = list(data["alerts"].messages) + data["critical_news"]
+    return data
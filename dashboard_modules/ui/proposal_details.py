@@ -0,0 +1,81 @@
+"""
+Proposal Details - Overlay bodies served as static JSON
+=========================================================
+PROPOSAL GENERATION HISTORY のオーバーレイ本文（提案スライド・エグゼクティブ批評・アプローチプラン）は
+iframe に埋め込まず、内容ハッシュ名の JSON として static/proposal_details/ に書き出す。
+履歴一覧にはタイトル・スコア・日付と JSON の URL だけを載せ、本文はクリック時に fetch する。
+
+    url = publish_proposal_detail(entry)   # -> "/app/static/proposal_details/1a2b3c4d5e6f.json"
+    urls = publish_proposal_details(history)  # 履歴全件を公開し、参照されなくなった JSON を削除
+
+本文はプレーンテキストのまま保存し、表示側で textContent として流し込む（HTML エスケープ不要）。
+static/ に書き込めない場合は data: URL を返す（一覧に本文が載るが表示は同じ）。
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from urllib.parse import quote
+
+from ..components.images import STATIC_DIR, STATIC_URL_PREFIX
+
+DETAIL_DIR = STATIC_DIR / "proposal_details"
+
+_publish_lock = threading.Lock()
+_published: dict[str, str] = {}   # {digest: URL}
+
+
+def proposal_detail(entry: dict) -> dict:
+    """履歴エントリからオーバーレイ表示に必要な項目を取り出す"""
+    metadata = entry.get("metadata", {})
+    return {
+        "title": entry.get("opportunity_title", "Unknown")[:60],
+        "score": int(entry.get("score", 0)),
+        "gamma_url": entry.get("gamma_url", ""),
+        "slides": entry.get("gamma_input", entry.get("gamma_input_preview", "")) or "",
+        "critique": entry.get("executive_critique", metadata.get("executive_critique", metadata.get("executive_critique_preview", ""))) or "",
+        "approach": entry.get("approach_plan", "") or "",
+    }
+
+
+def _detail_body(entry: dict) -> tuple[str, str]:
+    """(内容ハッシュ, JSON 本文)"""
+    body = json.dumps(proposal_detail(entry), ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()[:12], body
+
+
+def publish_proposal_detail(entry: dict) -> str:
+    """オーバーレイ本文を JSON として公開し URL を返す（同じ内容なら書き出し済みファイルを再利用）"""
+    digest, body = _detail_body(entry)
+    with _publish_lock:
+        url = _published.get(digest)
+        if url is not None:
+            return url
+        out = DETAIL_DIR / f"{digest}.json"
+        try:
+            if not out.exists():
+                DETAIL_DIR.mkdir(parents=True, exist_ok=True)
+                out.write_text(body, encoding="utf-8")
+            url = f"{STATIC_URL_PREFIX}/proposal_details/{out.name}"
+        except OSError as e:
+            print(f"[PROPOSAL] Detail publish failed: {e}")
+            return "data:application/json;charset=utf-8," + quote(body)
+        _published[digest] = url
+        return url
+
+
+def publish_proposal_details(entries: list[dict]) -> list[str]:
+    """履歴全件の本文を公開して URL を返し、どのエントリからも参照されなくなった JSON を削除する"""
+    urls = [publish_proposal_detail(entry) for entry in entries]
+    keep = {_detail_body(entry)[0] for entry in entries}
+    with _publish_lock:
+        for digest in [d for d in _published if d not in keep]:
+            del _published[digest]
+        try:
+            for old in DETAIL_DIR.glob("*.json"):
+                if old.stem not in keep:
+                    old.unlink(missing_ok=True)
+        except OSError as e:
+            print(f"[PROPOSAL] Detail cleanup failed: {e}")
+    return urls
@@ -0,0 +1,174 @@
+"""
+Dashboard Shell - Static template + per-render JSON payload
+============================================================
+ダッシュボードの CSS / 本文テンプレート / JS（ui/templates/）は描画ごとに変わらないため、
+内容ハッシュ付きファイル名で static/shell/ に書き出し、ブラウザにキャッシュさせる。
+各描画で iframe に渡すのは小さなブートストラップ HTML だけで、変わる部分
+（ニュース・株価・マッチング結果などの HTML 断片と、JS から参照するグローバル変数）は JSON で埋め込む。
+
+    shell = load_shell("dashboard")
+    html = render_shell(shell, slots={"news_html": ...}, page_vars={"CONTEXT_MANIFEST": [...]})
+
+テンプレート中の @@name@@ がスロット。静的配信に書き込めない場合や
+DASHBOARD_INLINE_SHELL=1 の場合は、従来どおり全文をインラインで組み立てる。
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from ..components.images import STATIC_DIR, STATIC_URL_PREFIX
+
+TEMPLATE_DIR = Path(__file__).parent / "templates"
+SHELL_DIR = STATIC_DIR / "shell"
+INLINE_SHELL = os.getenv("DASHBOARD_INLINE_SHELL", "") == "1"
+
+# {シェル名: (CSS, 本文, JS) のテンプレートファイル}
+SHELL_TEMPLATES: dict[str, tuple[str, str, str]] = {
+    "dashboard": ("dashboard.css", "dashboard_body.html", "dashboard.js"),
+}
+
+_SLOT_RE = re.compile(r"@@(\w+)@@")
+
+_shell_lock = threading.Lock()
+_shells: dict[str, "Shell"] = {}
+
+
+@dataclass(frozen=True)
+class Shell:
+    name: str
+    css: str
+    body: str
+    js: str
+    signature: str                                      # テンプレートの mtime/サイズ（再読込判定用）
+    urls: dict[str, str] = field(default_factory=dict)  # {"css"|"body"|"js": URL}。未公開なら空
+
+    @property
+    def size(self) -> int:
+        return sum(len(part.encode("utf-8")) for part in (self.css, self.body, self.js))
+
+
+def _template_signature(paths: list[Path]) -> str:
+    return "|".join(f"{p.stat().st_size}:{p.stat().st_mtime_ns}" for p in paths)
+
+
+def _publish(name: str, parts: dict[str, str]) -> dict[str, str]:
+    """テンプレートを static/shell/{name}-{part}.{hash}.{ext} に書き出し URL を返す（失敗時は空）"""
+    ext = {"css": "css", "body": "html", "js": "js"}
+    urls = {}
+    try:
+        SHELL_DIR.mkdir(parents=True, exist_ok=True)
+        keep = set()
+        for part, text in parts.items():
+            digest = hashlib.sha256(text.encode("utf-8")).hexdigest()[:12]
+            filename = f"{name}-{part}.{digest}.{ext[part]}"
+            out = SHELL_DIR / filename
+            if not out.exists():
+                out.write_text(text, encoding="utf-8")
+            keep.add(filename)
+            urls[part] = f"{STATIC_URL_PREFIX}/shell/{filename}?v={digest}"
+        # 古い版を削除
+        for old in SHELL_DIR.glob(f"{name}-*"):
+            if old.name not in keep:
+                old.unlink(missing_ok=True)
+    except OSError as e:
+        print(f"[SHELL] Publish failed for {name}: {e}")
+        return {}
+    return urls
+
+
+def load_shell(name: str) -> Shell:
+    """テンプレートを読み込み static/ へ公開（テンプレートが変わらなければメモ化済みを返す）"""
+    paths = [TEMPLATE_DIR / f for f in SHELL_TEMPLATES[name]]
+    signature = _template_signature(paths)
+    with _shell_lock:
+        shell = _shells.get(name)
+        if shell is not None and shell.signature == signature:
+            return shell
+        css, body, js = (p.read_text(encoding="utf-8") for p in paths)
+        urls = {} if INLINE_SHELL else _publish(name, {"css": css, "body": body, "js": js})
+        shell = Shell(name=name, css=css, body=body, js=js, signature=signature, urls=urls)
+        _shells[name] = shell
+        print(f"[SHELL] Loaded {name}: {shell.size:,} bytes ({'static' if urls else 'inline'})")
+        return shell
+
+
+def _script_json(value) -> str:
+    """<script> 内に埋め込める JSON（</script> で途切れないよう < をエスケープ）"""
+    return json.dumps(value, ensure_ascii=False).replace("<", "\\u003c")
+
+
+def _fill(template: str, slots: dict[str, str]) -> str:
+    return _SLOT_RE.sub(lambda m: slots.get(m.group(1), m.group(0)), template)
+
+
+def render_inline(shell: Shell, slots: dict[str, str], page_vars: dict[str, Any]) -> str:
+    """テンプレートとデータを1つの HTML に組み立てる（フォールバック・比較計測用）"""
+    var_lines = "".join(f"var {name} = {_script_json(value)};\n" for name, value in page_vars.items())
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8">
+<style>
+{_fill(shell.css, slots)}</style>
+</head>
+<body>
+{_fill(shell.body, slots)}
+<script>
+{var_lines}{shell.js}</script>
+</body></html>"""
+
+
+_BOOTSTRAP_JS = """
+(function(){
+    var payload = JSON.parse(document.getElementById('shellData').textContent);
+    var slots = payload.slots;
+    function fill(t){ return t.replace(/@@(\\w+)@@/g, function(m, k){ return k in slots ? slots[k] : m; }); }
+    function get(u){
+        return fetch(u, {cache: 'force-cache'}).then(function(r){
+            if (!r.ok) throw new Error(u + ' ' + r.status);
+            return r.text();
+        });
+    }
+    var u = payload.urls;
+    Promise.all([get(u.css), get(u.body), get(u.js)]).then(function(parts){
+        var style = document.createElement('style');
+        style.textContent = fill(parts[0]);
+        document.head.appendChild(style);
+        document.body.innerHTML = fill(parts[1]);
+        Object.keys(payload.vars).forEach(function(k){ window[k] = payload.vars[k]; });
+        var script = document.createElement('script');
+        script.textContent = parts[2];
+        document.body.appendChild(script);
+    }).catch(function(e){
+        document.body.innerHTML = '<div style="color:#ff3366;font-family:monospace;padding:2rem;">SHELL LOAD FAILED // ' + e + '</div>';
+    });
+})();
+"""
+
+
+def render_bootstrap(shell: Shell, slots: dict[str, str], page_vars: dict[str, Any]) -> str:
+    """キャッシュ済みシェルを読み込み、JSON ペイロードで埋めるブートストラップ HTML"""
+    payload = {"urls": shell.urls, "slots": slots, "vars": page_vars}
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8">
+<style>html, body {{ background: #000; margin: 0; }}</style>
+</head>
+<body>
+<script type="application/json" id="shellData">{_script_json(payload)}</script>
+<script>{_BOOTSTRAP_JS}</script>
+</body></html>"""
+
+
+def render_shell(shell: Shell, slots: dict[str, str], page_vars: dict[str, Any]) -> str:
+    """公開済みならブートストラップ、そうでなければインライン HTML を返す
+
+    page_vars は JS のグローバル変数として定義する値（JSON 化できること）
+    """
+    if shell.urls:
+        return render_bootstrap(shell, slots, page_vars)
+    return render_inline(shell, slots, page_vars)
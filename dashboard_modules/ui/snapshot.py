@@ -0,0 +1,146 @@
+"""
+Dashboard Snapshot - Server-wide, versioned dashboard data
+===========================================================
+株価・フィード・BUインテリジェンス・インサイトマッチャー・アラートの取得をセッションごとではなく
+サーバー全体で SNAPSHOT_INTERVAL ごとに1回だけ行い、不変の DashboardSnapshot として共有する。
+デスクトップ（html_builder）・モバイル（html_mobile）の描画はスナップショットからの射影のみ。
+
+    snap = get_snapshot()
+    snap.version          # 内容が変わったときだけ増える
+    snap.stocks["9433.T"] # (終値, 前日比, 騰落率, 日付, 終値系列)
+
+間隔経過後は前回のスナップショットを返しつつ裏で再構築する（stale-while-revalidate）。
+初回のみ呼び出し元で同期構築し、同時に来た他のセッションは完成を待つ。
+タイムアウト・失敗したソースは前回取得できた値を引き継ぎ、そのスナップショットは
+SNAPSHOT_RETRY_INTERVAL 後に再構築する（デフォルト値を全セッションに長時間配らない）。
+"""
+from __future__ import annotations
+
+import dataclasses
+import threading
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Mapping
+
+from ..components.stock import WATCHED_TICKERS
+from .fragments import data_fingerprint
+from .prefetch import prefetch_dashboard_data
+
+# スナップショットの再構築間隔（秒）
+SNAPSHOT_INTERVAL = 60.0
+# 取得できなかったソースがある場合の再構築間隔（秒）
+SNAPSHOT_RETRY_INTERVAL = 15.0
+
+
+@dataclass(frozen=True)
+class DashboardSnapshot:
+    version: int
+    built_at: float
+    fingerprint: str
+    stocks: Mapping[str, tuple]                # {ticker: (price, diff, pct, dates, closes)}
+    topics: Mapping[str, tuple]                # {ticker: 銘柄トピック記事}
+    stock_badges: Mapping[str, str]            # {ticker: "急騰" 等}
+    alerts: tuple[str, ...]                    # アラートオーバーレイ表示用メッセージ
+    news: tuple
+    kddi_press: tuple
+    fujitsu_press: tuple
+    kddi_general: tuple                        # 商機生成の入力（KDDI 一般ニュース）
+    fujitsu_cocreation: tuple                  # 商機生成の入力（富士通 共創ニュース）
+    wakonx: Mapping[str, Any]
+    bx: Mapping[str, Any]
+    insight_matches: tuple
+    synergy_score: float
+    ttl: float = SNAPSHOT_INTERVAL             # 次の再構築までの秒数（取得漏れがあれば短い）
+
+
+def _freeze(value: Any) -> Any:
+    """dict / list を読み取り専用の MappingProxyType / tuple に再帰変換"""
+    if isinstance(value, Mapping):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _content_fields(data: dict[str, Any]) -> dict[str, Any]:
+    matches, synergy_score = data["insight"]
+    return {
+        "stocks": _freeze({t: data[f"stock:{t}"] for t in WATCHED_TICKERS}),
+        "topics": _freeze({t: data[f"topics:{t}"] for t in WATCHED_TICKERS}),
+        "stock_badges": _freeze(data["alerts"].badges),
+        "alerts": _freeze(data["alert_messages"]),
+        "news": _freeze(data["news"]),
+        "kddi_press": _freeze(data["kddi_press"]),
+        "fujitsu_press": _freeze(data["fujitsu_press"]),
+        "kddi_general": _freeze(data["kddi_general"]),
+        "fujitsu_cocreation": _freeze(data["fujitsu_cocreation"]),
+        "wakonx": _freeze(data["wakonx"]),
+        "bx": _freeze(data["bx"]),
+        "insight_matches": _freeze(matches),
+        "synergy_score": float(synergy_score),
+    }
+
+
+_snapshot_lock = threading.Lock()     # _current / _inflight の参照・更新
+_build_lock = threading.Lock()        # 構築を同時に1回に制限
+_current: DashboardSnapshot | None = None
+_inflight = False
+_last_sources: dict[str, Any] = {}   # ソースごとの最後に取得できた値（_build_lock 下で更新）
+
+
+def build_snapshot(previous: DashboardSnapshot | None = None) -> DashboardSnapshot:
+    """全データソースを取得してスナップショットを作る（内容が前回と同じなら version を据え置き）"""
+    started = time.monotonic()
+    missed: set[str] = set()
+    data = prefetch_dashboard_data(previous=_last_sources, missed=missed)
+    _last_sources.update((key, value) for key, value in data.items() if key not in missed)
+    fields = _content_fields(data)
+    fingerprint = data_fingerprint(fields)
+    now = time.time()
+    ttl = SNAPSHOT_RETRY_INTERVAL if missed else SNAPSHOT_INTERVAL
+    if missed:
+        print(f"[SNAPSHOT] {len(missed)} sources unavailable (previous value kept), retry in {ttl:.0f}s: {sorted(missed)}")
+    if previous is not None and previous.fingerprint == fingerprint:
+        return dataclasses.replace(previous, built_at=now, ttl=ttl)
+    version = previous.version + 1 if previous is not None else 1
+    print(f"[SNAPSHOT] v{version} built in {time.monotonic() - started:.2f}s")
+    return DashboardSnapshot(version=version, built_at=now, fingerprint=fingerprint, ttl=ttl, **fields)
+
+
+def _rebuild() -> DashboardSnapshot:
+    global _current
+    with _build_lock:
+        with _snapshot_lock:
+            previous = _current
+        # 待機中に別スレッドが構築済みなら再構築しない
+        if previous is not None and time.time() - previous.built_at < previous.ttl:
+            return previous
+        snapshot = build_snapshot(previous)
+        with _snapshot_lock:
+            _current = snapshot
+        return snapshot
+
+
+def _rebuild_in_background() -> None:
+    global _inflight
+    try:
+        _rebuild()
+    except Exception as e:
+        print(f"[SNAPSHOT] Background rebuild failed: {e}")
+    finally:
+        with _snapshot_lock:
+            _inflight = False
+
+
+def get_snapshot() -> DashboardSnapshot:
+    """現在のスナップショット（間隔経過後は裏で再構築し、完成までは前回分を返す）"""
+    global _inflight
+    with _snapshot_lock:
+        current = _current
+        if current is not None:
+            if time.time() - current.built_at >= current.ttl and not _inflight:
+                _inflight = True
+                threading.Thread(target=_rebuild_in_background, name="snapshot-rebuild", daemon=True).start()
+            return current
+    return _rebuild()
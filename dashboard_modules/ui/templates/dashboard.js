@@ -0,0 +1,466 @@
+// Context Library（CONTEXT_MANIFEST はファイル名・サイズ・有効フラグのみ。本文は使用時に取得）
+// 取得は1回だけ（レポート表示時に先読みし、クリック時には取得済みの本文を同期的に使う）
+var contextDataPromise = null;
+var contextDataText = null;
+function loadContextData(){
+    if (contextDataPromise) return contextDataPromise;
+    var files = (window.CONTEXT_MANIFEST || []).filter(function(f){ return f.active && f.url; });
+    contextDataPromise = Promise.all(files.map(function(f){
+        return fetch(f.url, {cache: 'force-cache'}).then(function(r){
+            return r.ok ? r.json() : {text: ''};
+        }).then(function(d){
+            return d.text ? d.text + '\n' + '='.repeat(50) + '\n\n' : '';
+        }).catch(function(){ return ''; });
+    })).then(function(parts){
+        contextDataText = parts.join('');
+        return contextDataText;
+    });
+    return contextDataPromise;
+}
+
+function updateClock(){
+    var d=new Date();
+    var days=['SUN','MON','TUE','WED','THU','FRI','SAT'];
+    var s=d.getFullYear()+'-'+String(d.getMonth()+1).padStart(2,'0')+'-'+String(d.getDate()).padStart(2,'0')+' ('+days[d.getDay()]+') '+String(d.getHours()).padStart(2,'0')+':'+String(d.getMinutes()).padStart(2,'0')+':'+String(d.getSeconds()).padStart(2,'0');
+    document.getElementById('liveClock').textContent=s;
+}
+updateClock();
+setInterval(updateClock,1000);
+function toggleStockExpand(){
+    var sec = document.getElementById('stockSecondary');
+    var btn = document.getElementById('stockToggleBtn');
+    if (sec && btn) {
+        sec.classList.toggle('collapsed');
+        btn.textContent = sec.classList.contains('collapsed') ? 'SHOW ALL (5)' : 'SHOW LESS (2)';
+    }
+}
+function toggleAiPanel(){
+    var body = document.getElementById('aiBody');
+    var toggle = document.getElementById('aiToggle');
+    if (body && toggle) {
+        body.classList.toggle('collapsed');
+        toggle.innerHTML = body.classList.contains('collapsed') ? '&#9654;' : '&#9660;';
+    }
+}
+function toggleBU(){
+    var wakonx = document.getElementById('wakonxPanel');
+    var bx = document.getElementById('bxPanel');
+    var news = document.getElementById('newsPanel');
+    var press = document.getElementById('pressPanel');
+    var fjPress = document.getElementById('fujitsuPressPanel');
+    var title = document.getElementById('buPanelTitle');
+
+    if(news.classList.contains('active')){
+        news.classList.remove('active');
+        press.classList.add('active');
+        title.textContent = 'KDDI PRESS RELEASE';
+        title.style.color = '#00aaff';
+    } else if(press.classList.contains('active')){
+        press.classList.remove('active');
+        fjPress.classList.add('active');
+        title.textContent = 'FUJITSU PRESS RELEASE';
+        title.style.color = '#00aaff';
+    } else if(fjPress.classList.contains('active')){
+        fjPress.classList.remove('active');
+        wakonx.classList.add('active');
+        title.textContent = 'WAKONX INTELLIGENCE';
+        title.style.color = '#00ffcc';
+    } else if(wakonx.classList.contains('active')){
+        wakonx.classList.remove('active');
+        bx.classList.add('active');
+        title.textContent = 'KDDI BX INTELLIGENCE';
+        title.style.color = '#ff6699';
+    } else {
+        bx.classList.remove('active');
+        news.classList.add('active');
+        title.textContent = 'TRENDING TOPICS';
+        title.style.color = '#ffaa00';
+    }
+}
+function showReport(idx){
+    document.getElementById('reportOverlay'+idx).style.display='flex';
+    loadContextData();   // SEND TO GEMINI 用に先読み
+}
+function closeReport(idx){
+    document.getElementById('reportOverlay'+idx).style.display='none';
+}
+// 提案詳細: 本文は static/proposal_details/*.json から取得（同じ URL はブラウザキャッシュ）
+function fillApproachBody(tabName, text){
+    var body = document.querySelector('#overlayTab_'+tabName+' .section-body');
+    body.textContent = '';
+    if(text){
+        body.textContent = text;
+    } else {
+        var span = document.createElement('span');
+        span.style.color = 'rgba(180,120,255,0.3)';
+        span.textContent = body.dataset.empty;
+        body.appendChild(span);
+    }
+}
+function showApproachPlan(url){
+    var overlay = document.getElementById('approachOverlay');
+    document.getElementById('approachTitle').textContent = 'LOADING...';
+    document.getElementById('approachScore').textContent = '';
+    document.getElementById('approachGamma').style.display = 'none';
+    ['slides','critique','approach'].forEach(function(t){ fillApproachBody(t, ''); });
+    switchOverlayTab('slides');
+    overlay.style.display='flex';
+    fetch(url, {cache: 'force-cache'}).then(function(r){
+        if(!r.ok) throw new Error(r.status);
+        return r.json();
+    }).then(function(d){
+        document.getElementById('approachTitle').textContent = d.title;
+        var score = document.getElementById('approachScore');
+        score.textContent = d.score;
+        score.className = 'overlay-score-num ' + (d.score >= 80 ? 'overlay-score-high' : d.score >= 50 ? 'overlay-score-mid' : 'overlay-score-low');
+        var gamma = document.getElementById('approachGamma');
+        if(d.gamma_url){ gamma.href = d.gamma_url; gamma.style.display = ''; }
+        fillApproachBody('slides', d.slides);
+        fillApproachBody('critique', d.critique);
+        fillApproachBody('approach', d.approach);
+    }).catch(function(e){
+        document.getElementById('approachTitle').textContent = 'DETAIL LOAD FAILED // ' + e;
+    });
+}
+function closeApproachPlan(){
+    document.getElementById('approachOverlay').style.display='none';
+}
+function switchOverlayTab(tabName){
+    var tabs = document.querySelectorAll('#approachOverlay .overlay-tab');
+    var contents = document.querySelectorAll('#approachOverlay .overlay-tab-content');
+    tabs.forEach(function(t){ t.classList.remove('active'); });
+    contents.forEach(function(c){ c.classList.remove('active'); });
+    var names = ['slides','critique','approach'];
+    for(var i=0;i<tabs.length;i++){
+        if(names[i]===tabName){
+            tabs[i].classList.add('active');
+        }
+    }
+    var el = document.getElementById('overlayTab_'+tabName);
+    if(el) el.classList.add('active');
+}
+function addToAsana(idx, title, uvance, score){
+    // 上下両方のボタンを更新
+    var btnTop = document.getElementById('asanaBtnTop'+idx);
+    var btnBottom = document.getElementById('asanaBtn'+idx);
+    var btns = [btnTop, btnBottom].filter(function(b){ return b; });
+    btns.forEach(function(b){
+        b.textContent = 'SENDING...';
+        b.disabled = true;
+        b.style.opacity = '0.5';
+    });
+    var overlay = document.getElementById('reportOverlay'+idx);
+    var bodyEl = overlay.querySelector('.report-overlay-body');
+    var reportText = bodyEl ? bodyEl.innerText : '';
+    var scoreReason = '';
+    var reasonEl = overlay.querySelector('.overlay-score-reason');
+    if(reasonEl) scoreReason = reasonEl.innerText;
+    var payload = {
+        title: '[KDDI Strategy] ' + title,
+        score: score,
+        score_reason: scoreReason,
+        uvance_area: uvance,
+        report_body: reportText,
+        source: 'Strategic Dashboard',
+        timestamp: new Date().toISOString()
+    };
+    fetch('https://hooks.zapier.com/hooks/catch/23986512/uejj8dt/', {
+        method: 'POST',
+        body: JSON.stringify(payload),
+        mode: 'no-cors'
+    }).then(function(){
+        btns.forEach(function(b){
+            b.textContent = '\u2705 ADDED TO ASANA';
+            b.style.background = 'rgba(0,255,100,0.15)';
+            b.style.borderColor = 'rgba(0,255,100,0.4)';
+            b.style.color = 'rgba(0,255,100,0.9)';
+        });
+    }).catch(function(){
+        btns.forEach(function(b){
+            b.textContent = '\u26A0 FAILED - RETRY';
+            b.disabled = false;
+            b.style.opacity = '1';
+        });
+    });
+}
+function saveReport(idx, title){
+    var overlay = document.getElementById('reportOverlay'+idx);
+    var inner = overlay.querySelector('.report-overlay-inner');
+    var now = new Date();
+    var dateStr = now.getFullYear() + String(now.getMonth()+1).padStart(2,'0') + String(now.getDate()).padStart(2,'0');
+    var timeStr = String(now.getHours()).padStart(2,'0') + String(now.getMinutes()).padStart(2,'0');
+    var html = '<!DOCTYPE html><html><head><meta charset="utf-8">'
+        + '<title>Strategic Report - ' + title + '</title>'
+        + '<style>'
+        + "@import url('https://fonts.googleapis.com/css2?family=Orbitron:wght@400;700;900&family=Share+Tech+Mono&display=swap');"
+        + '* { margin:0; padding:0; box-sizing:border-box; }'
+        + 'html,body { background:#000; color:#c8aaff; font-family:"Share Tech Mono",monospace; min-height:100vh; }'
+        + '.report-overlay-inner { max-width:900px; margin:0 auto; padding:30px; }'
+        + '.report-overlay-header { text-align:center; margin-bottom:30px; padding-bottom:16px; border-bottom:1px solid rgba(180,120,255,0.15); }'
+        + '.report-overlay-label { font-family:"Orbitron",monospace; font-size:0.55rem; letter-spacing:6px; color:rgba(180,120,255,0.4); margin-bottom:10px; }'
+        + '.report-overlay-title { font-family:"Orbitron",monospace; font-size:1.3rem; font-weight:900; color:rgba(180,120,255,0.9); letter-spacing:2px; text-shadow:0 0 20px rgba(180,120,255,0.3); line-height:1.6; }'
+        + '.overlay-score-box { margin:16px 0; }'
+        + '.overlay-score-num { font-family:"Orbitron",monospace; font-size:2rem; font-weight:900; }'
+        + '.overlay-score-high { color:#00ff88; text-shadow:0 0 20px rgba(0,255,136,0.4); }'
+        + '.overlay-score-mid { color:#ffaa00; text-shadow:0 0 20px rgba(255,170,0,0.4); }'
+        + '.overlay-score-low { color:rgba(180,120,255,0.4); }'
+        + '.overlay-score-label { display:block; font-family:"Orbitron",monospace; font-size:0.4rem; letter-spacing:4px; color:rgba(180,120,255,0.4); margin-top:4px; }'
+        + '.overlay-score-reason { display:block; font-size:0.7rem; color:rgba(200,170,255,0.6); margin-top:6px; }'
+        + '.report-overlay-actions { display:none; }'
+        + '.report-close-btn-top { display:none; }'
+        + '.report-section { margin-bottom:28px; padding:16px 20px; border:1px solid rgba(180,120,255,0.08); border-radius:6px; background:rgba(10,5,20,0.6); }'
+        + '.section-header { font-family:"Orbitron",monospace; font-size:0.85rem; font-weight:700; color:rgba(180,120,255,0.9); letter-spacing:3px; margin-bottom:14px; padding-bottom:10px; border-bottom:1px solid rgba(180,120,255,0.15); }'
+        + '.section-body { font-size:0.95rem; line-height:2.2; color:rgba(220,200,255,0.85); }'
+        + '.section-uvance { border-color:rgba(0,180,255,0.2); background:rgba(0,20,40,0.6); }'
+        + '.section-uvance .section-header { color:rgba(0,200,255,0.9); border-bottom-color:rgba(0,180,255,0.2); }'
+        + '.sub-heading { color:rgba(0,200,255,0.9); font-weight:700; }'
+        + '.report-overlay-footer { text-align:center; margin-top:40px; padding-top:20px; border-top:1px solid rgba(180,120,255,0.08); font-family:"Orbitron",monospace; font-size:0.4rem; color:rgba(180,120,255,0.2); letter-spacing:4px; }'
+        + '</style></head><body>'
+        + inner.innerHTML
+        + '</body></html>';
+    var blob = new Blob([html], {type: 'text/html;charset=utf-8'});
+    var a = document.createElement('a');
+    a.href = URL.createObjectURL(blob);
+    var safeTitle = title.replace(/[^a-zA-Z0-9\u3000-\u9FFF]/g, '_').substring(0, 40);
+    a.download = 'Report_' + dateStr + '_' + timeStr + '_' + safeTitle + '.html';
+    a.click();
+    URL.revokeObjectURL(a.href);
+}
+function generateProposal(idx, title){
+    var btn = document.getElementById('proposalBtn'+idx);
+    var btnTop = document.getElementById('proposalBtnTop'+idx);
+    [btn, btnTop].forEach(function(b) {
+        if (b) { b.textContent = 'GENERATING...'; b.disabled = true; b.style.opacity = '0.5'; }
+    });
+    var overlay = document.getElementById('reportOverlay'+idx);
+    var bodyEl = overlay.querySelector('.report-overlay-body');
+    var reportText = bodyEl ? bodyEl.innerText.substring(0, 5000) : '';
+
+    // Streamlit query param方式でトリガー
+    // セッションストレージに保存し、親Streamlitに通知
+    try {
+        var proposalData = JSON.stringify({
+            action: 'generate_hypothesis',
+            opportunity_title: title,
+            report_content: reportText,
+            timestamp: Date.now()
+        });
+        // Streamlit parent window に通知
+        window.parent.postMessage({
+            type: 'streamlit:setComponentValue',
+            data: proposalData
+        }, '*');
+
+        // URLパラメータ方式でもフォールバック
+        var url = new URL(window.parent.location.href);
+        url.searchParams.set('hypothesis_trigger', encodeURIComponent(title));
+        window.parent.location.href = url.toString();
+    } catch(e) {
+        // フォールバック: クリップボードにコピーして手動指示
+        var proposalPrompt = '# 仮説提案書生成リクエスト\n\n'
+            + '## オポチュニティ: ' + title + '\n\n'
+            + '## レポート内容:\n' + reportText + '\n\n'
+            + 'ダッシュボードの「GENERATE HYPOTHESIS」ボタンをクリックしてください。';
+        navigator.clipboard.writeText(proposalPrompt).then(function() {
+            alert('提案情報をクリップボードにコピーしました。\n\nダッシュボード下部の「▶ GENERATE HYPOTHESIS」ボタンをクリックして提案書を生成してください。');
+        }).catch(function() {
+            alert('ダッシュボード下部の「▶ GENERATE HYPOTHESIS」ボタンをクリックして提案書を生成してください。');
+        });
+    }
+
+    setTimeout(function() {
+        [btn, btnTop].forEach(function(b) {
+            if (b) { b.textContent = '📝 CREATE PROPOSAL'; b.disabled = false; b.style.opacity = '1'; }
+        });
+    }, 3000);
+}
+function sendToGemini(idx){
+    var overlay = document.getElementById('reportOverlay'+idx);
+    var titleEl = overlay.querySelector('.report-title');
+    var bodyEl = overlay.querySelector('.report-overlay-body');
+    var title = titleEl ? titleEl.innerText : '';
+    var reportText = bodyEl ? bodyEl.innerText : '';
+
+    function buildPrompt(contextData){
+        var contextSection = contextData ? `\n# 追加コンテキスト情報（決算データ・統合レポート等）\n${contextData}\n` : '';
+        return `# 企業調査レポート
+${title}
+
+${reportText}
+
+# 自社ソリューション情報
+富士通Uvance（Digital Shifts, Hybrid IT, Healthy Living等）
+- Kozuchi AI Platform（生成AI・機械学習）
+- Data e-TRUST / Palantir連携（データ利活用）
+- プライベート5Gソリューション
+- ゼロトラストセキュリティ
+- Hybrid IT基盤構築
+- DX推進コンサルティング
+- 共創プログラム
+${contextSection}
+上記の情報をもとに、KDDI（WAKONX/KDDI BX）向けの提案書骨子を作成してください。`;
+    }
+
+    // クリップボード書き込みはクリックハンドラ内で同期的に開始する（Safari はハンドラ外の書き込みを拒否）
+    var copied;
+    if (contextDataText !== null) {
+        copied = navigator.clipboard.writeText(buildPrompt(contextDataText));
+    } else if (window.ClipboardItem && navigator.clipboard.write) {
+        copied = navigator.clipboard.write([new ClipboardItem({
+            'text/plain': loadContextData().then(function(contextData){
+                return new Blob([buildPrompt(contextData)], {type: 'text/plain'});
+            })
+        })]);
+    } else {
+        copied = loadContextData().then(function(contextData){
+            return navigator.clipboard.writeText(buildPrompt(contextData));
+        });
+    }
+    copied.then(function(){
+        var btn = document.getElementById('geminiBtn'+idx);
+        btn.textContent = '✅ COPIED!';
+        setTimeout(function(){
+            btn.textContent = '🎙 SEND TO GEMINI';
+        }, 2000);
+
+        // Open Gemini Gem directly
+        window.open('https://gemini.google.com/gem/23bec0ec97ef', '_blank');
+
+        alert('レポート内容をクリップボードにコピーしました！\n\n新しいタブでGemini が開きます。\nGemsにペーストしてご利用ください。');
+    }).catch(function(err){
+        alert('クリップボードへのコピーに失敗しました: ' + err);
+    });
+}
+
+// ── Boot Splash Screen Control (Click to Continue) ──
+(function() {
+    console.log('[BOOT] Initializing boot splash...');
+    var splash = document.getElementById('bootSplash');
+    if (!splash) {
+        console.log('[BOOT] ERROR: Splash element not found');
+        return;
+    }
+    console.log('[BOOT] Splash element found');
+
+    // セッションストレージで1セッションに1回のみ表示
+    var hasShown = sessionStorage.getItem('boot_splash_shown');
+    if (hasShown) {
+        console.log('[BOOT] Already shown in this session, skipping');
+        splash.remove();
+        return;
+    }
+    console.log('[BOOT] First time in session, showing splash (click to continue)');
+
+    // クリックで非表示にする
+    function hideSplash() {
+        console.log('[BOOT] Hiding splash...');
+        splash.classList.add('hide');
+        setTimeout(function() {
+            console.log('[BOOT] Removing splash element');
+            splash.remove();
+        }, 800); // フェードアウト時間
+        sessionStorage.setItem('boot_splash_shown', 'true');
+    }
+
+    // システムブートシーケンス
+    var bootMessages = [
+        { text: '> INITIALIZING ACCOUNT INTELLIGENCE MONITOR...', delay: 0 },
+        { text: '> LOADING AI MODULES.................. <span class="status-ok">[OK]</span>', delay: 600 },
+        { text: '> CONNECTING TO DATA SOURCES.......... <span class="status-ok">[OK]</span>', delay: 1200 },
+        { text: '> ESTABLISHING SECURE CONNECTION...... <span class="status-ok">[OK]</span>', delay: 1800 },
+        { text: '> SYSTEM READY', delay: 2400 }
+    ];
+
+    var messagesContainer = document.getElementById('bootMessages');
+    var progressFill = document.getElementById('progressBarFill');
+    var progressPercent = document.getElementById('progressPercent');
+    var bootHint = document.getElementById('bootHint');
+
+    // メッセージを順次表示
+    bootMessages.forEach(function(msg) {
+        setTimeout(function() {
+            var msgDiv = document.createElement('div');
+            msgDiv.className = 'boot-message';
+            msgDiv.innerHTML = msg.text;
+            messagesContainer.appendChild(msgDiv);
+        }, msg.delay);
+    });
+
+    // プログレスバーアニメーション
+    var progress = 0;
+    var progressInterval = setInterval(function() {
+        progress += 3;
+        if (progress > 100) {
+            progress = 100;
+            clearInterval(progressInterval);
+            // 完了後に「CLICK TO START」表示
+            setTimeout(function() {
+                bootHint.style.display = 'block';
+            }, 300);
+        }
+        progressFill.style.width = progress + '%';
+        progressPercent.textContent = progress + '%';
+    }, 80);
+
+    // スプラッシュ画面のどこかをクリックしたら非表示
+    splash.addEventListener('click', function() {
+        console.log('[BOOT] Splash clicked, hiding...');
+        hideSplash();
+    });
+
+    // マウスカーソルをポインターに変更してクリック可能であることを示す
+    splash.style.cursor = 'pointer';
+})();
+
+// スリープボタン機能：オープニング画面に戻る
+function returnToBootScreen() {
+    sessionStorage.removeItem('boot_splash_shown');
+    location.reload();
+}
+
+// INSIGHT MATCHER トグル機能
+function toggleMatcher() {
+    var body = document.getElementById('matcherBody');
+    var toggle = document.getElementById('matcherToggle');
+    if (body && toggle) {
+        body.classList.toggle('collapsed');
+        toggle.textContent = body.classList.contains('collapsed') ? '▶' : '▼';
+    }
+}
+
+// AIスコア理由説明の表示/非表示
+function toggleExplanation(index) {
+    var explanation = document.getElementById('explanation' + index);
+    if (explanation) {
+        if (explanation.style.display === 'none' || explanation.style.display === '') {
+            explanation.style.display = 'block';
+        } else {
+            explanation.style.display = 'none';
+        }
+    }
+}
+
+// Streamlit実行中検知 - ローディングオーバーレイ表示
+(function() {
+    var observer = new MutationObserver(function(mutations) {
+        var stApp = document.querySelector('.stApp');
+        var statusLabel = document.querySelector('[data-testid="stStatusWidget"]');
+
+        if (stApp) {
+            // Streamlitが実行中かチェック（"Running..."が表示されているか）
+            if (statusLabel && statusLabel.textContent.includes('Running')) {
+                stApp.classList.add('streamlit-running');
+            } else {
+                stApp.classList.remove('streamlit-running');
+            }
+        }
+    });
+
+    // DOM全体を監視
+    observer.observe(document.body, {
+        childList: true,
+        subtree: true,
+        attributes: true,
+        characterData: true
+    });
+})();